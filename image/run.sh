@@ -7,6 +7,8 @@ export DJANGO_CONFIGURATION=Production
 
 python manage.py migrate
 
+python manage.py createcachetable
+
 python manage.py collectstatic --noinput
 
 if [ ! -z "$PRESIGN_SUPERUSER_NAME"  ] && [ ! -z "$PRESIGN_SUPERUSER_PASS" ]; then
@@ -15,4 +17,10 @@ fi
 
 python manage.py import_text_defaults mail_texts.json status_texts.json
 
+python manage.py run_export_worker &
+
+python manage.py run_email_worker &
+
+python manage.py process_deadlines --interval 300 &
+
 gunicorn presign.wsgi -b 0.0.0.0:8000
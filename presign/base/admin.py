@@ -6,6 +6,7 @@ from simple_history.admin import SimpleHistoryAdmin
 from .models import (
     Event,
     EventQuestionnaire,
+    ExportJob,
     Organizer,
     Participant,
     Question,
@@ -40,3 +41,4 @@ admin.site.register(QuestionBlock, SimpleHistoryAdmin)
 admin.site.register(Questionnaire, QuestionnaireAdmin)
 admin.site.register(QuestionOption, SimpleHistoryAdmin)
 admin.site.register(User, UserAdmin)
+admin.site.register(ExportJob)
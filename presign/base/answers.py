@@ -0,0 +1,159 @@
+from collections import defaultdict
+from typing import Any, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from simple_history.utils import bulk_create_with_history, bulk_update_with_history
+
+from .cache import bump_version
+from .catalog import CatalogBlock, CatalogQuestion, get_participant_blocks
+from .export.fingerprint import export_data_version_name
+from .models import Event, Participant, Question, QuestionAnswer, QuestionKind
+from .search import schedule_search_update
+
+CHOICE_KINDS = [QuestionKind.CHOICE, QuestionKind.MULTIPLE_CHOICE]
+
+
+class AnsweredQuestion(NamedTuple):
+    question: CatalogQuestion
+    answer: Optional[QuestionAnswer]
+
+
+class AnsweredBlock(NamedTuple):
+    block: CatalogBlock
+    questions: Tuple[AnsweredQuestion, ...]
+
+    @property
+    def name(self):
+        return self.block.name
+
+
+def load_answer_tree(event: Event, participant: Participant) -> List[AnsweredBlock]:
+    """
+    Returns the blocks shown for the participant with their questions and
+    answers. Apart from the cached question catalog, this takes two queries:
+    the answers with their questions and blocks, and the selected options.
+    """
+    answers = {
+        answer.question_id: answer
+        for answer in QuestionAnswer.objects.filter(participant=participant)
+        .select_related("question__block")
+        .prefetch_related("options")
+    }
+    blocks = get_participant_blocks(
+        event,
+        participant,
+        questionnaire_ids={
+            answer.question.block.questionnaire_id for answer in answers.values()
+        },
+    )
+    return [
+        AnsweredBlock(
+            block=block,
+            questions=tuple(
+                AnsweredQuestion(question=question, answer=answers.get(question.id))
+                for question in block.questions
+            ),
+        )
+        for block in blocks
+    ]
+
+
+def selected_option_ids(question: Question, value) -> Set:
+    # Values are QuestionOptions or CatalogOptions, both have an id
+    if question.kind == QuestionKind.CHOICE:
+        return {value.id}
+    return {option.id for option in value}
+
+
+@transaction.atomic
+def save_answers(
+    participant: Participant, values: Sequence[Tuple[Question, Any]]
+) -> List[QuestionAnswer]:
+    """
+    Saves the answers of a participant with a fixed number of queries: the
+    existing answers and their options are read once, answers are created and
+    updated in bulk (with their history) and options are changed as a diff.
+    Answers whose value did not change are not written.
+    """
+    Selection = QuestionAnswer.options.through
+
+    existing = {
+        answer.question_id: answer
+        for answer in QuestionAnswer.objects.filter(
+            participant=participant,
+            question__in=[question for question, _ in values],
+        )
+    }
+    current_options = defaultdict(set)
+    for answer_id, option_id in Selection.objects.filter(
+        questionanswer__in=existing.values()
+    ).values_list("questionanswer_id", "questionoption_id"):
+        current_options[answer_id].add(option_id)
+
+    now = timezone.now()
+    answers, created, updated = [], [], []
+    selected_options = {}
+    for question, value in values:
+        answer = existing.get(question.pk)
+        if answer is None:
+            answer = QuestionAnswer(question=question, participant=participant)
+            created.append(answer)
+        else:
+            answer.question = question
+
+        before = (answer.answer, answer.file.name)
+        if question.kind in CHOICE_KINDS:
+            selected_options[answer.pk] = selected_option_ids(question, value)
+            changed = selected_options[answer.pk] != current_options[answer.pk]
+        else:
+            answer.set_value(value)
+            changed = (
+                answer.answer,
+                answer.file.name,
+            ) != before or not answer.file._committed
+
+        if changed and question.pk in existing:
+            answer.changed_at = now
+            updated.append(answer)
+        answers.append(answer)
+
+    # bulk_update() skips pre_save(), so uploads of updated answers must be
+    # stored here. bulk_create() runs FileField.pre_save(), which does not
+    # store them a second time once they are committed.
+    for answer in created + updated:
+        if answer.file and not answer.file._committed:
+            answer.file.save(answer.file.name, answer.file.file, save=False)
+
+    if created:
+        bulk_create_with_history(created, QuestionAnswer)
+    if updated:
+        bulk_update_with_history(
+            updated, QuestionAnswer, ["answer", "file", "changed_at"]
+        )
+
+    removed = [
+        option_id
+        for answer_id, option_ids in selected_options.items()
+        for option_id in current_options[answer_id] - option_ids
+    ]
+    if removed:
+        # Options belong to a single question, so they identify the answer
+        Selection.objects.filter(
+            questionanswer__in=list(selected_options), questionoption__in=removed
+        ).delete()
+    Selection.objects.bulk_create(
+        [
+            Selection(questionanswer_id=answer_id, questionoption_id=option_id)
+            for answer_id, option_ids in selected_options.items()
+            for option_id in option_ids - current_options[answer_id]
+        ]
+    )
+
+    # Bulk operations do not send the signals that keep derived data up to date
+    if created or updated:
+        Participant.mark_changed(participant.pk, now)
+        bump_version(export_data_version_name(participant.event_id))
+        schedule_search_update(participant.pk)
+    return answers
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class BaseConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "presign.base"
+
+    def ready(self):
+        from . import signals  # noqa: F401
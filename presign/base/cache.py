@@ -0,0 +1,85 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional
+
+from django.core.cache import cache
+
+VERSION_KEY = "presign:version:{}"
+
+
+class LRUCache:
+    """Thread-safe in-process cache bounded by entry count and total size"""
+
+    def __init__(self, max_entries: int, max_size: Optional[int] = None):
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                value, size = self._entries[key]
+            except KeyError:
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, size: int = 0) -> bool:
+        if self.max_size is not None and size > self.max_size:
+            return False
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = (value, size)
+            self.size += size
+            while len(self._entries) > self.max_entries or (
+                self.max_size is not None and self.size > self.max_size
+            ):
+                self._pop(next(iter(self._entries)))
+        return True
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _pop(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
+
+
+def get_version(name: str) -> int:
+    key = VERSION_KEY.format(name)
+    version = cache.get(key)
+    if version is None:
+        # Start from the clock instead of 1, so a version that was evicted from
+        # the cache does not restart at a value that is already in use.
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def get_versions(names: Iterable[str]) -> Dict[str, int]:
+    names = list(names)
+    found = cache.get_many([VERSION_KEY.format(name) for name in names])
+    return {
+        name: found.get(VERSION_KEY.format(name)) or get_version(name) for name in names
+    }
+
+
+def bump_version(name: str):
+    key = VERSION_KEY.format(name)
+    # Not incr(), which is a get and a set on most backends. Two processes
+    # bumping at the same time could both write the same version, and entries
+    # cached between their changes would be kept with it.
+    cache.set(key, max(time.time_ns(), (cache.get(key) or 0) + 1), None)
@@ -0,0 +1,235 @@
+import uuid
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from django.core.cache import cache
+
+from django_scopes import scopes_disabled
+from i18nfield.strings import LazyI18nString
+
+from .cache import get_version, get_versions
+from .constants import CAN_CHANGE_Q1_AND_Q2_STATES, CAN_CHANGE_Q1_STATES
+from .models import (
+    Event,
+    EventQuestionnaire,
+    Participant,
+    Question,
+    QuestionAnswer,
+    QuestionBlock,
+    QuestionnaireRole,
+    QuestionOption,
+)
+
+CATALOG_KEY = "presign:catalog-questionnaires:{}:{}"
+SNAPSHOT_KEY = "presign:questionnaire:{}:{}"
+
+
+class CatalogOption(NamedTuple):
+    id: uuid.UUID
+    value: LazyI18nString
+    order: int
+
+    def __str__(self) -> str:
+        return str(self.value)
+
+
+class CatalogQuestion(NamedTuple):
+    id: uuid.UUID
+    block_id: uuid.UUID
+    kind: str
+    required: bool
+    name: LazyI18nString
+    help: LazyI18nString
+    order: int
+    options: Tuple[CatalogOption, ...]
+
+    def __str__(self) -> str:
+        return str(self.name)
+
+
+class CatalogBlock(NamedTuple):
+    id: uuid.UUID
+    questionnaire_id: uuid.UUID
+    role: Optional[int]
+    name: LazyI18nString
+    order: int
+    questions: Tuple[CatalogQuestion, ...]
+
+    def __str__(self) -> str:
+        return str(self.name)
+
+
+class QuestionCatalog:
+    """Immutable, ordered view on all questions of the questionnaires of an event"""
+
+    def __init__(self, blocks: Sequence[CatalogBlock]):
+        self.blocks = tuple(blocks)
+        self.questions: Dict[uuid.UUID, CatalogQuestion] = {
+            question.id: question
+            for block in self.blocks
+            for question in block.questions
+        }
+
+    def get_blocks(
+        self,
+        roles: Optional[Iterable[int]] = None,
+        questionnaire_ids: Optional[Iterable[uuid.UUID]] = None,
+    ) -> List[CatalogBlock]:
+        blocks = self.blocks
+        if roles is not None:
+            roles = set(roles)
+            blocks = [block for block in blocks if block.role in roles]
+        if questionnaire_ids is not None:
+            questionnaire_ids = set(questionnaire_ids)
+            blocks = [
+                block for block in blocks if block.questionnaire_id in questionnaire_ids
+            ]
+        return list(blocks)
+
+
+def catalog_version_name(event_id) -> str:
+    return f"catalog:{event_id}"
+
+
+def questionnaire_version_name(questionnaire_id) -> str:
+    return f"questionnaire:{questionnaire_id}"
+
+
+def load_catalog_blocks(
+    questionnaire_roles: Sequence[Tuple[uuid.UUID, Optional[int]]],
+) -> List[CatalogBlock]:
+    # Three queries, no matter how many questionnaires, blocks and questions
+    questionnaire_ids = {
+        questionnaire_id for questionnaire_id, _ in questionnaire_roles
+    }
+    blocks = list(
+        QuestionBlock.objects.filter(questionnaire_id__in=questionnaire_ids).order_by(
+            "order", "name"
+        )
+    )
+    questions = list(
+        Question.objects.filter(block__in=blocks).order_by("order", "name")
+    )
+    options = defaultdict(list)
+    for option in QuestionOption.objects.filter(question__in=questions).order_by(
+        "order"
+    ):
+        options[option.question_id].append(
+            CatalogOption(id=option.pk, value=option.value, order=option.order)
+        )
+
+    questions_by_block = defaultdict(list)
+    for question in questions:
+        questions_by_block[question.block_id].append(
+            CatalogQuestion(
+                id=question.pk,
+                block_id=question.block_id,
+                kind=question.kind,
+                required=question.required,
+                name=question.name,
+                help=question.help,
+                order=question.order,
+                options=tuple(options[question.pk]),
+            )
+        )
+
+    blocks_by_questionnaire = defaultdict(list)
+    for block in blocks:
+        blocks_by_questionnaire[block.questionnaire_id].append(block)
+
+    return [
+        CatalogBlock(
+            id=block.pk,
+            questionnaire_id=questionnaire_id,
+            role=role,
+            name=block.name,
+            order=block.order,
+            questions=tuple(questions_by_block[block.pk]),
+        )
+        for questionnaire_id, role in questionnaire_roles
+        for block in blocks_by_questionnaire[questionnaire_id]
+    ]
+
+
+def get_questionnaire_snapshots(
+    questionnaire_ids: Iterable[uuid.UUID],
+) -> Dict[uuid.UUID, Tuple[CatalogBlock, ...]]:
+    """
+    Returns the blocks of each questionnaire without a role. Snapshots are
+    cached per questionnaire version, so changing one questionnaire does not
+    rebuild the others.
+    """
+    questionnaire_ids = list(dict.fromkeys(questionnaire_ids))
+    # Versions are read before building, so a snapshot built from data that
+    # changed meanwhile is stored under an outdated version.
+    versions = get_versions(questionnaire_version_name(pk) for pk in questionnaire_ids)
+    keys = {
+        pk: SNAPSHOT_KEY.format(pk, versions[questionnaire_version_name(pk)])
+        for pk in questionnaire_ids
+    }
+    found = cache.get_many(keys.values())
+    snapshots = {pk: found[key] for pk, key in keys.items() if key in found}
+
+    missing = [pk for pk in questionnaire_ids if pk not in snapshots]
+    if missing:
+        built = {pk: [] for pk in missing}
+        with scopes_disabled():
+            for block in load_catalog_blocks([(pk, None) for pk in missing]):
+                built[block.questionnaire_id].append(block)
+        built = {pk: tuple(blocks) for pk, blocks in built.items()}
+        cache.set_many({keys[pk]: blocks for pk, blocks in built.items()}, None)
+        snapshots.update(built)
+    return snapshots
+
+
+def get_question_catalog(event: Event) -> QuestionCatalog:
+    key = CATALOG_KEY.format(event.pk, get_version(catalog_version_name(event.pk)))
+    questionnaire_roles = cache.get(key)
+    if questionnaire_roles is None:
+        with scopes_disabled():
+            questionnaire_roles = list(
+                EventQuestionnaire.objects.filter(event=event)
+                .order_by("role", "questionnaire_id")
+                .values_list("questionnaire_id", "role")
+            )
+        cache.set(key, questionnaire_roles, None)
+
+    snapshots = get_questionnaire_snapshots(pk for pk, _ in questionnaire_roles)
+    return QuestionCatalog(
+        [
+            block._replace(role=role)
+            for questionnaire_id, role in questionnaire_roles
+            for block in snapshots[questionnaire_id]
+        ]
+    )
+
+
+def get_participant_blocks(
+    event: Event,
+    participant: Participant,
+    questionnaire_ids: Optional[Iterable[uuid.UUID]] = None,
+) -> List[CatalogBlock]:
+    # `questionnaire_ids` are the answered questionnaires, if already known
+    catalog = get_question_catalog(event)
+    if participant.state in CAN_CHANGE_Q1_STATES:
+        blocks = catalog.get_blocks(roles=[QuestionnaireRole.DURING_SIGNUP])
+    elif participant.state in CAN_CHANGE_Q1_AND_Q2_STATES:
+        blocks = catalog.get_blocks(
+            roles=[QuestionnaireRole.DURING_SIGNUP, QuestionnaireRole.AFTER_APPROVAL]
+        )
+    else:
+        if questionnaire_ids is None:
+            questionnaire_ids = (
+                QuestionAnswer.objects.filter(participant=participant)
+                .values_list("question__block__questionnaire", flat=True)
+                .distinct()
+            )
+        questionnaire_ids = set(questionnaire_ids)
+        blocks = catalog.get_blocks(questionnaire_ids=questionnaire_ids)
+        # Questionnaires that were removed from the event after they have been
+        # answered are not part of the catalog
+        missing = questionnaire_ids - {block.questionnaire_id for block in blocks}
+        if missing:
+            snapshots = get_questionnaire_snapshots(missing)
+            blocks += [block for pk in missing for block in snapshots[pk]]
+    return [block for block in blocks if block.questions]
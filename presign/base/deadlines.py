@@ -0,0 +1,153 @@
+import datetime
+import logging
+from typing import List, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+from django_scopes import scope, scopes_disabled
+
+from .exceptions import ActionEmailNotConfigured
+from .models import Event, Participant, ScheduledTaskRun
+from .outbox import queue_emails
+from .states import bulk_change_state
+
+logger = logging.getLogger(__name__)
+
+DEADLINES = ["signup_end", "lock_date", "event_date"]
+
+
+class DeadlineRule(NamedTuple):
+    name: str
+    deadline: str
+    states: Tuple[str, ...]
+    action: Optional[str] = None
+    email: Optional[str] = None
+    offset: datetime.timedelta = datetime.timedelta(0)
+
+    @property
+    def task_name(self) -> str:
+        return f"deadline:{self.name}"
+
+
+def parse_deadline_rule(rule: dict) -> DeadlineRule:
+    if rule["deadline"] not in DEADLINES:
+        raise ValueError(f"Unknown deadline {rule['deadline']}")
+    if bool(rule.get("action")) == bool(rule.get("email")):
+        raise ValueError(f"Rule {rule['name']} needs either an action or an email")
+    return DeadlineRule(
+        name=rule["name"],
+        deadline=rule["deadline"],
+        states=tuple(rule["states"]),
+        action=rule.get("action"),
+        email=rule.get("email"),
+        offset=datetime.timedelta(hours=rule.get("offset_hours", 0)),
+    )
+
+
+def get_deadline_rules() -> List[DeadlineRule]:
+    """The valid rules of PRESIGN_DEADLINE_RULES, invalid ones are logged"""
+    rules = []
+    for rule in settings.PRESIGN_DEADLINE_RULES:
+        try:
+            rules.append(parse_deadline_rule(rule))
+        except (KeyError, TypeError, ValueError):
+            logger.exception("Invalid deadline rule %r", rule)
+    return rules
+
+
+def get_due_events(
+    deadline: str, start: datetime.datetime, end: datetime.datetime
+) -> QuerySet[Event]:
+    """Events whose deadline is in (start, end]"""
+    in_window = Q(event_date__gt=start, event_date__lte=end)
+    if deadline != "event_date":
+        # Written as two conditions instead of a Coalesce(), so that both can
+        # use the index of their date
+        in_window = Q(**{f"{deadline}__gt": start, f"{deadline}__lte": end}) | Q(
+            Q(**{deadline: None}) & in_window
+        )
+    return Event.objects.filter(in_window)
+
+
+def apply_deadline_rule(rule: DeadlineRule, event: Event) -> int:
+    participants = Participant.objects.filter(event=event, state__in=rule.states)
+    if rule.action:
+        result = bulk_change_state(
+            event, participants.values_list("pk", flat=True), rule.action
+        )
+        return len(result.changed)
+
+    texts = event.get_action_email_texts(rule.email)
+    emails = []
+    for participant in participants:
+        participant.event = event
+        try:
+            emails.append(
+                participant.get_change_state_email(None, rule.email, texts=texts)
+            )
+        except ActionEmailNotConfigured:
+            logger.warning(
+                "Deadline rule %s did not send %s emails to event %s/%s, "
+                "the email is not configured",
+                rule.name,
+                rule.email,
+                event.organizer.slug,
+                event.slug,
+            )
+            return 0
+    return len(queue_emails(emails))
+
+
+def process_deadlines(
+    now: Optional[datetime.datetime] = None,
+    since: Optional[datetime.datetime] = None,
+) -> List[Tuple[DeadlineRule, Event, int]]:
+    """
+    Applies every rule to the events whose deadline (plus the offset of the
+    rule) passed since the last run of that rule.
+
+    Each rule is processed in one transaction together with its new last run
+    time, so a failed run is repeated completely and a finished one never.
+    A failing rule is logged and does not keep the other rules from running.
+    """
+    now = now or timezone.now()
+    results = []
+    lookback = datetime.timedelta(hours=settings.PRESIGN_DEADLINE_LOOKBACK_HOURS)
+    for rule in get_deadline_rules():
+        try:
+            results += run_deadline_rule(rule, now, since, lookback)
+        except Exception:
+            logger.exception("Deadline rule %s failed", rule.name)
+    return results
+
+
+@transaction.atomic
+@scopes_disabled()
+def run_deadline_rule(
+    rule: DeadlineRule,
+    now: datetime.datetime,
+    since: Optional[datetime.datetime],
+    lookback: datetime.timedelta,
+) -> List[Tuple[DeadlineRule, Event, int]]:
+    # The lock keeps concurrent runs from processing the same window
+    run, _ = ScheduledTaskRun.objects.select_for_update().get_or_create(
+        name=rule.task_name, defaults={"last_run_at": now - lookback}
+    )
+    start = since or run.last_run_at
+    if start >= now:
+        return []
+
+    results = []
+    events = get_due_events(
+        rule.deadline, start - rule.offset, now - rule.offset
+    ).select_related("organizer")
+    for event in events:
+        with scope(organizer=event.organizer, event=event):
+            results.append((rule, event, apply_deadline_rule(rule, event)))
+
+    run.last_run_at = now
+    run.save(update_fields=["last_run_at"])
+    return results
@@ -0,0 +1,64 @@
+from .files import get_file_answers, stream_file_archive
+from .fingerprint import (
+    cache_export,
+    export_cache,
+    export_data_version_name,
+    export_fingerprint,
+)
+from .jobs import (
+    EXPORT_JOB_TIMEOUT,
+    claim_next_export_job,
+    reclaim_stale_export_jobs,
+    run_export_job,
+)
+from .rows import (
+    EXPORT_CHUNK_SIZE,
+    ExportColumn,
+    build_export_columns,
+    format_export_cursor,
+    get_default_export_fields,
+    get_export_participants,
+    iter_export_rows,
+    iter_participant_chunks,
+    next_export_cursor,
+    parse_export_cursor,
+    stream_export,
+)
+from .writers import (
+    EXPORT_WRITERS,
+    BaseExportWriter,
+    ColumnarExportWriter,
+    CSVExportWriter,
+    JSONLinesExportWriter,
+    get_export_writer,
+)
+
+__all__ = [
+    "get_file_answers",
+    "stream_file_archive",
+    "cache_export",
+    "export_cache",
+    "export_data_version_name",
+    "export_fingerprint",
+    "EXPORT_JOB_TIMEOUT",
+    "claim_next_export_job",
+    "reclaim_stale_export_jobs",
+    "run_export_job",
+    "EXPORT_CHUNK_SIZE",
+    "ExportColumn",
+    "build_export_columns",
+    "format_export_cursor",
+    "get_default_export_fields",
+    "get_export_participants",
+    "iter_export_rows",
+    "iter_participant_chunks",
+    "next_export_cursor",
+    "parse_export_cursor",
+    "stream_export",
+    "EXPORT_WRITERS",
+    "BaseExportWriter",
+    "ColumnarExportWriter",
+    "CSVExportWriter",
+    "JSONLinesExportWriter",
+    "get_export_writer",
+]
@@ -0,0 +1,104 @@
+import logging
+import os
+import zipfile
+from typing import Iterator
+
+from django.db.models import QuerySet
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+
+from django_scopes import scope
+
+from ..models import Event, QuestionAnswer, QuestionKind
+from .rows import EXPORT_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+FILE_CHUNK_SIZE = 64 * 1024
+
+
+class ZipStream:
+    """Unseekable file-like object that keeps what zipfile writes until drained"""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._position = 0
+
+    def write(self, data) -> int:
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def drain(self) -> Iterator[bytes]:
+        if self._buffer:
+            data = bytes(self._buffer)
+            self._buffer.clear()
+            yield data
+
+
+def get_file_answers(event: Event) -> QuerySet[QuestionAnswer]:
+    return (
+        QuestionAnswer.objects.filter(
+            participant__event=event, question__kind=QuestionKind.FILE
+        )
+        .exclude(file="")
+        .exclude(file__isnull=True)
+        .select_related("participant")
+        .order_by("participant__code", "question__block__order", "question__order")
+    )
+
+
+def participant_folder(participant) -> str:
+    return get_valid_filename(f"{participant.code}_{participant.email}")
+
+
+def stream_file_archive(event: Event) -> Iterator[bytes]:
+    # Files are read in chunks and every chunk is handed on as soon as zipfile
+    # has compressed it, so neither the files nor the archive are buffered.
+    with scope(organizer=event.organizer, event=event):
+        stream = ZipStream()
+        with zipfile.ZipFile(
+            stream, mode="w", compression=zipfile.ZIP_DEFLATED
+        ) as archive:
+            folder = None
+            used_names = set()
+            for answer in get_file_answers(event).iterator(
+                chunk_size=EXPORT_CHUNK_SIZE
+            ):
+                if participant_folder(answer.participant) != folder:
+                    folder = participant_folder(answer.participant)
+                    used_names = set()
+
+                name = get_valid_filename(os.path.basename(answer.file.name))
+                stem, extension = os.path.splitext(name)
+                counter = 1
+                while name in used_names:
+                    counter += 1
+                    name = f"{stem}_{counter}{extension}"
+                used_names.add(name)
+
+                try:
+                    source = answer.file.open("rb")
+                except FileNotFoundError:
+                    logger.warning(
+                        "Missing file %s of answer %s", answer.file, answer.pk
+                    )
+                    continue
+                info = zipfile.ZipInfo(
+                    f"{folder}/{name}",
+                    date_time=timezone.localtime(answer.changed_at).timetuple()[:6],
+                )
+                info.compress_type = zipfile.ZIP_DEFLATED
+                info.file_size = answer.file.size
+                with source, archive.open(info, mode="w") as target:
+                    for chunk in source.chunks(FILE_CHUNK_SIZE):
+                        target.write(chunk)
+                        yield from stream.drain()
+                yield from stream.drain()
+        yield from stream.drain()
@@ -0,0 +1,68 @@
+import datetime
+import hashlib
+import json
+from typing import Iterable, Iterator, Optional, Sequence
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Max
+
+from ..cache import LRUCache, get_version
+from ..models import Event
+from .rows import ExportColumn
+
+export_cache = LRUCache(
+    max_entries=settings.PRESIGN_EXPORT_CACHE_MAX_ENTRIES,
+    max_size=settings.PRESIGN_EXPORT_CACHE_MAX_SIZE,
+)
+
+
+def export_data_version_name(event_id) -> str:
+    return f"export-data:{event_id}"
+
+
+def export_fingerprint(
+    event: Event,
+    columns: Sequence[ExportColumn],
+    export_format: str,
+    changed_since: Optional[datetime.datetime] = None,
+) -> str:
+    # The data version is bumped on every participant and answer write. The
+    # aggregates, which only read the (event, changed_at) index, also catch
+    # writes that bypass the model signals. Answer changes are included, as
+    # they update the change time of their participant.
+    participants = event.participant_set.aggregate(
+        count=Count("pk"), changed_at=Max("changed_at")
+    )
+    data = [
+        str(event.pk),
+        get_version(export_data_version_name(event.pk)),
+        participants["count"],
+        participants["changed_at"],
+        [list(column) for column in columns],
+        export_format,
+        changed_since,
+    ]
+    return hashlib.sha256(json.dumps(data, cls=DjangoJSONEncoder).encode()).hexdigest()
+
+
+def cache_export(
+    fingerprint: str, chunks: Iterable[str], cursor: datetime.datetime
+) -> Iterator[str]:
+    # Hands the export through while collecting it, exports that do not fit
+    # into the cache are not collected any further.
+    collected = []
+    size = 0
+    for chunk in chunks:
+        yield chunk
+        if collected is None:
+            continue
+        # The cache is bounded by the size of the encoded content
+        encoded = chunk.encode()
+        size += len(encoded)
+        if export_cache.max_size is not None and size > export_cache.max_size:
+            collected = None
+        else:
+            collected.append(encoded)
+    if collected is not None:
+        export_cache.set(fingerprint, (b"".join(collected), cursor), size=size)
@@ -0,0 +1,140 @@
+import datetime
+import logging
+import tempfile
+from typing import Optional
+
+from django.core.files import File
+from django.db.models import F
+from django.utils import timezone
+
+from django_scopes import scope, scopes_disabled
+
+from ..models import ExportJob, ExportJobStates
+from .rows import (
+    EXPORT_CHUNK_SIZE,
+    build_export_columns,
+    get_export_participants,
+    iter_export_rows,
+    next_export_cursor,
+)
+from .writers import get_export_writer
+
+logger = logging.getLogger(__name__)
+
+
+# A running job without progress for this long was left by a crashed worker
+EXPORT_JOB_TIMEOUT = datetime.timedelta(minutes=10)
+
+# Jobs that were abandoned this many times are not started again
+EXPORT_JOB_MAX_ATTEMPTS = 3
+
+
+def reclaim_stale_export_jobs(now: Optional[datetime.datetime] = None) -> int:
+    """Gives running jobs of crashed workers back to the queue or fails them"""
+    now = now or timezone.now()
+    with scopes_disabled():
+        stale = ExportJob.objects.filter(
+            state=ExportJobStates.RUNNING, heartbeat_at__lt=now - EXPORT_JOB_TIMEOUT
+        )
+        failed = stale.filter(attempts__gte=EXPORT_JOB_MAX_ATTEMPTS).update(
+            state=ExportJobStates.FAILED,
+            error="The export was interrupted too often",
+            finished_at=now,
+        )
+        reset = stale.update(state=ExportJobStates.PENDING, processed=0)
+    if failed or reset:
+        logger.warning("Reclaimed %s and failed %s stale export jobs", reset, failed)
+    return failed + reset
+
+
+def claim_next_export_job() -> Optional[ExportJob]:
+    reclaim_stale_export_jobs()
+    with scopes_disabled():
+        pending = ExportJob.objects.filter(state=ExportJobStates.PENDING).order_by(
+            "created_at"
+        )
+        for job_id in pending.values_list("pk", flat=True)[:10]:
+            # The conditional update makes sure that only one worker gets the job
+            now = timezone.now()
+            claimed = ExportJob.objects.filter(
+                pk=job_id, state=ExportJobStates.PENDING
+            ).update(
+                state=ExportJobStates.RUNNING,
+                started_at=now,
+                heartbeat_at=now,
+                attempts=F("attempts") + 1,
+            )
+            if claimed:
+                return ExportJob.objects.select_related("event__organizer").get(
+                    pk=job_id
+                )
+    return None
+
+
+def count_rows(rows, job: ExportJob, chunk_size: int):
+    processed = 0
+    for row in rows:
+        yield row
+        processed += 1
+        if processed % chunk_size == 0:
+            ExportJob.objects.filter(pk=job.pk).update(
+                processed=processed, heartbeat_at=timezone.now()
+            )
+    job.processed = processed
+
+
+def run_export_job(job: ExportJob, chunk_size: int = EXPORT_CHUNK_SIZE):
+    event = job.event
+    try:
+        with scope(organizer=event.organizer, event=event):
+            job.cursor = next_export_cursor()
+            job.total = get_export_participants(
+                event, changed_since=job.changed_since
+            ).count()
+            ExportJob.objects.filter(pk=job.pk).update(
+                total=job.total, heartbeat_at=timezone.now()
+            )
+
+            columns = build_export_columns(job.fields, job.header)
+            writer = get_export_writer(job.format)(columns)
+
+            with tempfile.TemporaryFile() as export_file:
+                for line in writer.stream(
+                    count_rows(
+                        iter_export_rows(
+                            event,
+                            columns,
+                            chunk_size=chunk_size,
+                            changed_since=job.changed_since,
+                        ),
+                        job,
+                        chunk_size,
+                    )
+                ):
+                    export_file.write(line.encode())
+
+                export_file.seek(0)
+                job.file.save(
+                    f"export.{writer.extension}", File(export_file), save=False
+                )
+
+            job.state = ExportJobStates.DONE
+    except Exception as e:
+        logger.exception("Export job %s failed", job.pk)
+        job.state = ExportJobStates.FAILED
+        job.cursor = None
+        job.error = str(e)
+
+    job.finished_at = timezone.now()
+    with scopes_disabled():
+        job.save(
+            update_fields=[
+                "file",
+                "processed",
+                "cursor",
+                "state",
+                "error",
+                "finished_at",
+            ]
+        )
+    return job
@@ -0,0 +1,155 @@
+import uuid
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from django.db.models import (
+    Aggregate,
+    BooleanField,
+    Case,
+    DateField,
+    DateTimeField,
+    F,
+    FilteredRelation,
+    IntegerField,
+    Max,
+    Q,
+    QuerySet,
+    TextField,
+    TimeField,
+    When,
+)
+from django.db.models.functions import Cast
+
+from ..models import Participant, QuestionKind, QuestionOption
+
+# Name of the filtered join on the answers of the exported questions.
+ANSWERS = "export_answers"
+
+# Values that set_value() writes for answers without a value.
+EMPTY_ANSWERS = ["", "None"]
+
+CAST_FIELDS = {
+    QuestionKind.NUMBER: IntegerField,
+    QuestionKind.DATE: DateField,
+    QuestionKind.TIME: TimeField,
+    QuestionKind.DATETIME: DateTimeField,
+}
+
+
+class GroupConcat(Aggregate):
+    function = "GROUP_CONCAT"
+    output_field = TextField()
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler,
+            connection,
+            function="STRING_AGG",
+            template="%(function)s(%(expressions)s::text, ',')",
+            **extra_context,
+        )
+
+
+def pivot_expression(question_id: str, kind: str):
+    matches = Q(**{f"{ANSWERS}__question_id": question_id})
+    answer = F(f"{ANSWERS}__answer")
+    if kind in CAST_FIELDS:
+        return Max(
+            Case(
+                When(**{f"{ANSWERS}__answer__in": EMPTY_ANSWERS}, then=None),
+                default=Cast(answer, CAST_FIELDS[kind]()),
+            ),
+            filter=matches,
+        )
+    elif kind == QuestionKind.BOOL:
+        return Cast(
+            Max(
+                Case(
+                    When(**{f"{ANSWERS}__answer": str(True)}, then=1),
+                    default=0,
+                ),
+                filter=matches,
+            ),
+            BooleanField(),
+        )
+    elif kind in [QuestionKind.CHOICE, QuestionKind.MULTIPLE_CHOICE]:
+        return GroupConcat(f"{ANSWERS}__options__id", filter=matches)
+    elif kind == QuestionKind.FILE:
+        return Max(f"{ANSWERS}__file", filter=matches)
+    else:
+        return Max(answer, filter=matches)
+
+
+def build_pivot_queryset(
+    participants: QuerySet[Participant], columns: Sequence
+) -> QuerySet:
+    # One row per participant: the answers to the exported questions are joined
+    # once and every question column picks its answer with a filtered aggregate.
+    questions = {
+        column.key: column.kind for column in columns if column.kind is not None
+    }
+    queryset = participants.values("pk", "email")
+    if not questions:
+        return queryset
+    return queryset.alias(
+        **{
+            ANSWERS: FilteredRelation(
+                "questionanswer",
+                condition=Q(questionanswer__question_id__in=list(questions.keys())),
+            )
+        }
+    ).annotate(
+        **{
+            f"q_{index}": pivot_expression(question_id, kind)
+            for index, (question_id, kind) in enumerate(questions.items())
+        }
+    )
+
+
+def get_option_labels(columns: Sequence) -> Dict[uuid.UUID, QuestionOption]:
+    question_ids = [
+        column.key
+        for column in columns
+        if column.kind in [QuestionKind.CHOICE, QuestionKind.MULTIPLE_CHOICE]
+    ]
+    if not question_ids:
+        return {}
+    return {
+        option.pk: option
+        for option in QuestionOption.objects.filter(question_id__in=question_ids)
+    }
+
+
+def decode_options(value: Optional[str], options: Dict[uuid.UUID, QuestionOption]):
+    if not value:
+        return []
+    # SQLite and PostgreSQL use different textual forms of UUIDs, both of which
+    # uuid.UUID() accepts.
+    selected = [options[uuid.UUID(option_id)] for option_id in value.split(",")]
+    selected.sort(key=lambda option: option.order)
+    return [str(option.value) for option in selected]
+
+
+def iter_pivot_rows(
+    queryset: QuerySet, columns: Sequence, options: Dict[uuid.UUID, QuestionOption]
+) -> Iterator[List]:
+    question_keys = {}
+    for column in columns:
+        if column.kind is not None and column.key not in question_keys:
+            question_keys[column.key] = f"q_{len(question_keys)}"
+
+    for result in queryset:
+        row = []
+        for column in columns:
+            if column.key == "__email":
+                row.append(result["email"])
+            elif column.key == "__id":
+                row.append(str(result["pk"]))
+            else:
+                value = result[question_keys[column.key]]
+                if column.kind == QuestionKind.CHOICE:
+                    labels = decode_options(value, options)
+                    value = labels[0] if labels else None
+                elif column.kind == QuestionKind.MULTIPLE_CHOICE:
+                    value = decode_options(value, options)
+                row.append(value)
+        yield row
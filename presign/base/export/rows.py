@@ -0,0 +1,130 @@
+import datetime
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from django_scopes import scope
+
+from ..models import Event, Participant, Question, QuestionAnswer
+from .pivot import build_pivot_queryset, get_option_labels, iter_pivot_rows
+
+EXPORT_CHUNK_SIZE = 500
+
+
+class ExportColumn(NamedTuple):
+    key: str
+    label: str
+    kind: Optional[str] = None
+
+
+def get_default_export_fields(event: Event) -> List[Tuple[str, str]]:
+    fields = [("__id", str(_("Id"))), ("__email", str(_("Email")))]
+    questions = Question.objects.filter(
+        block__questionnaire__eventquestionnaire__event=event
+    ).order_by(
+        "block__questionnaire__eventquestionnaire__role", "block__order", "order"
+    )
+    fields += [(str(question.pk), str(question.name)) for question in questions]
+    return fields
+
+
+def build_export_columns(
+    fields: Sequence[str], labels: Sequence[str]
+) -> List[ExportColumn]:
+    question_ids = [field for field in fields if not field.startswith("__")]
+    kinds = {
+        str(pk): kind
+        for pk, kind in Question.objects.filter(pk__in=question_ids).values_list(
+            "pk", "kind"
+        )
+    }
+    return [
+        ExportColumn(key=field, label=str(label), kind=kinds.get(field))
+        for field, label in zip(fields, labels)
+    ]
+
+
+def get_export_participants(
+    event: Event, changed_since: Optional[datetime.datetime] = None
+) -> QuerySet[Participant]:
+    participants = event.participant_set.all()
+    if changed_since is not None:
+        changed_answers = QuestionAnswer.objects.filter(
+            participant__event=event, changed_at__gt=changed_since
+        ).values("participant_id")
+        participants = participants.filter(
+            Q(changed_at__gt=changed_since) | Q(pk__in=changed_answers)
+        )
+    return participants
+
+
+def next_export_cursor() -> datetime.datetime:
+    # Taken before the export is read, so changes that are written while the
+    # export runs are contained in the next delta again instead of being lost.
+    return timezone.now()
+
+
+def format_export_cursor(cursor: datetime.datetime) -> str:
+    return cursor.isoformat()
+
+
+def parse_export_cursor(value: str) -> datetime.datetime:
+    cursor = datetime.datetime.fromisoformat(value)
+    if timezone.is_naive(cursor):
+        cursor = timezone.make_aware(cursor)
+    return cursor
+
+
+def iter_participant_chunks(
+    queryset: QuerySet, chunk_size: int = EXPORT_CHUNK_SIZE
+) -> Iterator[list]:
+    # Keyset pagination on the primary key keeps every chunk query cheap, no
+    # matter how deep into the participant list we are. Works on model and on
+    # values() querysets.
+    queryset = queryset.order_by("pk")
+    last_pk = None
+    while True:
+        chunk_queryset = queryset
+        if last_pk is not None:
+            chunk_queryset = chunk_queryset.filter(pk__gt=last_pk)
+        chunk = list(chunk_queryset[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        if len(chunk) < chunk_size:
+            return
+        last = chunk[-1]
+        last_pk = last["pk"] if isinstance(last, dict) else last.pk
+
+
+def iter_export_rows(
+    event: Event,
+    columns: Sequence[ExportColumn],
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+    changed_since: Optional[datetime.datetime] = None,
+) -> Iterator[list]:
+    participants = get_export_participants(event, changed_since=changed_since)
+    pivot = build_pivot_queryset(participants, columns)
+    options = get_option_labels(columns)
+
+    for chunk in iter_participant_chunks(pivot, chunk_size):
+        yield from iter_pivot_rows(chunk, columns, options)
+
+
+def stream_export(
+    event: Event,
+    columns: Sequence[ExportColumn],
+    writer,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+    changed_since: Optional[datetime.datetime] = None,
+) -> Iterator[str]:
+    # The response is consumed after the middleware left its scope, so the
+    # generator has to activate the scope by itself.
+    with scope(organizer=event.organizer, event=event):
+        yield from writer.stream(
+            iter_export_rows(
+                event, columns, chunk_size=chunk_size, changed_since=changed_since
+            )
+        )
@@ -0,0 +1,138 @@
+import csv
+import datetime
+import json
+from typing import Iterable, Iterator, Sequence
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.translation import gettext_lazy as _
+
+from ..models import QuestionKind
+from .rows import EXPORT_CHUNK_SIZE, ExportColumn
+
+COLUMN_TYPES = {
+    QuestionKind.NUMBER: "int",
+    QuestionKind.BOOL: "bool",
+    QuestionKind.MULTIPLE_CHOICE: "list<string>",
+    QuestionKind.DATE: "date",
+    QuestionKind.TIME: "time",
+    QuestionKind.DATETIME: "datetime",
+}
+
+
+def column_type(column: ExportColumn) -> str:
+    return COLUMN_TYPES.get(column.kind, "string")
+
+
+class Echo:
+    """File-like object that hands back whatever is written to it"""
+
+    def write(self, value):
+        return value
+
+
+class BaseExportWriter:
+    identifier = None
+    verbose_name = None
+    content_type = None
+    extension = None
+
+    def __init__(self, columns: Sequence[ExportColumn]):
+        self.columns = columns
+
+    def stream(self, rows: Iterable[list]) -> Iterator[str]:
+        raise NotImplementedError("stream must be implemented")
+
+
+class CSVExportWriter(BaseExportWriter):
+    identifier = "csv"
+    verbose_name = _("CSV")
+    content_type = "text/csv; charset=utf-8"
+    extension = "csv"
+
+    def format_cell(self, value):
+        if value is None:
+            return ""
+        if isinstance(value, list):
+            return ", ".join(value)
+        if isinstance(value, (datetime.date, datetime.time)):
+            return value.isoformat()
+        return value
+
+    def stream(self, rows):
+        writer = csv.writer(Echo())
+        yield writer.writerow([column.label for column in self.columns])
+        for row in rows:
+            yield writer.writerow([self.format_cell(value) for value in row])
+
+
+class JSONLinesExportWriter(BaseExportWriter):
+    identifier = "jsonl"
+    verbose_name = _("JSON Lines (one participant per line)")
+    content_type = "application/jsonl; charset=utf-8"
+    extension = "jsonl"
+
+    def get_keys(self):
+        keys = []
+        for column in self.columns:
+            key = column.label
+            if key in keys:
+                key = f"{column.label} ({column.key})"
+            keys.append(key)
+        return keys
+
+    def stream(self, rows):
+        keys = self.get_keys()
+        for row in rows:
+            yield json.dumps(dict(zip(keys, row)), cls=DjangoJSONEncoder) + "\n"
+
+
+class ColumnarExportWriter(BaseExportWriter):
+    """
+    Writes a schema line followed by one line per row group that holds the
+    values column by column, like the row groups of columnar file formats.
+    """
+
+    identifier = "columnar"
+    verbose_name = _("Columnar JSON (typed columns in row groups)")
+    content_type = "application/jsonl; charset=utf-8"
+    extension = "columnar.jsonl"
+
+    def __init__(self, *args, row_group_size: int = EXPORT_CHUNK_SIZE, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.row_group_size = row_group_size
+
+    def encode_row_group(self, row_group):
+        data = [list(values) for values in zip(*row_group)]
+        return (
+            json.dumps({"rows": len(row_group), "columns": data}, cls=DjangoJSONEncoder)
+            + "\n"
+        )
+
+    def stream(self, rows):
+        schema = [
+            {"key": column.key, "name": column.label, "type": column_type(column)}
+            for column in self.columns
+        ]
+        yield json.dumps({"schema": schema}) + "\n"
+
+        row_group = []
+        for row in rows:
+            row_group.append(row)
+            if len(row_group) >= self.row_group_size:
+                yield self.encode_row_group(row_group)
+                row_group = []
+        if row_group:
+            yield self.encode_row_group(row_group)
+
+
+EXPORT_WRITERS = {
+    writer.identifier: writer
+    for writer in (CSVExportWriter, JSONLinesExportWriter, ColumnarExportWriter)
+}
+
+
+def get_export_writer(identifier: str):
+    try:
+        return EXPORT_WRITERS[identifier]
+    except KeyError:
+        raise ValueError(f"Unknown export format {identifier}")
@@ -0,0 +1,142 @@
+import time
+from urllib import parse
+
+from django.conf import settings
+from django.core.handlers.base import BaseHandler
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django.urls import get_resolver, resolve, reverse
+
+from django_scopes import scopes_disabled
+
+from presign.base.models import Event
+
+RESOLVE_MIDDLEWARE = "presign.base.middleware.resolve_request_middleware"
+
+# The middlewares that resolved the url themselves before there was
+# resolve_request_middleware
+RESOLVING_MIDDLEWARES = [
+    "presign.control.middleware.ControlMiddleware",
+    "presign.signup.middleware.SignupMiddleware",
+]
+
+
+def resolve_per_middleware(get_response):
+    """The resolve() a resolving middleware did before calling the next one"""
+
+    def middleware(request):
+        request.resolver_match = resolve(request.path_info)
+        return get_response(request)
+
+    return middleware
+
+
+def get_baseline_middleware():
+    middleware = []
+    for name in settings.MIDDLEWARE:
+        if name == RESOLVE_MIDDLEWARE:
+            continue
+        if name in RESOLVING_MIDDLEWARES:
+            middleware.append(f"{__name__}.resolve_per_middleware")
+        middleware.append(name)
+    return middleware
+
+
+class MiddlewareStackHandler(BaseHandler):
+    """Runs all middlewares and resolves the view, but does not call it"""
+
+    def __init__(self, middleware=None):
+        super().__init__()
+        with override_settings(MIDDLEWARE=middleware or settings.MIDDLEWARE):
+            self.load_middleware()
+
+    def _get_response(self, request):
+        self.resolve_request(request)
+        return HttpResponse()
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the time the middlewares take per request and count the url "
+        "resolutions, without calling the views"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "paths",
+            nargs="*",
+            help="Paths to request, default: the index, control and one event",
+        )
+        parser.add_argument("--requests", type=int, default=1000)
+        parser.add_argument(
+            "--rounds",
+            type=int,
+            default=5,
+            help="Measure this often, alternating with the baseline, and keep "
+            "the fastest round",
+        )
+        parser.add_argument(
+            "--no-baseline",
+            action="store_true",
+            help="Only measure the current middlewares",
+        )
+
+    def get_default_paths(self):
+        paths = ["/", reverse("control:index")]
+        with scopes_disabled():
+            event = Event.objects.select_related("organizer").first()
+        if event:
+            paths.append(event.get_absolute_url())
+        return paths
+
+    def count_resolutions(self, handler, request) -> int:
+        resolver = get_resolver()
+        resolutions = 0
+
+        def resolve(path):
+            nonlocal resolutions
+            resolutions += 1
+            return type(resolver).resolve(resolver, path)
+
+        resolver.resolve = resolve
+        try:
+            handler.get_response(request)
+        finally:
+            del resolver.resolve
+        return resolutions
+
+    def measure(self, handler, factory, path, requests):
+        resolutions = self.count_resolutions(handler, factory.get(path))
+        requests = [factory.get(path) for _ in range(requests)]
+        start = time.perf_counter()
+        for request in requests:
+            handler.get_response(request)
+        duration = time.perf_counter() - start
+        return duration / len(requests) * 1e6, resolutions
+
+    def handle(self, *args, **options):
+        handlers = [("current", MiddlewareStackHandler())]
+        if not options["no_baseline"]:
+            # Every resolving middleware resolves the url on its own
+            handlers.insert(
+                0, ("baseline", MiddlewareStackHandler(get_baseline_middleware()))
+            )
+        factory = RequestFactory(
+            HTTP_HOST=parse.urlparse(settings.PRESIGN_SITE_URL).netloc
+        )
+
+        for path in options["paths"] or self.get_default_paths():
+            timings = {name: [] for name, _handler in handlers}
+            for _round in range(options["rounds"]):
+                for name, handler in handlers:
+                    duration, resolutions = self.measure(
+                        handler, factory, path, options["requests"]
+                    )
+                    timings[name].append((duration, resolutions))
+            for name, results in timings.items():
+                duration, resolutions = min(results)
+                self.stdout.write(
+                    f"{path} ({name}): {duration:.1f} µs per request, "
+                    f"{resolutions} url resolutions"
+                )
@@ -0,0 +1,95 @@
+import sys
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from django_scopes import scopes_disabled
+
+from presign.base.export import (
+    EXPORT_WRITERS,
+    build_export_columns,
+    format_export_cursor,
+    get_default_export_fields,
+    get_export_writer,
+    next_export_cursor,
+    parse_export_cursor,
+    stream_export,
+)
+from presign.base.models import Event
+
+
+class Command(BaseCommand):
+    help = "Export the participants of an event, optionally only those changed since a cursor"
+
+    def add_arguments(self, parser):
+        parser.add_argument("ORGANIZER", help="Slug of the organizer")
+        parser.add_argument("EVENT", help="Slug of the event")
+        parser.add_argument(
+            "--format", choices=sorted(EXPORT_WRITERS.keys()), default="csv"
+        )
+        parser.add_argument(
+            "--field",
+            action="append",
+            dest="fields",
+            help="Field to export (__id, __email or a question id). "
+            "Can be given multiple times, defaults to all fields.",
+        )
+        parser.add_argument(
+            "--changed-since",
+            help="Only export participants whose state or answers changed after this cursor",
+        )
+        parser.add_argument(
+            "--cursor-file",
+            type=Path,
+            help="Read the cursor from this file and store the new cursor in it afterwards",
+        )
+        parser.add_argument(
+            "--output",
+            type=Path,
+            help="Write the export to this file instead of stdout",
+        )
+
+    def handle(self, *args, **options):
+        with scopes_disabled():
+            event = (
+                Event.objects.select_related("organizer")
+                .filter(organizer__slug=options["ORGANIZER"], slug=options["EVENT"])
+                .first()
+            )
+        if event is None:
+            raise CommandError("Event not found")
+
+        changed_since = options["changed_since"]
+        cursor_file = options["cursor_file"]
+        if changed_since is None and cursor_file and cursor_file.exists():
+            changed_since = cursor_file.read_text().strip() or None
+        try:
+            changed_since = changed_since and parse_export_cursor(changed_since)
+        except ValueError:
+            raise CommandError(f"Invalid cursor {changed_since}")
+
+        with scopes_disabled():
+            available_fields = dict(get_default_export_fields(event))
+            fields = options["fields"] or list(available_fields.keys())
+            unknown_fields = set(fields) - set(available_fields.keys())
+            if unknown_fields:
+                raise CommandError(f"Unknown fields: {', '.join(unknown_fields)}")
+            columns = build_export_columns(
+                fields, [available_fields[field] for field in fields]
+            )
+
+        writer = get_export_writer(options["format"])(columns)
+        cursor = next_export_cursor()
+        output = options["output"].open("w") if options["output"] else sys.stdout
+        try:
+            for chunk in stream_export(
+                event, columns, writer, changed_since=changed_since
+            ):
+                output.write(chunk)
+        finally:
+            if options["output"]:
+                output.close()
+
+        if cursor_file:
+            cursor_file.write_text(format_export_cursor(cursor))
+        self.stderr.write(f"Next cursor: {format_export_cursor(cursor)}")
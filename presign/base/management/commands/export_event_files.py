@@ -0,0 +1,42 @@
+import sys
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from django_scopes import scopes_disabled
+
+from presign.base.export import stream_file_archive
+from presign.base.models import Event
+
+
+class Command(BaseCommand):
+    help = "Write a ZIP archive of all files uploaded by the participants of an event"
+
+    def add_arguments(self, parser):
+        parser.add_argument("ORGANIZER", help="Slug of the organizer")
+        parser.add_argument("EVENT", help="Slug of the event")
+        parser.add_argument(
+            "--output",
+            type=Path,
+            help="Write the archive to this file instead of stdout",
+        )
+
+    def handle(self, *args, **options):
+        with scopes_disabled():
+            event = (
+                Event.objects.select_related("organizer")
+                .filter(organizer__slug=options["ORGANIZER"], slug=options["EVENT"])
+                .first()
+            )
+        if event is None:
+            raise CommandError("Event not found")
+
+        output = (
+            options["output"].open("wb") if options["output"] else sys.stdout.buffer
+        )
+        try:
+            for chunk in stream_file_archive(event):
+                output.write(chunk)
+        finally:
+            if options["output"]:
+                output.close()
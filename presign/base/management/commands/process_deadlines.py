@@ -0,0 +1,53 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from presign.base.deadlines import process_deadlines
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Apply the deadline rules to events whose deadlines have passed"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            help=(
+                "Process deadlines since this ISO datetime instead of the last "
+                "run. Reminder emails may be sent again."
+            ),
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            help="Keep running and process deadlines every this many seconds",
+        )
+
+    def handle(self, *args, **options):
+        since = None
+        if options["since"]:
+            since = parse_datetime(options["since"])
+            if since is None:
+                raise CommandError("--since is not a valid datetime")
+
+        while True:
+            try:
+                results = process_deadlines(since=since)
+            except Exception:
+                if options["interval"] is None:
+                    raise
+                # Keep the worker running, the next run retries
+                logger.exception("Processing deadlines failed")
+                results = []
+            for rule, event, count in results:
+                self.stdout.write(
+                    f"{rule.name}: {count} participants of "
+                    f"{event.organizer.slug}/{event.slug}"
+                )
+            if options["interval"] is None:
+                return
+            since = None
+            time.sleep(options["interval"])
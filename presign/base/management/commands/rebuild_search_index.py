@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from django_scopes import scopes_disabled
+
+from presign.base.models import Participant
+from presign.base.search import update_search_documents
+
+
+class Command(BaseCommand):
+    help = "Rebuild the participant search index"
+
+    @scopes_disabled()
+    def handle(self, *args, **options):
+        participant_ids = list(Participant.objects.values_list("pk", flat=True))
+        update_search_documents(participant_ids)
+        self.stdout.write(f"Indexed {len(participant_ids)} participants")
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from django_scopes import scopes_disabled
+
+from presign.base.models import Event, EventStateCounter, Participant
+
+
+class Command(BaseCommand):
+    help = "Recalculate the participant state counters of all events"
+
+    @scopes_disabled()
+    def handle(self, *args, **options):
+        for event in Event.objects.select_related("organizer"):
+            with transaction.atomic():
+                # Lock the stored counters while they are compared and replaced
+                stored = {
+                    counter.state: counter.count
+                    for counter in EventStateCounter.objects.select_for_update().filter(
+                        event=event
+                    )
+                    if counter.count
+                }
+                actual = dict(
+                    Participant.objects.filter(event=event)
+                    .values("state")
+                    .annotate(count=Count("pk"))
+                    .values_list("state", "count")
+                )
+                if stored == actual:
+                    continue
+
+                EventStateCounter.objects.filter(event=event).delete()
+                EventStateCounter.objects.bulk_create(
+                    EventStateCounter(event=event, state=state, count=count)
+                    for state, count in actual.items()
+                )
+            self.stdout.write(
+                f"Repaired counters of {event.organizer.slug}/{event.slug}: "
+                f"{stored} -> {actual}"
+            )
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from presign.base.outbox import EMAIL_BATCH_SIZE, send_pending_emails
+
+
+class Command(BaseCommand):
+    help = "Send queued emails"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit as soon as there are no emails left to send",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Seconds to wait before polling for new emails",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=EMAIL_BATCH_SIZE,
+            help="Number of emails sent over one connection",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            count = send_pending_emails(limit=options["batch_size"])
+            if count:
+                self.stdout.write(f"Processed {count} emails")
+                continue
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from presign.base.export import claim_next_export_job, run_export_job
+from presign.base.models import ExportJobStates
+
+
+class Command(BaseCommand):
+    help = "Process pending background exports"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit as soon as there are no pending exports left",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Seconds to wait before polling for new exports",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            job = claim_next_export_job()
+            if job is None:
+                if options["once"]:
+                    return
+                time.sleep(options["interval"])
+                continue
+
+            job = run_export_job(job)
+            if job.state == ExportJobStates.DONE:
+                self.stdout.write(f"Finished export {job.pk}")
+            else:
+                self.stderr.write(f"Export {job.pk} failed: {job.error}")
@@ -1,6 +1,6 @@
 from django.conf import settings
 from django.http import HttpRequest
-from django.urls import get_script_prefix
+from django.urls import Resolver404, get_script_prefix, resolve
 
 from django_scopes import scopes_disabled
 
@@ -17,3 +17,24 @@ def ignore_scopes_in_admin_middleware(
         return get_response(request)
 
     return middleware
+
+
+def resolve_request_middleware(get_response):
+    """
+    Resolves the url once for all following middlewares instead of once per
+    middleware. The match is stored as `request.resolver_match`, the request
+    handler still resolves the view itself.
+    """
+
+    def middleware(request: HttpRequest):
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            # Resolved again and turned into a 404 page by the request handler
+            return get_response(request)
+
+        request.resolver_match = match
+        request.resolved_path = match
+        return get_response(request)
+
+    return middleware
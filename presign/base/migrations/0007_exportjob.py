@@ -0,0 +1,86 @@
+# Generated by Django 5.1.1 on 2026-10-18 00:52
+
+import uuid
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+import presign.base.models.export
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("base", "0006_globalsettings_status_textsstore_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExportJob",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("fields", models.JSONField()),
+                ("header", models.JSONField()),
+                (
+                    "state",
+                    models.CharField(
+                        choices=[
+                            ("PEN", "Pending"),
+                            ("RUN", "Running"),
+                            ("DON", "Done"),
+                            ("FAI", "Failed"),
+                        ],
+                        default="PEN",
+                        max_length=3,
+                    ),
+                ),
+                ("total", models.PositiveIntegerField(default=0)),
+                ("processed", models.PositiveIntegerField(default=0)),
+                ("error", models.TextField(blank=True)),
+                (
+                    "file",
+                    models.FileField(
+                        blank=True,
+                        null=True,
+                        upload_to=presign.base.models.export.export_job_upload_to,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("heartbeat_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "event",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="base.event"
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("-created_at",),
+                "indexes": [
+                    models.Index(
+                        fields=["state", "created_at"], name="exportjob_state_created"
+                    )
+                ],
+            },
+        ),
+    ]
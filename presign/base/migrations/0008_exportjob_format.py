@@ -0,0 +1,17 @@
+# Generated by Django 5.1.1 on 2026-10-18 00:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("base", "0007_exportjob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exportjob",
+            name="format",
+            field=models.CharField(default="csv", max_length=20),
+        ),
+    ]
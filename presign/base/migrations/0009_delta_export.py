@@ -0,0 +1,46 @@
+# Generated by Django 5.1.1 on 2026-10-18 00:58
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("base", "0008_exportjob_format"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exportjob",
+            name="changed_since",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="exportjob",
+            name="cursor",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="historicalparticipant",
+            name="changed_at",
+            field=models.DateTimeField(
+                blank=True, default=django.utils.timezone.now, editable=False
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="participant",
+            name="changed_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name="participant",
+            index=models.Index(
+                fields=["event", "changed_at"], name="participant_event_changed"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="questionanswer",
+            index=models.Index(fields=["changed_at"], name="questionanswer_changed_at"),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.1.1 on 2026-10-18 01:08
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_created_at(apps, schema_editor):
+    # Existing participants get the time of the migration. Their first history
+    # record is the closest to their real creation time.
+    Participant = apps.get_model("base", "Participant")
+    HistoricalParticipant = apps.get_model("base", "HistoricalParticipant")
+    first_history_date = Subquery(
+        HistoricalParticipant.objects.filter(id=OuterRef("pk"))
+        .order_by("history_date")
+        .values("history_date")[:1]
+    )
+    Participant.objects.filter(created_at__gt=first_history_date).update(
+        created_at=first_history_date
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("base", "0009_delta_export"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="historicalparticipant",
+            name="created_at",
+            field=models.DateTimeField(
+                blank=True, default=django.utils.timezone.now, editable=False
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="participant",
+            name="created_at",
+            field=models.DateTimeField(
+                auto_now_add=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_created_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="participant",
+            index=models.Index(
+                fields=["event", "created_at", "id"], name="participant_event_created"
+            ),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.1.1 on 2026-10-18 01:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def create_state_counters(apps, schema_editor):
+    Participant = apps.get_model("base", "Participant")
+    EventStateCounter = apps.get_model("base", "EventStateCounter")
+    EventStateCounter.objects.bulk_create(
+        EventStateCounter(
+            event_id=row["event_id"], state=row["state"], count=row["count"]
+        )
+        for row in Participant.objects.values("event_id", "state").annotate(
+            count=Count("pk")
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("base", "0010_participant_created_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EventStateCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "state",
+                    models.CharField(
+                        choices=[
+                            ("NEW", "New signup"),
+                            ("REJ", "Rejected"),
+                            ("Q1C", "Changes requested in questionnaire 1"),
+                            ("APP", "Approved"),
+                            ("NER", "Needs review"),
+                            ("Q2C", "Changes requested in questionnaire 2"),
+                            ("CON", "Confirmed"),
+                            ("WIT", "Withdrawn"),
+                            ("CAN", "Cancelled"),
+                        ],
+                        max_length=3,
+                    ),
+                ),
+                ("count", models.PositiveIntegerField(default=0)),
+                (
+                    "event",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="state_counters",
+                        to="base.event",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("state",),
+                "constraints": [
+                    models.UniqueConstraint(
+                        models.F("event"),
+                        models.F("state"),
+                        name="unique_event_state_counter",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(create_state_counters, migrations.RunPython.noop),
+    ]
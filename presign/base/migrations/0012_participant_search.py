@@ -0,0 +1,102 @@
+# Generated by Django 5.1.1 on 2026-10-18 01:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+SQLITE_CREATE = [
+    "CREATE VIRTUAL TABLE base_participantsearch_fts USING fts5("
+    "content, content='base_participantsearchdocument', content_rowid='id')",
+    "CREATE TRIGGER base_participantsearch_ai AFTER INSERT ON base_participantsearchdocument BEGIN "
+    "INSERT INTO base_participantsearch_fts(rowid, content) VALUES (new.id, new.content); "
+    "END",
+    "CREATE TRIGGER base_participantsearch_ad AFTER DELETE ON base_participantsearchdocument BEGIN "
+    "INSERT INTO base_participantsearch_fts(base_participantsearch_fts, rowid, content) "
+    "VALUES ('delete', old.id, old.content); "
+    "END",
+    "CREATE TRIGGER base_participantsearch_au AFTER UPDATE ON base_participantsearchdocument BEGIN "
+    "INSERT INTO base_participantsearch_fts(base_participantsearch_fts, rowid, content) "
+    "VALUES ('delete', old.id, old.content); "
+    "INSERT INTO base_participantsearch_fts(rowid, content) VALUES (new.id, new.content); "
+    "END",
+]
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS base_participantsearch_ai",
+    "DROP TRIGGER IF EXISTS base_participantsearch_ad",
+    "DROP TRIGGER IF EXISTS base_participantsearch_au",
+    "DROP TABLE IF EXISTS base_participantsearch_fts",
+]
+POSTGRESQL_CREATE = [
+    "CREATE INDEX base_participantsearch_gin ON base_participantsearchdocument "
+    "USING gin (to_tsvector('simple'::regconfig, COALESCE(content, '')))",
+]
+POSTGRESQL_DROP = [
+    "DROP INDEX IF EXISTS base_participantsearch_gin",
+]
+
+
+def create_search_documents(apps, schema_editor):
+    Participant = apps.get_model("base", "Participant")
+    QuestionAnswer = apps.get_model("base", "QuestionAnswer")
+    ParticipantSearchDocument = apps.get_model("base", "ParticipantSearchDocument")
+
+    contents = {
+        participant.pk: [participant.email]
+        for participant in Participant.objects.only("pk", "email")
+    }
+    for participant_id, answer in (
+        QuestionAnswer.objects.filter(question__kind__in=["S", "TX", "EM", "PN"])
+        .exclude(answer=None)
+        .values_list("participant_id", "answer")
+    ):
+        contents[participant_id].append(answer)
+    ParticipantSearchDocument.objects.bulk_create(
+        ParticipantSearchDocument(
+            participant_id=pk,
+            event_id=event_id,
+            content="\n".join(contents[pk]),
+        )
+        for pk, event_id in Participant.objects.values_list("pk", "event_id")
+    )
+
+
+def run_for_vendor(statements):
+    def run(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("base", "0011_event_state_counter"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ParticipantSearchDocument",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                (
+                    "participant",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_document",
+                        to="base.participant",
+                    ),
+                ),
+                ("content", models.TextField(blank=True)),
+                (
+                    "event",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="base.event"
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunPython(
+            run_for_vendor({"sqlite": SQLITE_CREATE, "postgresql": POSTGRESQL_CREATE}),
+            run_for_vendor({"sqlite": SQLITE_DROP, "postgresql": POSTGRESQL_DROP}),
+        ),
+        migrations.RunPython(create_search_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.1 on 2026-10-18 01:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("base", "0013_outgoing_email"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ScheduledTaskRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, unique=True)),
+                ("last_run_at", models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(fields=["event_date"], name="event_event_date"),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(fields=["signup_end"], name="event_signup_end"),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(fields=["lock_date"], name="event_lock_date"),
+        ),
+    ]
@@ -1,6 +1,9 @@
+from .email import OutgoingEmail, OutgoingEmailStates
 from .event import Event, EventQuestionnaire, QuestionnaireRole
+from .export import ExportJob, ExportJobStates
 from .organizer import Organizer
 from .participant import (
+    EventStateCounter,
     Participant,
     ParticipantStateActions,
     ParticipantStates,
@@ -15,14 +18,21 @@ from .questions import (
     Questionnaire,
     QuestionOption,
 )
+from .schedule import ScheduledTaskRun
+from .search import ParticipantSearchDocument
 from .texts import GlobalSettings
 from .user import User
 
 __all__ = [
+    "OutgoingEmail",
+    "OutgoingEmailStates",
     "Event",
     "EventQuestionnaire",
     "QuestionnaireRole",
+    "ExportJob",
+    "ExportJobStates",
     "Organizer",
+    "EventStateCounter",
     "Participant",
     "ParticipantStateActions",
     "ParticipantStates",
@@ -34,6 +44,8 @@ __all__ = [
     "QuestionKind",
     "Questionnaire",
     "QuestionOption",
+    "ScheduledTaskRun",
+    "ParticipantSearchDocument",
     "GlobalSettings",
     "User",
 ]
@@ -0,0 +1,57 @@
+import uuid
+
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from django_scopes import ScopedManager
+
+
+class OutgoingEmailStates(models.TextChoices):
+    PENDING = "PEN", _("Pending")
+    SENT = "SEN", _("Sent")
+    FAILED = "FAI", _("Failed")
+
+
+class OutgoingEmail(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    event = models.ForeignKey("base.Event", on_delete=models.CASCADE)
+    participant = models.ForeignKey(
+        "base.Participant", null=True, blank=True, on_delete=models.SET_NULL
+    )
+
+    to = models.EmailField()
+    subject = models.TextField()
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+
+    state = models.CharField(
+        choices=OutgoingEmailStates.choices,
+        default=OutgoingEmailStates.PENDING,
+        max_length=3,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    # Set by the sender that claimed the email for its latest attempt
+    claim_token = models.UUIDField(null=True, blank=True, db_index=True)
+    # Pending emails are sent once this time has passed. Senders move it
+    # forward when they claim an email, so a crashed sender's emails are
+    # retried later.
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    objects = ScopedManager(organizer="event__organizer", event="event")
+
+    class Meta:
+        ordering = ("-created_at",)
+        indexes = [
+            models.Index(
+                fields=["state", "next_attempt_at"], name="outgoingemail_state_next"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.to}: {self.subject} ({self.get_state_display()})"
@@ -11,6 +11,7 @@ from django_scopes import ScopedManager
 from simple_history.models import HistoricalRecords
 
 from ..fields import DateTimeLocalModelField, I18nCharField, I18nTextField
+from .participant import ParticipantStates
 from .texts import TextMixin, email_hierarkey, status_hierarkey
 
 
@@ -47,6 +48,12 @@ class Event(TextMixin, models.Model):
                 Lower("slug"), "organizer", name="unique_event_slug_per_organizer"
             ),
         ]
+        indexes = [
+            # Used to find events whose deadlines have passed
+            models.Index(fields=["event_date"], name="event_event_date"),
+            models.Index(fields=["signup_end"], name="event_signup_end"),
+            models.Index(fields=["lock_date"], name="event_lock_date"),
+        ]
 
     def get_absolute_url(self):
         return reverse(
@@ -108,6 +115,13 @@ class Event(TextMixin, models.Model):
             eventquestionnaire__role=QuestionnaireRole.AFTER_APPROVAL
         ).first()
 
+    def get_state_counts(self):
+        counts = {counter.state: counter.count for counter in self.state_counters.all()}
+        return [(state, counts.get(state.value, 0)) for state in ParticipantStates]
+
+    def get_participant_count(self):
+        return sum(counter.count for counter in self.state_counters.all())
+
     def can_be_enabled(self):
         return (
             self.questionnaire_signup() is not None
@@ -0,0 +1,77 @@
+import uuid
+
+from django.conf import settings
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from django_scopes import ScopedManager
+
+from ..utils import sign_url
+
+
+class ExportJobStates(models.TextChoices):
+    PENDING = "PEN", _("Pending")
+    RUNNING = "RUN", _("Running")
+    DONE = "DON", _("Done")
+    FAILED = "FAI", _("Failed")
+
+
+def export_job_upload_to(instance, filename):
+    return f"exports/{instance.event_id}/{instance.pk}/{filename}"
+
+
+class ExportJob(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    event = models.ForeignKey("base.Event", on_delete=models.CASCADE)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL
+    )
+
+    fields = models.JSONField()
+    header = models.JSONField()
+    format = models.CharField(max_length=20, default="csv")
+    changed_since = models.DateTimeField(null=True, blank=True)
+    cursor = models.DateTimeField(null=True, blank=True)
+
+    state = models.CharField(
+        choices=ExportJobStates.choices, default=ExportJobStates.PENDING, max_length=3
+    )
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+
+    file = models.FileField(upload_to=export_job_upload_to, null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # Updated with the progress, so jobs of crashed workers can be found
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+
+    objects = ScopedManager(organizer="event__organizer", event="event")
+
+    class Meta:
+        ordering = ("-created_at",)
+        indexes = [
+            models.Index(fields=["state", "created_at"], name="exportjob_state_created")
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.event_id} ({self.get_state_display()})"
+
+    @property
+    def progress(self):
+        if self.state == ExportJobStates.DONE:
+            return 100
+        if not self.total:
+            return 0
+        return min(100, int(self.processed * 100 / self.total))
+
+    def file_media_url(self, request=None):
+        url = sign_url(self.file.url, salt=settings.PRESIGN_MEDIA_SIGNATURE_SALT)
+        if request is not None:
+            return request.build_absolute_uri(url)
+        else:
+            return url
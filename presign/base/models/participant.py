@@ -1,19 +1,23 @@
 import string
 import uuid
 from collections import defaultdict
+from urllib import parse
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.core.mail import EmailMultiAlternatives
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
 from django.template.loader import render_to_string
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.crypto import get_random_string
 from django.utils.translation import gettext_lazy as _
 
-from django_scopes import ScopedManager
+from django_scopes import ScopedManager, scopes_disabled
 from simple_history.models import HistoricalRecords
 
+from ..cache import bump_version
 from ..exceptions import ActionEmailNotConfigured, ParticipantStateChangeException
 from ..fields import I18nTextField
 
@@ -100,11 +104,42 @@ class Participant(models.Model):
         ),
     )
 
+    created_at = models.DateTimeField(auto_now_add=True)
+    changed_at = models.DateTimeField(auto_now=True)
+
     objects = ScopedManager(organizer="event__organizer", event="event")
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["event", "changed_at"], name="participant_event_changed"
+            ),
+            models.Index(
+                fields=["event", "created_at", "id"], name="participant_event_created"
+            ),
+        ]
+
     def __str__(self) -> str:
         return self.email
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_state = instance.__dict__.get("state")
+        return instance
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        loaded_state = getattr(self, "_loaded_state", None)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                EventStateCounter.add(self.event_id, self.state, 1)
+            elif loaded_state is not None and loaded_state != self.state:
+                EventStateCounter.add(self.event_id, loaded_state, -1)
+                EventStateCounter.add(self.event_id, self.state, 1)
+        self._loaded_state = self.state
+
     def get_answers(self):
         from .questions import QuestionAnswer  # Placed here to break circular import
 
@@ -189,17 +224,71 @@ class Participant(models.Model):
                 )
             )
 
-        self.state = next_state
-        self.save(update_fields=["state"])
+        # Placed here to break circular import
+        from ..export.fingerprint import export_data_version_name
+
+        now = timezone.now()
+        with transaction.atomic():
+            # Compare and set: the update only matches while the participant
+            # is still in the state this instance was loaded with. Its row lock
+            # serialises concurrent changes until the transaction is committed.
+            with scopes_disabled():
+                updated = Participant.objects.filter(pk=self.pk, state=state).update(
+                    state=next_state, changed_at=now
+                )
+            if not updated:
+                self.refresh_from_db(fields=["state", "changed_at"])
+                self._loaded_state = self.state
+                raise ParticipantStateChangeException(
+                    _(
+                        "The participant was changed in the meantime and is now in "
+                        "state {state_label}."
+                    ).format(state_label=ParticipantStates(self.state).label)
+                )
+            self.state = next_state
+            self.changed_at = now
+            self._loaded_state = next_state
+            # The update does not send the signals that keep derived data up
+            # to date
+            EventStateCounter.add(self.event_id, state, -1)
+            EventStateCounter.add(self.event_id, next_state, 1)
+            Participant.history.bulk_history_create(
+                [self], update=True, default_date=now
+            )
+            bump_version(export_data_version_name(self.event_id))
+
+    @classmethod
+    @scopes_disabled()
+    def mark_changed(cls, participant_id, changed_at=None):
+        # Answers are stored separately, but their changes count as changes
+        # of the participant for delta exports and the export fingerprint
+        cls.objects.filter(pk=participant_id).update(
+            changed_at=changed_at or timezone.now()
+        )
 
     def send_change_state_email(self, request, action):
-        texts = self.event.get_action_email_texts(action)
+        from ..outbox import queue_emails  # Placed here to break circular import
+
+        queue_emails([self.get_change_state_email(request, action)])
+
+    def get_change_state_email(self, request, action, texts=None):
+        from .email import OutgoingEmail  # Placed here to break circular import
+
+        if texts is None:
+            texts = self.event.get_action_email_texts(action)
+
+        def absolute_url(path):
+            # Emails of background tasks are not sent within a request
+            if request is None:
+                return parse.urljoin(settings.PRESIGN_SITE_URL, path)
+            return request.build_absolute_uri(path)
+
         context_vars = defaultdict(
             str,
             {
                 "participant_email": self.email,
                 "event_name": self.event.name,
-                "change_answer_url": request.build_absolute_uri(
+                "change_answer_url": absolute_url(
                     reverse(
                         "signup:participant-update",
                         kwargs={
@@ -210,7 +299,7 @@ class Participant(models.Model):
                         },
                     )
                 ),
-                "application_url": request.build_absolute_uri(
+                "application_url": absolute_url(
                     reverse(
                         "signup:participant-details",
                         kwargs={
@@ -231,12 +320,52 @@ class Participant(models.Model):
                 _("No email was configured for this action.")
             )
 
-        to = self.email
-
         html_content = render_to_string(
             "mail/participant/state_change.html",
             context={"subject": subject, "body": body},
         )
-        msg = EmailMultiAlternatives(subject=subject, body=body, to=[to])
-        msg.attach_alternative(html_content, "text/html")
-        msg.send()
+        return OutgoingEmail(
+            event=self.event,
+            participant=self,
+            to=self.email,
+            subject=subject,
+            body=body,
+            html_body=html_content,
+        )
+
+
+class EventStateCounter(models.Model):
+    event = models.ForeignKey(
+        "base.Event", related_name="state_counters", on_delete=models.CASCADE
+    )
+    state = models.CharField(choices=ParticipantStates.choices, max_length=3)
+    count = models.PositiveIntegerField(default=0)
+
+    objects = ScopedManager(organizer="event__organizer")
+
+    class Meta:
+        ordering = ("state",)
+        constraints = [
+            models.UniqueConstraint(
+                "event", "state", name="unique_event_state_counter"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.get_state_display()}: {self.count}"
+
+    @classmethod
+    @scopes_disabled()
+    def add(cls, event_id, state, delta):
+        counters = cls.objects.filter(event_id=event_id, state=state)
+        # Clamped, as a counter that drifted below the real count must not
+        # break the write that changes it. rebuild_state_counters fixes drift.
+        count = Greatest(F("count") + delta, 0)
+        if counters.update(count=count) or delta < 0:
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(event_id=event_id, state=state, count=delta)
+        except IntegrityError:
+            # Created concurrently by another participant of the same state
+            counters.update(count=count)
@@ -5,17 +5,32 @@ from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.template.loader import render_to_string
+from django.utils.html import conditional_escape
+from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
 from django.utils.translation import gettext_lazy as _
 
 from django_scopes import ScopedManager
 from model_clone.models import CloneModel
 from simple_history.models import HistoricalRecords
 
+from ..cache import LRUCache, get_version
 from ..fields import I18nCharField, I18nTextField
-from ..utils import sign_url
+from ..utils import cached_sign_url
 from .organizer import Organizer
 from .participant import Participant
 
+# Rendered answers, keyed by answer, change time, language and options version
+rendered_answers = LRUCache(
+    settings.PRESIGN_ANSWER_CACHE_MAX_ENTRIES, settings.PRESIGN_ANSWER_CACHE_MAX_SIZE
+)
+
+# Bumped when any option changes, as rendered choices contain option values
+OPTIONS_VERSION_NAME = "question-options"
+
+# Signed urls expire, so they are substituted into cached answers afterwards
+FILE_URL_PLACEHOLDER = "__presign_file_url__"
+
 
 class QuestionKind(models.TextChoices):
     NUMBER = "N", _("Number")
@@ -45,7 +60,7 @@ class Questionnaire(CloneModel):
     _clone_m2o_or_o2m_fields = ("questionblock_set",)
 
     def can_user_update(self, user):
-        return self.organizer in user.get_organizers()
+        return self.organizer_id in user.get_organizer_ids()
 
     def __str__(self) -> str:
         return str(self.name)
@@ -136,6 +151,9 @@ class QuestionAnswer(models.Model):
                 "participant", "question", name="unique_participant_question"
             )
         ]
+        indexes = [
+            models.Index(fields=["changed_at"], name="questionanswer_changed_at"),
+        ]
 
     def get_value(self):
         if self.question.kind == QuestionKind.NUMBER:
@@ -147,7 +165,8 @@ class QuestionAnswer(models.Model):
         elif self.question.kind == QuestionKind.BOOL:
             return bool(self.answer)
         elif self.question.kind == QuestionKind.CHOICE:
-            return self.options.first()
+            # Not first(), which would bypass prefetched options
+            return next(iter(self.options.all()), None)
         elif self.question.kind == QuestionKind.MULTIPLE_CHOICE:
             return self.options.all()
         elif self.question.kind == QuestionKind.FILE:
@@ -199,25 +218,55 @@ class QuestionAnswer(models.Model):
         return str(self.get_value())
 
     def render_answer(self):
+        if self.question.kind not in [
+            QuestionKind.FILE,
+            QuestionKind.CHOICE,
+            QuestionKind.MULTIPLE_CHOICE,
+        ]:
+            return self.get_value()
+
+        if self.changed_at is None:
+            rendered = self._render_template()
+        else:
+            key = (self.pk, self.changed_at, get_language())
+            if self.question.kind != QuestionKind.FILE:
+                key += (get_version(OPTIONS_VERSION_NAME),)
+            rendered = rendered_answers.get(key)
+            if rendered is None:
+                rendered = self._render_template()
+                rendered_answers.set(key, rendered, len(rendered))
+
         if self.question.kind == QuestionKind.FILE:
-            return render_to_string("questions/answers/file.html", {"answer": self})
+            rendered = rendered.replace(
+                FILE_URL_PLACEHOLDER, conditional_escape(self.file_media_url())
+            )
+        return mark_safe(rendered)
+
+    def _render_template(self) -> str:
+        if self.question.kind == QuestionKind.FILE:
+            return render_to_string(
+                "questions/answers/file.html",
+                {"answer": self, "url": FILE_URL_PLACEHOLDER},
+            )
         elif self.question.kind == QuestionKind.MULTIPLE_CHOICE:
             selected = self.get_value()
             return render_to_string(
                 "questions/answers/multiple_choice.html",
                 {"answer": self, "selected": selected},
             )
-        elif self.question.kind == QuestionKind.CHOICE:
+        else:
             selected = self.get_value()
             return render_to_string(
                 "questions/answers/choice.html",
                 {"answer": self, "selected": selected},
             )
-        else:
-            return self.get_value()
 
     def file_media_url(self, request=None):
-        url = sign_url(self.file.url, salt=settings.PRESIGN_MEDIA_SIGNATURE_SALT)
+        url = cached_sign_url(
+            self.file.url,
+            salt=settings.PRESIGN_MEDIA_SIGNATURE_SALT,
+            timeout=settings.PRESIGN_MEDIA_SIGNED_URL_CACHE_SECONDS,
+        )
         if request is not None:
             return request.build_absolute_uri(url)
         else:
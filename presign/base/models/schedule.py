@@ -0,0 +1,9 @@
+from django.db import models
+
+
+class ScheduledTaskRun(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+    last_run_at = models.DateTimeField()
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.last_run_at})"
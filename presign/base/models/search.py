@@ -0,0 +1,21 @@
+from django.db import models
+
+from django_scopes import ScopedManager
+
+
+class ParticipantSearchDocument(models.Model):
+    # The full-text index on `content` is not declared here as it depends on
+    # the database: migration 0012 creates an FTS5 table with triggers on
+    # SQLite and a GIN index on PostgreSQL.
+    # The FTS5 table refers to documents by this integer key. The implicit
+    # rowid of a table with another primary key may change on VACUUM.
+    id = models.BigAutoField(primary_key=True)
+    participant = models.OneToOneField(
+        "base.Participant",
+        related_name="search_document",
+        on_delete=models.CASCADE,
+    )
+    event = models.ForeignKey("base.Event", on_delete=models.CASCADE)
+    content = models.TextField(blank=True)
+
+    objects = ScopedManager(organizer="event__organizer", event="event")
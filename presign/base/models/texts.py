@@ -1,23 +1,75 @@
+import threading
+
+from django.conf import settings
+
 from hierarkey.models import GlobalSettingsBase, Hierarkey
 from i18nfield.strings import LazyI18nString
 
+from ..cache import LRUCache, get_version
 from .participant import ParticipantStateActions, ParticipantStates
 
 email_hierarkey = Hierarkey(attribute_name="email_texts")
 status_hierarkey = Hierarkey(attribute_name="status_texts")
 
+resolved_texts = LRUCache(settings.PRESIGN_TEXT_CACHE_MAX_ENTRIES)
+
+# Bumped when an email or status text changes on any level of the hierarchy
+TEXTS_VERSION_NAME = "texts"
+
+
+_request_texts = threading.local()
+
+
+def start_texts_request(**kwargs):
+    _request_texts.active = True
+    _request_texts.version = None
+
+
+def end_texts_request(**kwargs):
+    _request_texts.active = False
+    _request_texts.version = None
+
+
+def forget_texts_version():
+    _request_texts.version = None
+
 
 class TextMixin:
+    def _get_texts_version(self) -> int:
+        # Read once per request, so pages with many texts do not ask the
+        # shared cache for every one of them. Outside of requests, as in the
+        # worker, it is read every time.
+        if not getattr(_request_texts, "active", False):
+            return get_version(TEXTS_VERSION_NAME)
+        if getattr(_request_texts, "version", None) is None:
+            _request_texts.version = get_version(TEXTS_VERSION_NAME)
+        return _request_texts.version
+
+    def _get_text(self, attribute_name: str, key: str) -> dict:
+        # Walking the hierarchy and decoding happens once per version. The
+        # cached dicts are shared, so they must not be changed.
+        cache_key = (
+            type(self).__name__,
+            self.pk,
+            attribute_name,
+            key,
+            self._get_texts_version(),
+        )
+        text = resolved_texts.get(cache_key)
+        if text is None:
+            text = getattr(self, attribute_name).get(key, as_type=dict, default="{}")
+            resolved_texts.set(cache_key, text)
+        return text
+
     def get_action_email_texts(self, action: "ParticipantStateActions"):
-        action_texts = self.email_texts.get(action, as_type=dict, default="{}")
+        action_texts = self._get_text("email_texts", action)
         return {
             "subject": LazyI18nString(action_texts.get("subject", {})),
             "body": LazyI18nString(action_texts.get("body", {})),
         }
 
     def get_status_text(self, status: "ParticipantStates"):
-        status_text = self.status_texts.get(status, as_type=dict, default="{}")
-        return LazyI18nString(status_text)
+        return LazyI18nString(self._get_text("status_texts", status))
 
 
 @email_hierarkey.set_global()
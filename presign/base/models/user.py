@@ -1,43 +1,75 @@
 import uuid
+from typing import FrozenSet
 
 from django.contrib.auth.models import AbstractUser
+from django.core.cache import cache
 from django.db import models
 from django.db.models import Q
 
 from django_scopes import scope
 from simple_history.models import HistoricalRecords
 
+from ..cache import get_version
+
+ORGANIZER_IDS_KEY = "presign:user-organizers:{}:{}"
+
+
+def user_organizers_version_name(user_id) -> str:
+    return f"user-organizers:{user_id}"
+
 
 class User(AbstractUser):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     history = HistoricalRecords()
 
+    def get_organizer_ids(self) -> FrozenSet[uuid.UUID]:
+        """
+        Ids of the organizers the user is a member of. Kept on the instance for
+        the request and in the cache until the memberships of the user change.
+        """
+        if getattr(self, "_organizer_ids", None) is None:
+            from .organizer import Organizer  # Placed here to break circular imports
+
+            key = ORGANIZER_IDS_KEY.format(
+                self.pk, get_version(user_organizers_version_name(self.pk))
+            )
+            organizer_ids = cache.get(key)
+            if organizer_ids is None:
+                organizer_ids = frozenset(
+                    Organizer.members.through.objects.filter(
+                        user_id=self.pk
+                    ).values_list("organizer_id", flat=True)
+                )
+                cache.set(key, organizer_ids, None)
+            self._organizer_ids = organizer_ids
+        return self._organizer_ids
+
     def has_organizer_permission(self, organizer):
-        return organizer.members.contains(self)
+        return organizer.pk in self.get_organizer_ids()
 
     def has_event_permission(self, event):
-        return self.has_organizer_permission(event.organizer)
+        return event.organizer_id in self.get_organizer_ids()
 
     def get_organizers(self):
         from .organizer import Organizer  # Placed here to break circular imports
 
         with scope(user=self):
-            return Organizer.objects.filter(members=self)
+            return Organizer.objects.filter(pk__in=self.get_organizer_ids())
 
     def get_events(self):
         from .event import Event  # Placed here to break circular imports
 
         with scope(organizer=None):
-            return Event.objects.filter(organizer__members=self)
+            return Event.objects.filter(organizer_id__in=self.get_organizer_ids())
 
     def get_visible_questionnaires(self):
         from .questions import Questionnaire  # Placed here to break circular imports
 
         return Questionnaire.objects.filter(
-            Q(organizer__in=self.get_organizers()) | Q(is_public=True)
+            Q(organizer_id__in=self.get_organizer_ids()) | Q(is_public=True)
         )
 
     def get_editable_questionnaires(self):
         from .questions import Questionnaire  # Placed here to break circular imports
 
-        return Questionnaire.objects.filter(organizer__in=self.get_organizers())
+        return Questionnaire.objects.filter(organizer_id__in=self.get_organizer_ids())
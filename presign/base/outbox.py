@@ -0,0 +1,132 @@
+import datetime
+import logging
+import uuid
+from typing import Iterable, List, Optional
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db.models import F
+from django.utils import timezone
+
+from django_scopes import scopes_disabled
+
+from .models import Event, OutgoingEmail, OutgoingEmailStates, Participant
+
+logger = logging.getLogger(__name__)
+
+# Time a sender may take for an email before it is given to another sender
+SEND_TIMEOUT = datetime.timedelta(minutes=10)
+
+EMAIL_BATCH_SIZE = 100
+
+
+def queue_emails(emails: List[OutgoingEmail]) -> List[OutgoingEmail]:
+    # Written in the transaction of the change that causes the emails, so
+    # they are sent by the email worker if and only if the change is committed.
+    return OutgoingEmail.objects.bulk_create(emails)
+
+
+def queue_email(
+    event: Event,
+    to: str,
+    subject: str,
+    body: str,
+    html_body: str = "",
+    participant: Optional[Participant] = None,
+) -> OutgoingEmail:
+    email = OutgoingEmail(
+        event=event,
+        participant=participant,
+        to=to,
+        subject=subject,
+        body=body,
+        html_body=html_body,
+    )
+    return queue_emails([email])[0]
+
+
+def claim_pending_emails(
+    limit: int = EMAIL_BATCH_SIZE, email_ids: Optional[Iterable] = None
+) -> List[OutgoingEmail]:
+    now = timezone.now()
+    token = uuid.uuid4()
+    with scopes_disabled():
+        due = OutgoingEmail.objects.filter(
+            state=OutgoingEmailStates.PENDING, next_attempt_at__lte=now
+        )
+        if email_ids is not None:
+            due = due.filter(pk__in=list(email_ids))
+        batch = list(
+            due.order_by("next_attempt_at").values_list("pk", flat=True)[:limit]
+        )
+        # One conditional update claims the whole batch. Emails another sender
+        # claimed meanwhile do not match the condition anymore, the token
+        # tells which ones this sender got.
+        due.filter(pk__in=batch).update(
+            claim_token=token,
+            next_attempt_at=now + SEND_TIMEOUT,
+            attempts=F("attempts") + 1,
+        )
+        return list(OutgoingEmail.objects.filter(claim_token=token))
+
+
+def retry_delay(attempts: int) -> datetime.timedelta:
+    return datetime.timedelta(
+        seconds=settings.PRESIGN_EMAIL_RETRY_DELAY_SECONDS * 2 ** (attempts - 1)
+    )
+
+
+def mark_failed(email: OutgoingEmail, error: Exception):
+    email.error = str(error)
+    if email.attempts >= settings.PRESIGN_EMAIL_MAX_ATTEMPTS:
+        email.state = OutgoingEmailStates.FAILED
+    else:
+        email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+    with scopes_disabled():
+        email.save(update_fields=["state", "next_attempt_at", "error"])
+
+
+def send_emails(emails: List[OutgoingEmail]):
+    if not emails:
+        return
+    # All emails of a batch share one connection to the mail server
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        logger.exception("Could not connect to the mail server")
+        for email in emails:
+            mark_failed(email, e)
+        return
+
+    try:
+        for email in emails:
+            message = EmailMultiAlternatives(
+                subject=email.subject,
+                body=email.body,
+                to=[email.to],
+                connection=connection,
+            )
+            if email.html_body:
+                message.attach_alternative(email.html_body, "text/html")
+            try:
+                message.send()
+            except Exception as e:
+                logger.exception("Sending email %s failed", email.pk)
+                mark_failed(email, e)
+            else:
+                email.state = OutgoingEmailStates.SENT
+                email.sent_at = timezone.now()
+                email.error = ""
+                with scopes_disabled():
+                    email.save(update_fields=["state", "sent_at", "error"])
+    finally:
+        connection.close()
+
+
+def send_pending_emails(
+    limit: int = EMAIL_BATCH_SIZE, email_ids: Optional[Iterable] = None
+) -> int:
+    emails = claim_pending_emails(limit=limit, email_ids=email_ids)
+    send_emails(emails)
+    return len(emails)
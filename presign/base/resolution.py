@@ -0,0 +1,60 @@
+import pickle
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from django_scopes import scopes_disabled
+
+from .cache import LRUCache, get_version
+from .models import Event, Organizer
+
+ORGANIZER_KEY = "presign:organizer-slug:{}:{}"
+EVENT_KEY = "presign:event-slug:{}:{}:{}"
+
+# Bumped when any event or organizer is saved or deleted
+SLUGS_VERSION_NAME = "slugs"
+
+resolved_slugs = LRUCache(settings.PRESIGN_SLUG_CACHE_MAX_ENTRIES)
+
+# Stored for unknown slugs. Slugs come from request urls, so these expire
+# soon and are not kept in memory, or random urls would fill the caches.
+MISSING = b""
+MISSING_TIMEOUT = 60
+
+
+def _resolve(key: str, load: Callable):
+    # Instances are stored pickled, so every request gets its own copy and
+    # changes made by one request are never seen by another.
+    data = resolved_slugs.get(key)
+    if data is None:
+        data = cache.get(key)
+        if data is None:
+            with scopes_disabled():
+                instance = load()
+            if instance is None:
+                cache.set(key, MISSING, MISSING_TIMEOUT)
+                return None
+            data = pickle.dumps(instance)
+            cache.set(key, data, None)
+        elif data == MISSING:
+            return None
+        resolved_slugs.set(key, data)
+    return pickle.loads(data)
+
+
+def get_organizer(slug: str) -> Optional[Organizer]:
+    """Organizer with the slug, or None. Misses are cached briefly."""
+    key = ORGANIZER_KEY.format(get_version(SLUGS_VERSION_NAME), slug)
+    return _resolve(key, lambda: Organizer.objects.filter(slug=slug).first())
+
+
+def get_event(organizer_slug: str, slug: str) -> Optional[Event]:
+    """Event with the slug of the organizer with the slug, or None"""
+    key = EVENT_KEY.format(get_version(SLUGS_VERSION_NAME), organizer_slug, slug)
+    return _resolve(
+        key,
+        lambda: Event.objects.filter(slug=slug, organizer__slug=organizer_slug)
+        .select_related("organizer")
+        .first(),
+    )
@@ -0,0 +1,118 @@
+import re
+import threading
+from collections import defaultdict
+from typing import Iterable, List
+
+from django.db import connection, transaction
+from django.db.models import QuerySet
+from django.db.models.expressions import RawSQL
+
+from django_scopes import scopes_disabled
+
+from .models import (
+    Participant,
+    ParticipantSearchDocument,
+    QuestionAnswer,
+    QuestionKind,
+)
+
+SEARCHABLE_KINDS = [
+    QuestionKind.STRING,
+    QuestionKind.TEXT,
+    QuestionKind.EMAIL,
+    QuestionKind.PHONE,
+]
+
+SEARCH_CHUNK_SIZE = 500
+
+_pending = threading.local()
+
+
+def build_search_documents(
+    participant_ids: Iterable,
+) -> List[ParticipantSearchDocument]:
+    participant_ids = list(participant_ids)
+    contents = defaultdict(list)
+    for participant_id, answer in (
+        QuestionAnswer.objects.filter(
+            participant_id__in=participant_ids, question__kind__in=SEARCHABLE_KINDS
+        )
+        .exclude(answer=None)
+        .values_list("participant_id", "answer")
+    ):
+        contents[participant_id].append(answer)
+    return [
+        ParticipantSearchDocument(
+            participant_id=pk,
+            event_id=event_id,
+            content="\n".join([email] + contents[pk]),
+        )
+        for pk, event_id, email in Participant.objects.filter(
+            pk__in=participant_ids
+        ).values_list("pk", "event_id", "email")
+    ]
+
+
+@scopes_disabled()
+def update_search_documents(participant_ids: Iterable):
+    participant_ids = list(participant_ids)
+    for start in range(0, len(participant_ids), SEARCH_CHUNK_SIZE):
+        chunk = participant_ids[start : start + SEARCH_CHUNK_SIZE]
+        documents = build_search_documents(chunk)
+        with transaction.atomic():
+            ParticipantSearchDocument.objects.filter(participant_id__in=chunk).delete()
+            ParticipantSearchDocument.objects.bulk_create(documents)
+
+
+def flush_search_updates():
+    participant_ids = getattr(_pending, "participant_ids", set())
+    _pending.participant_ids = set()
+    if participant_ids:
+        update_search_documents(participant_ids)
+
+
+def schedule_search_update(participant_id):
+    # Saving a form writes many answers of the same participant, so the
+    # documents are rebuilt once after the commit. Ids of rolled back
+    # transactions stay pending and are rebuilt with the next commit.
+    if not hasattr(_pending, "participant_ids"):
+        _pending.participant_ids = set()
+    _pending.participant_ids.add(participant_id)
+    transaction.on_commit(flush_search_updates)
+
+
+def search_terms(query: str):
+    return re.findall(r"\w+", query)
+
+
+def search_participants(queryset: QuerySet, query: str) -> QuerySet:
+    terms = search_terms(query)
+    if not terms:
+        return queryset
+
+    if connection.vendor == "sqlite":
+        match = " ".join(f'"{term}"*' for term in terms)
+        return queryset.filter(
+            pk__in=RawSQL(
+                "SELECT base_participantsearchdocument.participant_id "
+                "FROM base_participantsearch_fts "
+                "JOIN base_participantsearchdocument "
+                "ON base_participantsearchdocument.id = base_participantsearch_fts.rowid "
+                "WHERE base_participantsearch_fts MATCH %s",
+                [match],
+            )
+        )
+    elif connection.vendor == "postgresql":
+        # Spelled out to match the expression of the GIN index
+        return queryset.filter(
+            pk__in=RawSQL(
+                "SELECT participant_id FROM base_participantsearchdocument "
+                "WHERE to_tsvector('simple'::regconfig, COALESCE(content, '')) "
+                "@@ to_tsquery('simple'::regconfig, %s)",
+                [" & ".join(f"{term}:*" for term in terms)],
+            )
+        )
+    else:
+        for term in terms:
+            queryset = queryset.filter(search_document__content__icontains=term)
+        return queryset
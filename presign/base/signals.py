@@ -0,0 +1,177 @@
+from django.apps import apps
+from django.core.signals import request_finished, request_started
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from django_scopes import scopes_disabled
+from hierarkey.models import BaseHierarkeyStoreModel
+
+from .cache import bump_version
+from .catalog import catalog_version_name, questionnaire_version_name
+from .export.fingerprint import export_data_version_name
+from .models import (
+    Event,
+    EventQuestionnaire,
+    EventStateCounter,
+    Organizer,
+    Participant,
+    Question,
+    QuestionAnswer,
+    QuestionBlock,
+    Questionnaire,
+    QuestionOption,
+)
+from .models.questions import OPTIONS_VERSION_NAME
+from .models.texts import (
+    TEXTS_VERSION_NAME,
+    end_texts_request,
+    forget_texts_version,
+    start_texts_request,
+)
+from .models.user import user_organizers_version_name
+from .resolution import SLUGS_VERSION_NAME
+from .search import schedule_search_update
+
+
+@receiver(post_save, sender=Participant)
+@receiver(post_delete, sender=Participant)
+def participant_changed(sender, instance, **kwargs):
+    bump_version(export_data_version_name(instance.event_id))
+
+
+@receiver(post_save, sender=Participant)
+def participant_saved(sender, instance, **kwargs):
+    schedule_search_update(instance.pk)
+
+
+@receiver(post_delete, sender=Participant)
+def participant_deleted(sender, instance, **kwargs):
+    EventStateCounter.add(instance.event_id, instance.state, -1)
+
+
+@receiver(post_save, sender=QuestionAnswer)
+@receiver(post_delete, sender=QuestionAnswer)
+def answer_changed(sender, instance, **kwargs):
+    try:
+        participant = instance.participant
+    except Participant.DoesNotExist:
+        return
+    Participant.mark_changed(instance.participant_id)
+    bump_version(export_data_version_name(participant.event_id))
+    schedule_search_update(instance.participant_id)
+
+
+@receiver(m2m_changed, sender=QuestionAnswer.options.through)
+def answer_options_changed(sender, instance, action, reverse, **kwargs):
+    if action.startswith("post_") and not reverse:
+        # Options are not saved with the answer, but the change time keys
+        # both the rendered answers and the export fingerprint
+        instance.changed_at = timezone.now()
+        with scopes_disabled():
+            QuestionAnswer.objects.filter(pk=instance.pk).update(
+                changed_at=instance.changed_at
+            )
+        answer_changed(sender, instance)
+
+
+def bump_questionnaire_snapshot(questionnaire_id):
+    if questionnaire_id is not None:
+        bump_version(questionnaire_version_name(questionnaire_id))
+
+
+@receiver(post_save, sender=EventQuestionnaire)
+@receiver(post_delete, sender=EventQuestionnaire)
+def event_questionnaire_changed(sender, instance, **kwargs):
+    bump_version(catalog_version_name(instance.event_id))
+
+
+@receiver(post_save, sender=Questionnaire)
+@receiver(post_delete, sender=Questionnaire)
+def questionnaire_changed(sender, instance, **kwargs):
+    bump_questionnaire_snapshot(instance.pk)
+
+
+@receiver(post_save, sender=QuestionBlock)
+@receiver(post_delete, sender=QuestionBlock)
+def question_block_changed(sender, instance, **kwargs):
+    bump_questionnaire_snapshot(instance.questionnaire_id)
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def question_changed(sender, instance, **kwargs):
+    bump_questionnaire_snapshot(
+        QuestionBlock.objects.filter(pk=instance.block_id)
+        .values_list("questionnaire_id", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=QuestionOption)
+@receiver(post_delete, sender=QuestionOption)
+def question_option_changed(sender, instance, **kwargs):
+    bump_version(OPTIONS_VERSION_NAME)
+    bump_questionnaire_snapshot(
+        Question.objects.filter(pk=instance.question_id)
+        .values_list("block__questionnaire_id", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+@receiver(post_save, sender=Organizer)
+@receiver(post_delete, sender=Organizer)
+def slug_changed(sender, instance, **kwargs):
+    bump_version(SLUGS_VERSION_NAME)
+
+
+def bump_user_organizers(user_ids):
+    for user_id in user_ids:
+        bump_version(user_organizers_version_name(user_id))
+
+
+def remember_members(organizer):
+    # The members are not known anymore once they are removed
+    organizer._former_member_ids = list(organizer.members.values_list("pk", flat=True))
+
+
+@receiver(m2m_changed, sender=Organizer.members.through)
+def organizer_members_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        # Changed through user.organizer_set
+        if action.startswith("post_"):
+            bump_user_organizers([instance.pk])
+    elif action == "pre_clear":
+        remember_members(instance)
+    elif action == "post_clear":
+        bump_user_organizers(instance._former_member_ids)
+    elif action in ("post_add", "post_remove"):
+        bump_user_organizers(pk_set)
+
+
+@receiver(pre_delete, sender=Organizer)
+def organizer_deleting(sender, instance, **kwargs):
+    remember_members(instance)
+
+
+@receiver(post_delete, sender=Organizer)
+def organizer_deleted(sender, instance, **kwargs):
+    bump_user_organizers(instance._former_member_ids)
+
+
+def text_changed(sender, instance, **kwargs):
+    bump_version(TEXTS_VERSION_NAME)
+    forget_texts_version()
+
+
+request_started.connect(start_texts_request)
+request_finished.connect(end_texts_request)
+
+
+# The hierarkey store models of every level, including the global settings
+for model in apps.get_app_config("base").get_models():
+    if issubclass(model, BaseHierarkeyStoreModel):
+        post_save.connect(text_changed, sender=model)
+        post_delete.connect(text_changed, sender=model)
@@ -0,0 +1,117 @@
+from collections import defaultdict
+from typing import Any, Iterable, List, NamedTuple, Optional
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from .cache import bump_version
+from .exceptions import ActionEmailNotConfigured, ParticipantStateChangeException
+from .export.fingerprint import export_data_version_name
+from .models import Event, EventStateCounter, Participant, ParticipantStates
+from .outbox import queue_emails
+
+
+class SkippedParticipant(NamedTuple):
+    # None if the id is not a participant of the event
+    participant: Optional[Participant]
+    reason: str
+    participant_id: Any
+
+
+class BulkStateChange(NamedTuple):
+    changed: List[Participant]
+    skipped: List[SkippedParticipant]
+    emails_queued: bool
+
+
+@transaction.atomic
+def bulk_change_state(
+    event: Event, participant_ids: Iterable, action: str, request=None
+) -> BulkStateChange:
+    """
+    Performs `action` on all given participants of the event that allow it.
+
+    Participants are grouped by their current state and every group is changed
+    with one conditional UPDATE. History rows and emails are written in bulk.
+    Ids that are not participants of the event are skipped.
+    """
+    participant_ids = list(
+        dict.fromkeys(Participant._meta.pk.to_python(pk) for pk in participant_ids)
+    )
+    participants = list(
+        Participant.objects.select_for_update()
+        .filter(event=event, pk__in=participant_ids)
+        .order_by("created_at", "pk")
+    )
+
+    groups = defaultdict(list)
+    found = {participant.pk for participant in participants}
+    skipped = [
+        SkippedParticipant(None, _("Not a participant of this event"), pk)
+        for pk in participant_ids
+        if pk not in found
+    ]
+    for participant in participants:
+        participant.event = event
+        state = ParticipantStates(participant.state)
+        if action in Participant.STATE_CHANGES.get(state, {}):
+            groups[state].append(participant)
+        else:
+            skipped.append(
+                SkippedParticipant(
+                    participant,
+                    _("Cannot perform {action} in state {state_label}").format(
+                        action=action, state_label=state.label
+                    ),
+                    participant.pk,
+                )
+            )
+
+    now = timezone.now()
+    changed = []
+    for state, group in groups.items():
+        next_state = Participant.STATE_CHANGES[state][action]
+        # The rows are locked, the state condition guards databases without
+        # row locks
+        updated = Participant.objects.filter(
+            pk__in=[participant.pk for participant in group], state=state
+        ).update(state=next_state, changed_at=now)
+        if updated != len(group):
+            raise ParticipantStateChangeException(
+                _("Participants were changed at the same time, please try again.")
+            )
+        EventStateCounter.add(event.pk, state, -updated)
+        EventStateCounter.add(event.pk, next_state, updated)
+        for participant in group:
+            participant.state = next_state
+            participant.changed_at = now
+            participant._loaded_state = next_state
+        changed += group
+
+    if not changed:
+        return BulkStateChange(changed=[], skipped=skipped, emails_queued=False)
+
+    Participant.history.bulk_history_create(
+        changed,
+        update=True,
+        default_user=(
+            request.user
+            if request is not None and request.user.is_authenticated
+            else None
+        ),
+        default_date=now,
+    )
+    # Bulk updates do not send the signals that keep derived data up to date
+    bump_version(export_data_version_name(event.pk))
+
+    texts = event.get_action_email_texts(action)
+    try:
+        emails = [
+            participant.get_change_state_email(request, action, texts=texts)
+            for participant in changed
+        ]
+    except ActionEmailNotConfigured:
+        return BulkStateChange(changed=changed, skipped=skipped, emails_queued=False)
+    queue_emails(emails)
+    return BulkStateChange(changed=changed, skipped=skipped, emails_queued=True)
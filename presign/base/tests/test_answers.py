@@ -0,0 +1,176 @@
+from unittest import mock
+
+import pytest
+from django_scopes import scopes_disabled
+
+from ..answers import load_answer_tree, save_answers
+from ..catalog import get_question_catalog
+from ..models import ParticipantStates, QuestionAnswer, QuestionKind
+from ..utils import verify_url
+
+
+@pytest.mark.django_db
+def test_answer_tree_is_loaded_with_fixed_queries(
+    event_questionnaire_factory,
+    question_block_factory,
+    question_factory,
+    question_option_factory,
+    question_answer_factory,
+    participant_factory,
+    django_assert_num_queries,
+):
+    with scopes_disabled():
+        event_questionnaire = event_questionnaire_factory.create()
+        event = event_questionnaire.event
+        participant = participant_factory.create(event=event)
+        for _i in range(3):
+            block = question_block_factory.create(
+                questionnaire=event_questionnaire.questionnaire
+            )
+            for kind in [QuestionKind.CHOICE, QuestionKind.MULTIPLE_CHOICE]:
+                question = question_factory.create(block=block, kind=kind)
+                options = question_option_factory.create_batch(2, question=question)
+                answer = question_answer_factory.create(
+                    participant=participant, question=question, answer=None
+                )
+                answer.options.set(options[:1])
+            question_answer_factory.create(
+                participant=participant,
+                question=question_factory.create(block=block),
+                answer="Hello",
+            )
+            # Unanswered
+            question_factory.create(block=block)
+        participant.state = ParticipantStates.CONFIRMED
+        participant.save()
+
+        get_question_catalog(event)
+        with django_assert_num_queries(2):
+            tree = load_answer_tree(event, participant)
+            rendered = [
+                answer.render_answer()
+                for block in tree
+                for _question, answer in block.questions
+                if answer is not None
+            ]
+
+    assert len(tree) == 3
+    assert [len(block.questions) for block in tree] == [4, 4, 4]
+    assert [answer is None for _question, answer in tree[0].questions] == [
+        False,
+        False,
+        False,
+        True,
+    ]
+    assert len(rendered) == 9
+    assert "Hello" in rendered
+
+
+@pytest.mark.django_db
+def test_rendered_answers_are_cached_until_changed(
+    question_option_factory, question_answer_factory, django_assert_num_queries
+):
+    with scopes_disabled():
+        red, blue = question_option_factory.create_batch(
+            2, question__kind=QuestionKind.MULTIPLE_CHOICE
+        )
+        answer = question_answer_factory.create(question=red.question, answer=None)
+        answer.options.set([red])
+        answer = (
+            QuestionAnswer.objects.select_related("question")
+            .prefetch_related("options")
+            .get(pk=answer.pk)
+        )
+
+    assert str(red.value) in answer.render_answer()
+    with django_assert_num_queries(0):
+        # The prefetched options are not even needed any more
+        del answer._prefetched_objects_cache
+        assert str(red.value) in answer.render_answer()
+
+    with scopes_disabled():
+        answer.options.set([blue])
+        rendered = answer.render_answer()
+    assert str(red.value) not in rendered
+    assert str(blue.value) in rendered
+
+    blue.value = "Renamed"
+    blue.save()
+    with scopes_disabled():
+        assert "Renamed" in answer.render_answer()
+
+
+@pytest.mark.django_db
+def test_rendered_file_answers_are_signed_on_render(
+    participant_factory, file_question_factory, file_question_answer_factory, settings
+):
+    with scopes_disabled():
+        answer = file_question_answer_factory.create(
+            question=file_question_factory.create(),
+            participant=participant_factory.create(),
+        )
+    url = answer.file_media_url()
+    assert verify_url(
+        url,
+        salt=settings.PRESIGN_MEDIA_SIGNATURE_SALT,
+        max_age=settings.PRESIGN_MEDIA_SIGNATURE_MAX_AGE_SECONDS,
+    )
+    assert f'href="{url}"' in answer.render_answer()
+
+    # The cached fragment is reused with a fresh url
+    with mock.patch(
+        "presign.base.models.questions.cached_sign_url", return_value="/resigned"
+    ):
+        assert 'href="/resigned"' in answer.render_answer()
+
+
+@pytest.mark.django_db
+def test_answers_are_saved_in_bulk(
+    participant_factory,
+    question_factory,
+    question_option_factory,
+    django_assert_max_num_queries,
+    django_capture_on_commit_callbacks,
+):
+    with scopes_disabled():
+        participant = participant_factory.create()
+        texts = question_factory.create_batch(20, kind=QuestionKind.STRING)
+        choices = question_factory.create_batch(10, kind=QuestionKind.CHOICE)
+        multiple = question_factory.create(kind=QuestionKind.MULTIPLE_CHOICE)
+        for question in choices + [multiple]:
+            question_option_factory.create_batch(3, question=question)
+        multiple_options = list(multiple.options.all())
+
+        def values(text, choice_index, selected):
+            return (
+                [(question, f"{text} {i}") for i, question in enumerate(texts)]
+                + [
+                    (question, question.options.all()[choice_index])
+                    for question in choices
+                ]
+                + [(multiple, selected)]
+            )
+
+        first = values("Hello", 0, multiple_options[:2])
+        with django_capture_on_commit_callbacks(execute=True):
+            with django_assert_max_num_queries(8):
+                save_answers(participant, first)
+        answers = QuestionAnswer.objects.filter(participant=participant)
+        assert answers.count() == 31
+        assert QuestionAnswer.history.filter(participant=participant).count() == 31
+        assert participant.search_document.content.count("Hello") == 20
+
+        changed_at = dict(answers.values_list("question_id", "changed_at"))
+        second = values("Hello", 1, multiple_options[1:])
+        second[0] = (texts[0], "Changed")
+        with django_assert_max_num_queries(10):
+            save_answers(participant, second)
+
+        answers = {answer.question_id: answer for answer in answers.all()}
+        assert answers[texts[0].pk].answer == "Changed"
+        assert answers[texts[1].pk].changed_at == changed_at[texts[1].pk]
+        assert answers[choices[0].pk].get_value() == choices[0].options.all()[1]
+        assert set(answers[multiple.pk].get_value()) == set(multiple_options[1:])
+        assert answers[multiple.pk].changed_at > changed_at[multiple.pk]
+        # One creation for each answer plus one change for each changed answer
+        assert QuestionAnswer.history.filter(participant=participant).count() == 43
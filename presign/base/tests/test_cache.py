@@ -0,0 +1,29 @@
+from ..cache import LRUCache, bump_version, get_version
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_lru_cache_is_bounded_by_size():
+    cache = LRUCache(max_entries=10, max_size=10)
+    assert not cache.set("too-large", "x" * 11, size=11)
+    cache.set("a", "a" * 6, size=6)
+    cache.set("b", "b" * 6, size=6)
+    assert cache.get("a") is None
+    assert cache.size == 6
+    assert len(cache) == 1
+
+
+def test_bump_version():
+    version = get_version("test")
+    assert get_version("test") == version
+    bump_version("test")
+    assert get_version("test") != version
@@ -0,0 +1,115 @@
+import pytest
+from django_scopes import scopes_disabled
+
+from ..catalog import get_question_catalog, get_questionnaire_snapshots
+from ..models import QuestionKind, QuestionnaireRole
+
+
+@pytest.fixture
+def catalog_event(
+    event_questionnaire_factory,
+    question_block_factory,
+    question_factory,
+    question_option_factory,
+):
+    with scopes_disabled():
+        event_questionnaire = event_questionnaire_factory.create(
+            role=QuestionnaireRole.AFTER_APPROVAL
+        )
+        event = event_questionnaire.event
+        event_questionnaire_factory.create(event=event)
+        for event_questionnaire in event.eventquestionnaire_set.all():
+            for _i in range(3):
+                block = question_block_factory.create(
+                    questionnaire=event_questionnaire.questionnaire
+                )
+                for _j in range(3):
+                    question = question_factory.create(
+                        block=block, kind=QuestionKind.CHOICE
+                    )
+                    question_option_factory.create_batch(2, question=question)
+    return event
+
+
+@pytest.mark.django_db
+def test_catalog_is_built_with_fixed_queries(catalog_event, django_assert_num_queries):
+    with scopes_disabled():
+        with django_assert_num_queries(4):
+            catalog = get_question_catalog(catalog_event)
+        with django_assert_num_queries(0):
+            assert get_question_catalog(catalog_event).blocks == catalog.blocks
+
+    assert len(catalog.blocks) == 6
+    assert len(catalog.questions) == 18
+    assert [block.role for block in catalog.blocks] == [
+        QuestionnaireRole.DURING_SIGNUP
+    ] * 3 + [QuestionnaireRole.AFTER_APPROVAL] * 3
+    assert all(len(question.options) == 2 for question in catalog.questions.values())
+
+
+@pytest.mark.django_db
+def test_catalog_is_invalidated_on_save(catalog_event):
+    with scopes_disabled():
+        catalog = get_question_catalog(catalog_event)
+        option = catalog_event.questionnaires.first().questionblock_set.first()
+        option = option.question_set.first().options.first()
+        option.value = "Changed"
+        option.save()
+
+        changed = get_question_catalog(catalog_event)
+    assert changed.blocks != catalog.blocks
+    assert "Changed" in [
+        str(option)
+        for question in changed.questions.values()
+        for option in question.options
+    ]
+
+
+@pytest.mark.django_db
+def test_only_changed_questionnaire_is_rebuilt(
+    catalog_event, django_assert_num_queries
+):
+    with scopes_disabled():
+        catalog = get_question_catalog(catalog_event)
+        after_approval = catalog_event.eventquestionnaire_set.get(
+            role=QuestionnaireRole.AFTER_APPROVAL
+        ).questionnaire
+        block = after_approval.questionblock_set.first()
+        block.name = "Renamed"
+        block.save()
+
+        # Blocks, questions and options of the changed questionnaire only
+        with django_assert_num_queries(3):
+            changed = get_question_catalog(catalog_event)
+
+        snapshots = get_questionnaire_snapshots([after_approval.pk])
+    assert "Renamed" in [str(block.name) for block in changed.blocks]
+    assert changed.blocks[:3] == catalog.blocks[:3]
+    assert [block.role for block in changed.blocks] == [
+        block.role for block in catalog.blocks
+    ]
+    assert all(block.role is None for block in snapshots[after_approval.pk])
+
+
+@pytest.mark.django_db
+def test_block_forms_use_catalog_options(catalog_event, django_assert_num_queries):
+    from presign.signup.forms import QuestionBlockForm
+
+    with scopes_disabled():
+        block = get_question_catalog(catalog_event).blocks[0]
+    question = block.questions[0]
+    option = question.options[1]
+    field_name = f"question_{question.id}"
+
+    with django_assert_num_queries(0):
+        form = QuestionBlockForm(question_block=block, initial={field_name: option})
+        assert f'value="{option.id}" selected' in str(form[field_name])
+
+        # Options of other questions are not valid choices
+        data = {f"question_{other.id}": str(option.id) for other in block.questions}
+        form = QuestionBlockForm(question_block=block, data=data)
+        assert not form.is_valid()
+        assert list(form.errors) == [
+            f"question_{other.id}" for other in block.questions[1:]
+        ]
+        assert form.cleaned_data[field_name] == option
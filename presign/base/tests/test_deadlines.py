@@ -0,0 +1,164 @@
+import datetime
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.utils import timezone
+
+import pytest
+from django_scopes import scopes_disabled
+
+from .. import deadlines
+from ..deadlines import process_deadlines
+from ..exceptions import ParticipantStateChangeException
+from ..models import (
+    OutgoingEmail,
+    Participant,
+    ParticipantStates,
+    ScheduledTaskRun,
+)
+
+
+@pytest.mark.django_db
+@scopes_disabled()
+def test_deadline_rules_are_applied_once(participant_factory, event_factory, settings):
+    settings.PRESIGN_DEADLINE_RULES = [
+        {
+            "name": "cancel_after_lock_date",
+            "deadline": "lock_date",
+            "states": ["APP", "Q2C"],
+            "action": "cancel",
+        },
+        {
+            "name": "remind_before_lock_date",
+            "deadline": "lock_date",
+            "offset_hours": -48,
+            "states": ["APP"],
+            "email": "deadline_reminder",
+        },
+    ]
+    now = timezone.now()
+    hour = datetime.timedelta(hours=1)
+    locked = event_factory.create(lock_date=now - hour, event_date=now + 100 * hour)
+    # Falls back to the event date
+    over = event_factory.create(lock_date=None, event_date=now - hour)
+    reminded = event_factory.create(
+        lock_date=now + 47 * hour, event_date=now + 100 * hour
+    )
+    future = event_factory.create(
+        lock_date=now + 50 * hour, event_date=now + 100 * hour
+    )
+    for event in [locked, over, reminded, future]:
+        event.email_texts.set(
+            "deadline_reminder",
+            {"subject": {"en": "Reminder"}, "body": {"en": "{change_answer_url}"}},
+        )
+        event.save()
+        for state in [
+            ParticipantStates.NEW,
+            ParticipantStates.APPROVED,
+            ParticipantStates.Q2_CHANGES_REQUESTED,
+            ParticipantStates.CONFIRMED,
+        ]:
+            participant_factory.create(event=event, state=state)
+
+    call_command("process_deadlines", stdout=StringIO())
+
+    def states(event):
+        return sorted(
+            Participant.objects.filter(event=event).values_list("state", flat=True)
+        )
+
+    cancelled = sorted(
+        [
+            ParticipantStates.NEW,
+            ParticipantStates.CANCELLED,
+            ParticipantStates.CANCELLED,
+            ParticipantStates.CONFIRMED,
+        ]
+    )
+    unchanged = sorted(
+        [
+            ParticipantStates.NEW,
+            ParticipantStates.APPROVED,
+            ParticipantStates.Q2_CHANGES_REQUESTED,
+            ParticipantStates.CONFIRMED,
+        ]
+    )
+    assert states(locked) == cancelled
+    assert states(over) == cancelled
+    assert states(reminded) == unchanged
+    assert states(future) == unchanged
+
+    reminder = OutgoingEmail.objects.get(subject="Reminder")
+    assert reminder.event == reminded
+    assert reminder.body.startswith(settings.PRESIGN_SITE_URL)
+
+    # The next run only looks at deadlines since this run
+    assert process_deadlines(now=timezone.now()) == []
+    assert OutgoingEmail.objects.filter(subject="Reminder").count() == 1
+
+    results = process_deadlines(now=now + 3 * hour)
+    assert {(rule.name, event, count) for rule, event, count in results} == {
+        ("remind_before_lock_date", future, 1)
+    }
+
+
+@pytest.mark.django_db
+@scopes_disabled()
+def test_failing_deadline_rule_does_not_stop_the_others(
+    participant_factory, event_factory, settings
+):
+    settings.PRESIGN_DEADLINE_RULES = [
+        {"name": "invalid", "deadline": "unknown", "states": [], "action": "cancel"},
+        {
+            "name": "failing",
+            "deadline": "lock_date",
+            "states": ["APP"],
+            "action": "withdraw",
+        },
+        {
+            "name": "unconfigured",
+            "deadline": "lock_date",
+            "states": ["APP"],
+            "email": "deadline_reminder",
+        },
+        {
+            "name": "cancel",
+            "deadline": "lock_date",
+            "states": ["APP"],
+            "action": "cancel",
+        },
+    ]
+    now = timezone.now()
+    hour = datetime.timedelta(hours=1)
+    event = event_factory.create(lock_date=now - hour, event_date=now + 100 * hour)
+    participant = participant_factory.create(
+        event=event, state=ParticipantStates.APPROVED
+    )
+
+    original = deadlines.bulk_change_state
+
+    def bulk_change_state(event, participant_ids, action, request=None):
+        if action == "withdraw":
+            raise ParticipantStateChangeException("Changed at the same time")
+        return original(event, participant_ids, action, request=request)
+
+    with mock.patch.object(deadlines, "bulk_change_state", bulk_change_state):
+        with mock.patch.object(deadlines.logger, "warning") as warning:
+            results = process_deadlines(now=now)
+
+    assert [(rule.name, count) for rule, _event, count in results] == [
+        ("unconfigured", 0),
+        ("cancel", 1),
+    ]
+    participant.refresh_from_db()
+    assert participant.state == ParticipantStates.CANCELLED
+    assert warning.call_count == 1
+    assert "deadline_reminder" in warning.call_args.args
+
+    # The failed rule is repeated with the next run
+    assert set(ScheduledTaskRun.objects.values_list("name", flat=True)) == {
+        "deadline:unconfigured",
+        "deadline:cancel",
+    }
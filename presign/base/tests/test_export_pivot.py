@@ -0,0 +1,82 @@
+import datetime
+
+import pytest
+from django_scopes import scopes_disabled
+
+from ..export import build_export_columns, iter_export_rows
+from ..models import QuestionKind
+
+
+@pytest.mark.django_db
+def test_pivot_decodes_typed_values(
+    event_questionnaire_factory,
+    question_block_factory,
+    question_factory,
+    question_option_factory,
+    question_answer_factory,
+    participant_factory,
+):
+    with scopes_disabled():
+        event_questionnaire = event_questionnaire_factory.create()
+        event = event_questionnaire.event
+        block = question_block_factory.create(
+            questionnaire=event_questionnaire.questionnaire
+        )
+        questions = {
+            kind: question_factory.create(block=block, kind=kind)
+            for kind in [
+                QuestionKind.NUMBER,
+                QuestionKind.BOOL,
+                QuestionKind.DATE,
+                QuestionKind.TIME,
+                QuestionKind.DATETIME,
+                QuestionKind.MULTIPLE_CHOICE,
+            ]
+        }
+        options = [
+            question_option_factory.create(
+                question=questions[QuestionKind.MULTIPLE_CHOICE],
+                value=f"option {i}",
+                order=i,
+            )
+            for i in range(3)
+        ]
+        answered = participant_factory.create(event=event)
+        for kind, answer in [
+            (QuestionKind.NUMBER, "42"),
+            (QuestionKind.BOOL, "True"),
+            (QuestionKind.DATE, "2024-05-01"),
+            (QuestionKind.TIME, "12:30:00"),
+            (QuestionKind.DATETIME, "2024-05-01T12:30:00+00:00"),
+        ]:
+            question_answer_factory.create(
+                participant=answered, question=questions[kind], answer=answer
+            )
+        choice_answer = question_answer_factory.create(
+            participant=answered,
+            question=questions[QuestionKind.MULTIPLE_CHOICE],
+            answer=None,
+        )
+        choice_answer.options.add(options[2], options[0])
+
+        empty = participant_factory.create(event=event)
+        question_answer_factory.create(
+            participant=empty, question=questions[QuestionKind.NUMBER], answer="None"
+        )
+        question_answer_factory.create(
+            participant=empty, question=questions[QuestionKind.BOOL], answer="False"
+        )
+
+        fields = ["__id"] + [str(question.pk) for question in questions.values()]
+        columns = build_export_columns(fields, fields)
+        rows = {row[0]: row[1:] for row in iter_export_rows(event, columns)}
+
+    assert rows[str(answered.pk)] == [
+        42,
+        True,
+        datetime.date(2024, 5, 1),
+        datetime.time(12, 30),
+        datetime.datetime(2024, 5, 1, 12, 30, tzinfo=datetime.timezone.utc),
+        ["option 0", "option 2"],
+    ]
+    assert rows[str(empty.pk)] == [None, False, None, None, None, []]
@@ -0,0 +1,93 @@
+import smtplib
+from unittest import mock
+
+from django.core import mail
+from django.utils import timezone
+
+import pytest
+from django_scopes import scopes_disabled
+
+from ..models import OutgoingEmail, OutgoingEmailStates
+from ..outbox import claim_pending_emails, queue_email, send_pending_emails
+
+
+@pytest.mark.django_db
+def test_failed_emails_are_retried_with_backoff(
+    participant_factory, mailoutbox, settings
+):
+    settings.PRESIGN_EMAIL_MAX_ATTEMPTS = 2
+    with scopes_disabled():
+        participant = participant_factory.create()
+        for i in range(3):
+            queue_email(
+                event=participant.event,
+                participant=participant,
+                to=participant.email,
+                subject=f"Subject {i}",
+                body="Body",
+            )
+
+    with mock.patch.object(
+        mail.get_connection().__class__,
+        "open",
+        side_effect=smtplib.SMTPConnectError(421, "Busy"),
+    ):
+        assert send_pending_emails() == 3
+    assert len(mailoutbox) == 0
+
+    with scopes_disabled():
+        emails = OutgoingEmail.objects.all()
+        assert {email.state for email in emails} == {OutgoingEmailStates.PENDING}
+        assert all(email.next_attempt_at > timezone.now() for email in emails)
+        assert "Busy" in emails[0].error
+
+        # Not due yet
+        assert send_pending_emails() == 0
+
+        emails.update(next_attempt_at=timezone.now())
+        with mock.patch.object(
+            mail.get_connection().__class__, "open", return_value=True
+        ) as connect:
+            assert send_pending_emails(limit=2) == 2
+        # One connection for the whole batch
+        assert connect.call_count == 1
+        assert len(mailoutbox) == 2
+
+        with mock.patch.object(
+            mail.EmailMultiAlternatives,
+            "send",
+            side_effect=smtplib.SMTPRecipientsRefused({}),
+        ):
+            assert send_pending_emails() == 1
+        failed = OutgoingEmail.objects.get(state=OutgoingEmailStates.FAILED)
+        assert failed.attempts == 2
+        assert OutgoingEmail.objects.filter(state=OutgoingEmailStates.SENT).count() == 2
+
+
+@pytest.mark.django_db
+@scopes_disabled()
+def test_emails_are_claimed_in_one_update(
+    participant_factory, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    participant = participant_factory.create()
+    with django_capture_on_commit_callbacks() as callbacks:
+        for i in range(5):
+            queue_email(
+                event=participant.event,
+                to=participant.email,
+                subject=f"Subject {i}",
+                body="Body",
+            )
+    # Sending is left to the email worker
+    assert callbacks == []
+
+    with django_assert_num_queries(3):
+        claimed = claim_pending_emails(limit=4)
+    assert len(claimed) == 4
+    assert len({email.claim_token for email in claimed}) == 1
+
+    # Claimed emails are not handed to another sender
+    remaining = claim_pending_emails()
+    assert len(remaining) == 1
+    assert remaining[0] not in claimed
+    assert claim_pending_emails() == []
@@ -0,0 +1,59 @@
+import pytest
+from django_scopes import scopes_disabled
+
+from ..models import User
+
+
+def fresh(user):
+    # A new instance, like the user of the next request
+    return User.objects.get(pk=user.pk)
+
+
+@pytest.mark.django_db
+@scopes_disabled()
+def test_permissions_are_answered_without_queries(
+    event_factory, normal_user, django_assert_num_queries
+):
+    event = event_factory.create()
+    other_event = event_factory.create()
+    event.organizer.members.add(normal_user)
+
+    user = fresh(normal_user)
+    with django_assert_num_queries(1):
+        assert user.has_organizer_permission(event.organizer)
+        assert user.has_event_permission(event)
+        assert not user.has_event_permission(other_event)
+        assert not user.has_organizer_permission(other_event.organizer)
+
+    user = fresh(normal_user)
+    with django_assert_num_queries(0):
+        assert user.has_event_permission(event)
+    assert list(user.get_organizers()) == [event.organizer]
+    assert list(user.get_events()) == [event]
+
+
+@pytest.mark.django_db
+@scopes_disabled()
+def test_membership_changes_invalidate_permissions(
+    organizer_factory, normal_user, superuser
+):
+    organizer = organizer_factory.create()
+    assert not fresh(normal_user).has_organizer_permission(organizer)
+
+    organizer.members.add(normal_user, superuser)
+    assert fresh(normal_user).has_organizer_permission(organizer)
+
+    organizer.members.remove(normal_user)
+    assert not fresh(normal_user).has_organizer_permission(organizer)
+
+    normal_user.organizer_set.add(organizer)
+    assert fresh(normal_user).has_organizer_permission(organizer)
+
+    organizer.members.clear()
+    assert not fresh(normal_user).has_organizer_permission(organizer)
+    assert not fresh(superuser).has_organizer_permission(organizer)
+
+    organizer.members.add(normal_user)
+    assert fresh(normal_user).get_organizer_ids() == {organizer.pk}
+    organizer.delete()
+    assert fresh(normal_user).get_organizer_ids() == set()
@@ -0,0 +1,68 @@
+from unittest import mock
+
+from django.core.cache import cache
+
+import pytest
+from django_scopes import scopes_disabled
+
+from ..resolution import (
+    MISSING_TIMEOUT,
+    get_event,
+    get_organizer,
+    resolved_slugs,
+)
+
+
+@pytest.mark.django_db
+@scopes_disabled()
+def test_slugs_are_resolved_from_the_cache(event_factory, django_assert_num_queries):
+    event = event_factory.create()
+    organizer = event.organizer
+
+    with django_assert_num_queries(1):
+        assert get_event(organizer.slug, event.slug) == event
+    with django_assert_num_queries(0):
+        resolved = get_event(organizer.slug, event.slug)
+        assert resolved == event
+        assert resolved.organizer == organizer
+        assert get_event(organizer.slug, event.slug) is not resolved
+
+    with django_assert_num_queries(1):
+        assert get_organizer(organizer.slug) == organizer
+        assert get_organizer(organizer.slug) == organizer
+
+    with django_assert_num_queries(1):
+        assert get_event(organizer.slug, "missing") is None
+        assert get_event(organizer.slug, "missing") is None
+
+
+@pytest.mark.django_db
+@scopes_disabled()
+def test_saving_invalidates_resolved_slugs(event_factory, organizer_factory):
+    event = event_factory.create()
+    organizer = event.organizer
+    old_slug = event.slug
+    assert get_event(organizer.slug, old_slug) == event
+
+    event.slug = "renamed"
+    event.save()
+    assert get_event(organizer.slug, old_slug) is None
+    assert get_event(organizer.slug, "renamed") == event
+
+    assert get_organizer("new-organizer") is None
+    new_organizer = organizer_factory.create(slug="new-organizer")
+    assert get_organizer("new-organizer") == new_organizer
+
+    event.delete()
+    assert get_event(organizer.slug, "renamed") is None
+
+
+@pytest.mark.django_db
+@scopes_disabled()
+def test_unknown_slugs_are_cached_briefly():
+    cached = len(resolved_slugs)
+    with mock.patch.object(cache, "set", wraps=cache.set) as cache_set:
+        assert get_organizer("unknown") is None
+    assert cache_set.call_args.args[2] == MISSING_TIMEOUT
+    # Not kept in memory
+    assert len(resolved_slugs) == cached
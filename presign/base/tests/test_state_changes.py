@@ -0,0 +1,121 @@
+import threading
+
+from django.db import OperationalError, connection
+from django.test.utils import CaptureQueriesContext
+
+import pytest
+from django_scopes import scopes_disabled
+
+from ..exceptions import ParticipantStateChangeException
+from ..models import Participant, ParticipantStateActions, ParticipantStates
+
+
+def run_concurrently(participant_id, actions):
+    """
+    Runs every action in its own thread and database connection on a
+    separately loaded copy of the participant. All copies are loaded before
+    the first action starts, so every thread starts from the same state.
+    """
+    loaded = threading.Barrier(len(actions))
+    results = {}
+
+    def run(action):
+        try:
+            with scopes_disabled():
+                participant = Participant.objects.get(pk=participant_id)
+            loaded.wait()
+            for _attempt in range(100):
+                try:
+                    participant.change_state(action)
+                except OperationalError:
+                    # SQLite reports a locked database instead of waiting
+                    continue
+                except ParticipantStateChangeException:
+                    results[action] = False
+                else:
+                    results[action] = True
+                break
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=run, args=(action,)) for action in actions]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("attempt", range(5))
+def test_concurrent_state_changes_are_not_lost(participant_factory, attempt):
+    with scopes_disabled():
+        participant = participant_factory.create()
+        event = participant.event
+
+    actions = [
+        ParticipantStateActions.APPROVE,
+        ParticipantStateActions.REJECT,
+        ParticipantStateActions.WITHDRAW,
+        ParticipantStateActions.REQUEST_CHANGES,
+    ]
+    results = run_concurrently(participant.pk, actions)
+
+    # All transitions start from NEW, so exactly one of them can happen
+    succeeded = [action for action, success in results.items() if success]
+    assert len(results) == len(actions)
+    assert len(succeeded) == 1
+
+    with scopes_disabled():
+        participant.refresh_from_db()
+        assert (
+            participant.state
+            == Participant.STATE_CHANGES[ParticipantStates.NEW][succeeded[0]]
+        )
+        assert participant.history.count() == 2
+        assert {state: count for state, count in event.get_state_counts() if count} == {
+            participant.state: 1
+        }
+
+
+@pytest.mark.django_db
+@scopes_disabled()
+def test_stale_state_change_fails(participant_factory):
+    participant = participant_factory.create()
+    stale = Participant.objects.get(pk=participant.pk)
+    participant.change_state(ParticipantStateActions.APPROVE)
+
+    with pytest.raises(ParticipantStateChangeException):
+        stale.change_state(ParticipantStateActions.REJECT)
+    assert stale.state == ParticipantStates.APPROVED
+
+    # The reloaded state allows the transitions of the new state
+    stale.change_state(ParticipantStateActions.WITHDRAW)
+    participant.refresh_from_db()
+    assert participant.state == ParticipantStates.WITHDRAWN
+
+
+@pytest.mark.django_db
+@scopes_disabled()
+def test_state_change_writes_participant_once(participant_factory):
+    participant = participant_factory.create()
+    changed_at = participant.changed_at
+
+    with CaptureQueriesContext(connection) as queries:
+        participant.change_state(ParticipantStateActions.APPROVE)
+    participant_writes = [
+        query["sql"]
+        for query in queries
+        if query["sql"].startswith('UPDATE "base_participant"')
+    ]
+    assert len(participant_writes) == 1
+
+    participant.refresh_from_db()
+    assert participant.state == ParticipantStates.APPROVED
+    assert participant.changed_at > changed_at
+    latest = participant.history.latest()
+    assert latest.state == ParticipantStates.APPROVED
+    assert latest.history_type == "~"
+    assert {
+        state: count for state, count in participant.event.get_state_counts() if count
+    } == {ParticipantStates.APPROVED: 1}
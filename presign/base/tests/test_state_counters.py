@@ -0,0 +1,76 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+import pytest
+from django_scopes import scopes_disabled
+
+from ..models import (
+    EventStateCounter,
+    ParticipantStateActions,
+    ParticipantStates,
+)
+
+
+def get_counts(event):
+    return {state: count for state, count in event.get_state_counts() if count}
+
+
+@pytest.mark.django_db
+@scopes_disabled()
+def test_state_counters_follow_participants(participant_factory):
+    participant = participant_factory.create()
+    event = participant.event
+    participant_factory.create_batch(2, event=event)
+    assert get_counts(event) == {ParticipantStates.NEW: 3}
+
+    participant.change_state(ParticipantStateActions.APPROVE)
+    assert get_counts(event) == {
+        ParticipantStates.NEW: 2,
+        ParticipantStates.APPROVED: 1,
+    }
+
+    participant.email = "changed@example.com"
+    participant.save()
+    assert get_counts(event) == {
+        ParticipantStates.NEW: 2,
+        ParticipantStates.APPROVED: 1,
+    }
+
+    participant.delete()
+    assert get_counts(event) == {ParticipantStates.NEW: 2}
+    assert event.get_participant_count() == 2
+
+
+@pytest.mark.django_db
+@scopes_disabled()
+def test_rebuild_state_counters(participant_factory):
+    event = participant_factory.create().event
+    participant_factory.create(event=event, state=ParticipantStates.APPROVED)
+    EventStateCounter.objects.filter(event=event).update(count=42)
+
+    stdout = StringIO()
+    call_command("rebuild_state_counters", stdout=stdout)
+    assert event.slug in stdout.getvalue()
+    assert get_counts(event) == {
+        ParticipantStates.NEW: 1,
+        ParticipantStates.APPROVED: 1,
+    }
+
+    stdout = StringIO()
+    call_command("rebuild_state_counters", stdout=stdout)
+    assert stdout.getvalue() == ""
+
+
+@pytest.mark.django_db
+@scopes_disabled()
+def test_drifted_state_counter_does_not_go_below_zero(participant_factory):
+    participant = participant_factory.create()
+    event = participant.event
+    participant_factory.create(event=event)
+    EventStateCounter.objects.filter(event=event).update(count=0)
+
+    participant.delete()
+    assert get_counts(event) == {}
+    participant_factory.create(event=event)
+    assert get_counts(event) == {ParticipantStates.NEW: 1}
@@ -0,0 +1,85 @@
+from unittest import mock
+
+import pytest
+from django_scopes import scopes_disabled
+
+from ..cache import get_version
+from ..models import Event, GlobalSettings, ParticipantStateActions, ParticipantStates
+from ..models.texts import end_texts_request, start_texts_request
+
+
+def fresh(event):
+    return Event.objects.select_related("organizer").get(pk=event.pk)
+
+
+@pytest.mark.django_db
+@scopes_disabled()
+def test_texts_are_resolved_once(event_factory, django_assert_num_queries):
+    event = event_factory.create()
+    texts = event.get_action_email_texts(ParticipantStateActions.APPROVE)
+    status = event.get_status_text(ParticipantStates.NEW)
+
+    event = fresh(event)
+    with django_assert_num_queries(0):
+        assert event.get_action_email_texts(ParticipantStateActions.APPROVE) == texts
+        assert event.get_status_text(ParticipantStates.NEW) == status
+
+
+@pytest.mark.django_db
+@scopes_disabled()
+def test_text_changes_on_every_level_are_seen(event_factory):
+    event = event_factory.create()
+    event.status_texts.delete(ParticipantStates.NEW)
+    assert str(fresh(event).get_status_text(ParticipantStates.NEW)) == ""
+
+    GlobalSettings().status_texts.set(ParticipantStates.NEW, {"en": "Global"})
+    assert str(fresh(event).get_status_text(ParticipantStates.NEW)) == "Global"
+
+    event.organizer.status_texts.set(ParticipantStates.NEW, {"en": "Organizer"})
+    assert str(fresh(event).get_status_text(ParticipantStates.NEW)) == "Organizer"
+
+    event.status_texts.set(ParticipantStates.NEW, {"en": "Event"})
+    assert str(fresh(event).get_status_text(ParticipantStates.NEW)) == "Event"
+
+    event.status_texts.delete(ParticipantStates.NEW)
+    assert str(fresh(event).get_status_text(ParticipantStates.NEW)) == "Organizer"
+
+    GlobalSettings().status_texts.delete(ParticipantStates.NEW)
+
+
+@pytest.mark.django_db
+@scopes_disabled()
+def test_texts_version_is_read_once_per_request(event_factory):
+    event = fresh(event_factory.create())
+    start_texts_request()
+    try:
+        with mock.patch(
+            "presign.base.models.texts.get_version", wraps=get_version
+        ) as version:
+            for state in ParticipantStates:
+                event.get_status_text(state)
+            for action in ParticipantStateActions:
+                event.get_action_email_texts(action)
+        assert version.call_count == 1
+    finally:
+        end_texts_request()
+
+
+@pytest.mark.django_db
+@scopes_disabled()
+def test_text_changes_are_seen_by_the_same_instance(event_factory):
+    event = fresh(event_factory.create())
+    event.status_texts.set(ParticipantStates.NEW, {"en": "Before"})
+    assert str(event.get_status_text(ParticipantStates.NEW)) == "Before"
+
+    event.status_texts.set(ParticipantStates.NEW, {"en": "After"})
+    assert str(event.get_status_text(ParticipantStates.NEW)) == "After"
+
+    start_texts_request()
+    try:
+        assert str(event.get_status_text(ParticipantStates.NEW)) == "After"
+        event.status_texts.set(ParticipantStates.NEW, {"en": "During"})
+        assert str(event.get_status_text(ParticipantStates.NEW)) == "During"
+    finally:
+        end_texts_request()
+    assert str(event.get_status_text(ParticipantStates.NEW)) == "During"
@@ -1,10 +1,13 @@
+import hashlib
 from datetime import timedelta
 from typing import Union
 from urllib import parse
 
+from django.core.cache import cache
 from django.core.signing import BadSignature, TimestampSigner
 
 SIGNATURE_PARAMETER = "X-Presign-Signature"
+SIGNED_URL_KEY = "presign:signed-url:{}"
 
 
 def get_signer(salt: str) -> TimestampSigner:
@@ -19,6 +22,13 @@ def sign_url(url: str, salt: str) -> str:
     return "{}?{}".format(url, parse.urlencode({SIGNATURE_PARAMETER: signature}))
 
 
+def cached_sign_url(url: str, salt: str, timeout: int) -> str:
+    # Reusing a signature for a short time keeps urls stable between page
+    # views, `timeout` must stay well below the max age of the signature.
+    key = SIGNED_URL_KEY.format(hashlib.sha256(f"{salt}:{url}".encode()).hexdigest())
+    return cache.get_or_set(key, lambda: sign_url(url, salt), timeout)
+
+
 def verify_url(url, salt: str, max_age: Union[int, timedelta]) -> bool:
     signer = get_signer(salt=salt)
     parsed_url = parse.urlparse(url)
@@ -15,6 +15,7 @@ from pytest_factoryboy import register
 
 from presign.base.models import (
     Event,
+    EventQuestionnaire,
     Organizer,
     Participant,
     ParticipantStateActions,
@@ -24,6 +25,8 @@ from presign.base.models import (
     QuestionBlock,
     QuestionKind,
     Questionnaire,
+    QuestionnaireRole,
+    QuestionOption,
 )
 
 # Needed for playwright
@@ -238,15 +241,50 @@ class QuestionBlockFactory(factory.django.DjangoModelFactory):
     questionnaire = factory.SubFactory(QuestionnaireFactory)
 
 
+@register
+class EventQuestionnaireFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = EventQuestionnaire
+
+    event = factory.SubFactory(EventFactory)
+    questionnaire = factory.SubFactory(
+        QuestionnaireFactory, organizer=factory.SelfAttribute("..event.organizer")
+    )
+    role = QuestionnaireRole.DURING_SIGNUP
+
+
+@register
 class QuestionFactory(factory.django.DjangoModelFactory):
     class Meta:
         model = Question
 
+    kind = QuestionKind.STRING
+    name = factory.LazyFunction(random_i18n_chars)
     required = True
     order = factory.Sequence(lambda n: n)
     block = factory.SubFactory(QuestionBlockFactory)
 
 
+@register
+class QuestionOptionFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = QuestionOption
+
+    question = factory.SubFactory(QuestionFactory, kind=QuestionKind.CHOICE)
+    value = factory.LazyFunction(random_i18n_chars)
+    order = factory.Sequence(lambda n: n)
+
+
+@register
+class QuestionAnswerFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = QuestionAnswer
+
+    question = factory.SubFactory(QuestionFactory)
+    participant = factory.SubFactory(ParticipantFactory)
+    answer = factory.Faker("word")
+
+
 @register
 class FileQuestionFactory(QuestionFactory):
     kind = QuestionKind.FILE
@@ -1,154 +1,122 @@
-from django.urls import reverse
+import functools
+from typing import Callable, Hashable, Iterable, List, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.urls import get_script_prefix, reverse
+from django.utils.translation import get_language
 from django.utils.translation import gettext_lazy as _
 
+from presign.base.cache import LRUCache
 
-def get_top_nav(request):
+
+class NavLink(NamedTuple):
+    label: str
+    url: str
+    url_name: str
+    icon: str
+
+
+# Compiled items are NavLinks or None for a separator
+CompiledNav = Tuple[Optional[NavLink], ...]
+
+compiled_navs = LRUCache(settings.PRESIGN_NAV_CACHE_MAX_ENTRIES)
+
+
+def link(label, url_name: str, icon: str, **kwargs) -> NavLink:
+    return NavLink(
+        label=str(label),
+        url=reverse(f"control:{url_name}", kwargs=kwargs),
+        url_name=url_name,
+        icon=icon,
+    )
+
+
+def compile_top_nav() -> CompiledNav:
+    return (
+        link(_("My Organizers"), "user-organizers", "people"),
+        link(_("My Events"), "user-events", "calendar"),
+        link(_("Questionnaires"), "questionnaires", "card-list"),
+    )
+
+
+def compile_organizer_nav(organizer) -> CompiledNav:
+    kwargs = {"organizer": organizer.slug}
+    return (
+        None,
+        link(organizer.name, "organizer", "people", **kwargs),
+        link(_("Settings"), "organizer-settings", "gear", **kwargs),
+        link(_("Questionnaires"), "questionnaire-list", "card-list", **kwargs),
+        link(_("Events"), "event-list", "calendar", **kwargs),
+    )
+
+
+def compile_event_nav(organizer, event) -> CompiledNav:
+    kwargs = {"organizer": organizer.slug, "event": event.slug}
+    return (
+        None,
+        link(event.name, "event", "calendar", **kwargs),
+        link(_("Settings"), "event-change", "gear", **kwargs),
+        link(_("Participants"), "participant-list", "person", **kwargs),
+        link(_("Export"), "event-export", "download", **kwargs),
+    )
+
+
+def get_compiled_nav(key: Hashable, compile: Callable[[], CompiledNav]) -> CompiledNav:
+    # Everything an item depends on is part of the key, so entries never have
+    # to be invalidated. Names are included as they are shown as labels.
+    key = (get_language(), get_script_prefix(), *key)
+    nav = compiled_navs.get(key)
+    if nav is None:
+        nav = compile()
+        compiled_navs.set(key, nav)
+    return nav
+
+
+def render_nav(request, nav: Iterable[Optional[NavLink]]) -> List[dict]:
+    url_name = request.resolved_path.url_name
     return [
-        {
-            "type": "link",
-            "label": _("My Organizers"),
-            "url": reverse(
-                "control:user-organizers",
-                kwargs={},
-            ),
-            "active": (request.resolved_path.url_name == "user-organizers"),
-            "icon": "people",
-        },
-        {
-            "type": "link",
-            "label": _("My Events"),
-            "url": reverse(
-                "control:user-events",
-                kwargs={},
-            ),
-            "active": (request.resolved_path.url_name == "user-events"),
-            "icon": "calendar",
-        },
-        {
+        {"type": "seperator"}
+        if item is None
+        else {
             "type": "link",
-            "label": _("Questionnaires"),
-            "url": reverse(
-                "control:questionnaires",
-                kwargs={},
-            ),
-            "active": (request.resolved_path.url_name == "questionnaires"),
-            "icon": "card-list",
-        },
+            "label": item.label,
+            "url": item.url,
+            "active": item.url_name == url_name,
+            "icon": item.icon,
+        }
+        for item in nav
     ]
 
 
+def get_top_nav(request):
+    return render_nav(request, get_compiled_nav(("top",), compile_top_nav))
+
+
 def get_organizer_nav_items(request, organizer):
-    return [
-        {"type": "seperator"},
-        {
-            "type": "link",
-            "label": organizer.name,
-            "url": reverse(
-                "control:organizer",
-                kwargs={"organizer": organizer.slug},
-            ),
-            "active": (request.resolved_path.url_name == "organizer"),
-            "icon": "people",
-        },
-        {
-            "type": "link",
-            "label": _("Settings"),
-            "url": reverse(
-                "control:organizer-settings",
-                kwargs={"organizer": organizer.slug},
-            ),
-            "active": (request.resolved_path.url_name == "organizer-settings"),
-            "icon": "gear",
-        },
-        {
-            "type": "link",
-            "label": _("Questionnaires"),
-            "url": reverse(
-                "control:questionnaire-list",
-                kwargs={"organizer": organizer.slug},
-            ),
-            "active": (request.resolved_path.url_name == "questionnaire-list"),
-            "icon": "card-list",
-        },
-        {
-            "type": "link",
-            "label": _("Events"),
-            "url": reverse(
-                "control:event-list",
-                kwargs={"organizer": organizer.slug},
-            ),
-            "active": (request.resolved_path.url_name == "event-list"),
-            "icon": "calendar",
-        },
-    ]
+    key = ("organizer", organizer.slug, str(organizer.name))
+    return render_nav(
+        request, get_compiled_nav(key, lambda: compile_organizer_nav(organizer))
+    )
 
 
 def get_nav_items(request):
-    nav_items = get_top_nav(request)
-
-    if hasattr(request, "organizer"):
-        nav_items.extend(get_organizer_nav_items(request, organizer=request.organizer))
-
-    if hasattr(request, "event"):
-        nav_items.extend(
-            [
-                {"type": "seperator"},
-                {
-                    "type": "link",
-                    "label": request.event.name,
-                    "url": reverse(
-                        "control:event",
-                        kwargs={
-                            "organizer": request.organizer.slug,
-                            "event": request.event.slug,
-                        },
-                    ),
-                    "active": (request.resolved_path.url_name == "event"),
-                    "icon": "calendar",
-                },
-                {
-                    "type": "link",
-                    "label": _("Settings"),
-                    "url": reverse(
-                        "control:event-change",
-                        kwargs={
-                            "organizer": request.organizer.slug,
-                            "event": request.event.slug,
-                        },
-                    ),
-                    "active": (request.resolved_path.url_name == "event-change"),
-                    "icon": "gear",
-                },
-                {
-                    "type": "link",
-                    "label": _("Participants"),
-                    "url": reverse(
-                        "control:participant-list",
-                        kwargs={
-                            "organizer": request.organizer.slug,
-                            "event": request.event.slug,
-                        },
-                    ),
-                    "active": (request.resolved_path.url_name == "participant-list"),
-                    "icon": "person",
-                },
-                {
-                    "type": "link",
-                    "label": _("Export"),
-                    "url": reverse(
-                        "control:event-export",
-                        kwargs={
-                            "organizer": request.organizer.slug,
-                            "event": request.event.slug,
-                        },
-                    ),
-                    "active": (request.resolved_path.url_name == "event-export"),
-                    "icon": "download",
-                },
-            ]
-        )
-
-    return nav_items
+    organizer = getattr(request, "organizer", None)
+    event = getattr(request, "event", None)
+    key = ("nav",)
+    if organizer is not None:
+        key += (organizer.slug, str(organizer.name))
+    if event is not None:
+        key += (event.slug, str(event.name))
+
+    def compile():
+        nav = compile_top_nav()
+        if organizer is not None:
+            nav += compile_organizer_nav(organizer)
+        if event is not None:
+            nav += compile_event_nav(organizer, event)
+        return nav
+
+    return render_nav(request, get_compiled_nav(key, compile))
 
 
 def contextprocessor(request):
@@ -158,4 +126,8 @@ def contextprocessor(request):
     ):
         return {}
 
-    return {"nav_items": get_nav_items(request), "additional_nav_items": []}
+    # Templates call it when they use nav_items, at most once per request
+    return {
+        "nav_items": functools.cache(functools.partial(get_nav_items, request)),
+        "additional_nav_items": [],
+    }
@@ -0,0 +1,112 @@
+import uuid
+from collections import defaultdict
+from typing import Dict, List, NamedTuple
+
+from django.db.models import Count, Exists, OuterRef, QuerySet
+from django.http import QueryDict
+from django.utils.translation import gettext_lazy as _
+
+from presign.base.catalog import CatalogQuestion, QuestionCatalog
+from presign.base.models import QuestionAnswer, QuestionKind
+
+FACET_KINDS = [QuestionKind.CHOICE, QuestionKind.MULTIPLE_CHOICE, QuestionKind.BOOL]
+
+
+class FacetValue(NamedTuple):
+    value: str
+    label: str
+    count: int
+    selected: bool
+
+
+class Facet(NamedTuple):
+    question: CatalogQuestion
+    name: str
+    values: List[FacetValue]
+
+
+def facet_name(question: CatalogQuestion) -> str:
+    return f"facet_{question.id}"
+
+
+def facet_choices(question: CatalogQuestion) -> Dict[str, str]:
+    if question.kind == QuestionKind.BOOL:
+        return {str(True): _("Yes"), str(False): _("No")}
+    return {str(option.id): option.value for option in question.options}
+
+
+class ParticipantFacets:
+    """
+    Filters participants by their answers to choice and yes/no questions.
+
+    Values of one question are combined with OR, different questions with
+    AND. Every selected question becomes an EXISTS subquery on the answers,
+    which is served by the (participant, question) unique index.
+    """
+
+    def __init__(self, catalog: QuestionCatalog, data: QueryDict):
+        self.questions = [
+            question
+            for question in catalog.questions.values()
+            if question.kind in FACET_KINDS
+        ]
+        self.selected: Dict[uuid.UUID, List[str]] = {}
+        for question in self.questions:
+            choices = facet_choices(question)
+            values = [
+                value
+                for value in data.getlist(facet_name(question))
+                if value in choices
+            ]
+            if values:
+                self.selected[question.id] = values
+
+    def filter_queryset(self, queryset: QuerySet) -> QuerySet:
+        for question in self.questions:
+            values = self.selected.get(question.id)
+            if not values:
+                continue
+            answers = QuestionAnswer.objects.filter(
+                participant=OuterRef("pk"), question_id=question.id
+            )
+            if question.kind == QuestionKind.BOOL:
+                answers = answers.filter(answer__in=values)
+            else:
+                answers = answers.filter(options__in=values)
+            queryset = queryset.filter(Exists(answers))
+        return queryset
+
+    def get_facets(self, queryset: QuerySet) -> List[Facet]:
+        if not self.questions:
+            return []
+
+        # Counts for all facets in one GROUP BY over answers and their options
+        counts = defaultdict(int)
+        for row in (
+            QuestionAnswer.objects.filter(
+                participant__in=queryset.values("pk"),
+                question_id__in=[question.id for question in self.questions],
+            )
+            .values("question_id", "options", "answer")
+            .annotate(count=Count("participant_id", distinct=True))
+            .order_by()
+        ):
+            counts[(row["question_id"], str(row["options"]))] += row["count"]
+            counts[(row["question_id"], row["answer"])] += row["count"]
+
+        return [
+            Facet(
+                question=question,
+                name=facet_name(question),
+                values=[
+                    FacetValue(
+                        value=value,
+                        label=str(label),
+                        count=counts[(question.id, value)],
+                        selected=value in self.selected.get(question.id, []),
+                    )
+                    for value, label in facet_choices(question).items()
+                ],
+            )
+            for question in self.questions
+        ]
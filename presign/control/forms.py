@@ -1,3 +1,5 @@
+import uuid
+
 from django import forms
 from django.core.exceptions import ValidationError
 from django.db.models import Max, Q
@@ -7,6 +9,8 @@ from django.utils.translation import gettext_lazy as _
 from django_scopes import scope
 from i18nfield import forms as i18n_forms
 
+from presign.base.catalog import get_question_catalog
+from presign.base.export import EXPORT_WRITERS, parse_export_cursor
 from presign.base.fields import (
     I18nLargeTextArea,
     I18nSmallerTextArea,
@@ -24,6 +28,7 @@ from presign.base.models import (
     QuestionnaireRole,
     QuestionOption,
 )
+from presign.base.search import search_participants
 
 from .constants import STATE_CHANGE_STRINGS
 
@@ -369,6 +374,23 @@ class ExportForm(forms.Form):
     fields = forms.MultipleChoiceField(
         widget=forms.CheckboxSelectMultiple(), label=_("Fields")
     )
+    format = forms.ChoiceField(
+        label=_("Format"),
+        choices=[
+            (identifier, writer.verbose_name)
+            for identifier, writer in EXPORT_WRITERS.items()
+        ],
+        initial="csv",
+        required=False,
+    )
+    changed_since = forms.CharField(
+        label=_("Only participants changed since"),
+        help_text=_(
+            "Cursor shown after a previous export. Leave empty to export all "
+            "participants."
+        ),
+        required=False,
+    )
 
     def __init__(
         self,
@@ -382,12 +404,69 @@ class ExportForm(forms.Form):
             ["Participant Information", [["__id", _("Id")], ["__email", _("Email")]]]
         ]
         self.id_map = {"__id": _("Id"), "__email": _("Email")}
-        for questionnaire in event.questionnaires.all():
-            for block in QuestionBlock.objects.filter(questionnaire=questionnaire):
-                block_choices = []
-                for question in block.question_set.all():
-                    block_choices.append((question.pk, question.name))
-                    self.id_map[str(question.pk)] = question.name
-                choices.append((block.name, block_choices))
+        for block in get_question_catalog(event).blocks:
+            block_choices = []
+            for question in block.questions:
+                block_choices.append((question.id, question.name))
+                self.id_map[str(question.id)] = question.name
+            choices.append((block.name, block_choices))
 
         self.fields["fields"].choices = choices
+
+    def clean_format(self):
+        return self.cleaned_data["format"] or "csv"
+
+    def clean_changed_since(self):
+        value = self.cleaned_data["changed_since"]
+        if not value:
+            return None
+        try:
+            return parse_export_cursor(value)
+        except ValueError:
+            raise ValidationError(_("This is not a valid export cursor."))
+
+
+class ParticipantFilterForm(forms.Form):
+    q = forms.CharField(label=_("Search"), required=False)
+    state = forms.ChoiceField(
+        label=_("State"),
+        choices=[("", _("All states"))] + ParticipantStates.choices,
+        required=False,
+    )
+    email = forms.CharField(label=_("Email starts with"), required=False)
+
+    def filter_queryset(self, queryset):
+        if not self.is_valid():
+            return queryset
+        if self.cleaned_data["state"]:
+            queryset = queryset.filter(state=self.cleaned_data["state"])
+        if self.cleaned_data["email"]:
+            queryset = queryset.filter(email__istartswith=self.cleaned_data["email"])
+        if self.cleaned_data["q"]:
+            queryset = search_participants(queryset, self.cleaned_data["q"])
+        return queryset
+
+
+class UUIDListField(forms.Field):
+    widget = forms.MultipleHiddenInput
+
+    def to_python(self, value):
+        try:
+            return [uuid.UUID(str(item)) for item in value or []]
+        except ValueError:
+            raise ValidationError(_("Invalid selection."))
+
+
+class ParticipantBulkStateChangeForm(forms.Form):
+    action = forms.ChoiceField(
+        label=_("Action"),
+        choices=[("", _("Choose an action"))]
+        + [
+            (action, strings["btn_text"])
+            for action, strings in STATE_CHANGE_STRINGS.items()
+            if "success_msg" in strings
+        ],
+    )
+    participants = UUIDListField(
+        error_messages={"required": _("Select at least one participant.")}
+    )
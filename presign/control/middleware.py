@@ -1,11 +1,10 @@
 from django.contrib.auth.views import redirect_to_login
 from django.http import Http404
-from django.urls import resolve
 from django.utils.translation import gettext_lazy as _
 
 from django_scopes import scope
 
-from presign.base.models import Event, Organizer
+from presign.base.resolution import get_event, get_organizer
 
 
 class ControlMiddleware:
@@ -16,11 +15,10 @@ class ControlMiddleware:
         return redirect_to_login(request.get_full_path())
 
     def __call__(self, request):
-        url = resolve(request.path_info)
-        request.resolved_path = url
+        url = request.resolver_match
 
         # Only apply this middleware to the control urls
-        if "control" not in url.namespaces:
+        if url is None or "control" not in url.namespaces:
             return self.get_response(request)
 
         # Control is only availbale for authenticated users
@@ -28,10 +26,7 @@ class ControlMiddleware:
             return self._login_redirect(request)
 
         if "organizer" in url.kwargs:
-            with scope(user=request.user):
-                organizer = Organizer.objects.filter(
-                    members=request.user, slug=url.kwargs["organizer"]
-                ).first()
+            organizer = get_organizer(url.kwargs["organizer"])
 
             if not organizer or not request.user.has_organizer_permission(organizer):
                 raise Http404(
@@ -41,17 +36,13 @@ class ControlMiddleware:
             request.organizer = organizer
 
         if hasattr(request, "organizer") and "event" in url.kwargs:
-            with scope(organizer=request.organizer):
-                event = Event.objects.filter(
-                    organizer=request.organizer, slug=url.kwargs["event"]
-                ).first()
+            event = get_event(request.organizer.slug, url.kwargs["event"])
 
-                if not event or not request.user.has_event_permission(event):
-                    raise Http404(
-                        _("No event found or you don't have permissions for it ")
-                    )
+            if not event or not request.user.has_event_permission(event):
+                raise Http404(_("No event found or you don't have permissions for it "))
 
-                request.event = event
+            event.organizer = request.organizer
+            request.event = event
 
         if hasattr(request, "event"):
             with scope(organizer=request.organizer, event=request.event):
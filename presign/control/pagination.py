@@ -0,0 +1,67 @@
+import datetime
+import uuid
+from typing import List, NamedTuple, Optional, Tuple
+
+from django.db.models import Q, QuerySet
+
+PAGE_SIZE = 50
+
+
+class KeysetPage(NamedTuple):
+    object_list: List
+    next_cursor: Optional[str]
+    previous_cursor: Optional[str]
+
+
+def format_cursor(obj) -> str:
+    return f"{obj.created_at.isoformat()}_{obj.pk}"
+
+
+def parse_cursor(value: str) -> Optional[Tuple[datetime.datetime, uuid.UUID]]:
+    try:
+        created_at, pk = value.rsplit("_", 1)
+        return datetime.datetime.fromisoformat(created_at), uuid.UUID(pk)
+    except ValueError:
+        return None
+
+
+def paginate_keyset(
+    queryset: QuerySet,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    page_size: int = PAGE_SIZE,
+) -> KeysetPage:
+    # Pages are addressed by the (created_at, id) of their neighbours instead of
+    # an offset, so every page is a range scan on the same index.
+    after = after and parse_cursor(after)
+    before = before and parse_cursor(before)
+
+    if before:
+        created_at, pk = before
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk)
+        ).order_by("-created_at", "-pk")
+    else:
+        if after:
+            created_at, pk = after
+            queryset = queryset.filter(
+                Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk)
+            )
+        queryset = queryset.order_by("created_at", "pk")
+
+    object_list = list(queryset[: page_size + 1])
+    has_more = len(object_list) > page_size
+    object_list = object_list[:page_size]
+    if before:
+        object_list.reverse()
+
+    if not object_list:
+        return KeysetPage(object_list, None, None)
+
+    has_next = has_more if not before else True
+    has_previous = has_more if before else bool(after)
+    return KeysetPage(
+        object_list,
+        format_cursor(object_list[-1]) if has_next else None,
+        format_cursor(object_list[0]) if has_previous else None,
+    )
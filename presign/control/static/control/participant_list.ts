@@ -0,0 +1,12 @@
+window.addEventListener("load", () => {
+	const selectAll = document.getElementById(
+		"select_all_participants",
+	) as HTMLInputElement;
+	selectAll.addEventListener("change", () =>
+		(
+			document.querySelectorAll(
+				'input[name="participants"]',
+			) as NodeListOf<HTMLInputElement>
+		).forEach((e: HTMLInputElement) => (e.checked = selectAll.checked)),
+	);
+});
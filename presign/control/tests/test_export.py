@@ -0,0 +1,355 @@
+import csv
+import io
+import json
+import zipfile
+from unittest import mock
+
+from django.contrib.messages import get_messages
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+import pytest
+from django_scopes import scopes_disabled
+
+from presign.base.export import (
+    EXPORT_JOB_TIMEOUT,
+    build_export_columns,
+    cache_export,
+    claim_next_export_job,
+    export_cache,
+    iter_export_rows,
+)
+from presign.base.models import (
+    ExportJob,
+    ExportJobStates,
+    QuestionAnswer,
+    QuestionKind,
+)
+
+
+@pytest.fixture
+def export_event(
+    event_questionnaire_factory,
+    question_block_factory,
+    question_factory,
+    question_option_factory,
+    question_answer_factory,
+    participant_factory,
+):
+    with scopes_disabled():
+        event_questionnaire = event_questionnaire_factory.create()
+        event = event_questionnaire.event
+        block = question_block_factory.create(
+            questionnaire=event_questionnaire.questionnaire
+        )
+        text_question = question_factory.create(block=block, kind=QuestionKind.STRING)
+        number_question = question_factory.create(block=block, kind=QuestionKind.NUMBER)
+        choice_question = question_factory.create(block=block, kind=QuestionKind.CHOICE)
+        option = question_option_factory.create(question=choice_question)
+        for i in range(7):
+            participant = participant_factory.create(event=event)
+            question_answer_factory.create(
+                participant=participant, question=text_question, answer=f"text {i}"
+            )
+            question_answer_factory.create(
+                participant=participant, question=number_question, answer=str(i)
+            )
+            choice_answer = question_answer_factory.create(
+                participant=participant, question=choice_question, answer=None
+            )
+            choice_answer.options.add(option)
+    return event
+
+
+def export_url(event):
+    return reverse(
+        "control:event-export",
+        kwargs={"organizer": event.organizer.slug, "event": event.slug},
+    )
+
+
+def read_export(response):
+    content = b"".join(
+        chunk.encode() if isinstance(chunk, str) else chunk
+        for chunk in response.streaming_content
+    )
+    return list(csv.reader(io.StringIO(content.decode())))
+
+
+@pytest.mark.django_db
+def test_export_streams_all_participants(export_event, superuser, client):
+    client.force_login(superuser)
+    export_event.organizer.members.add(superuser)
+    with scopes_disabled():
+        questions = list(
+            export_event.questionnaires.get().questionblock_set.get().question_set.all()
+        )
+        participants = list(export_event.participant_set.all())
+
+    response = client.post(
+        export_url(export_event),
+        {"fields": ["__id", "__email"] + [str(q.pk) for q in questions]},
+    )
+    assert response.streaming
+    rows = read_export(response)
+
+    assert len(rows) == len(participants) + 1
+    assert rows[0][:2] == ["Id", "Email"]
+    exported = {row[0]: row for row in rows[1:]}
+    for participant in participants:
+        row = exported[str(participant.pk)]
+        assert row[1] == participant.email
+        assert row[2].startswith("text ")
+
+
+@pytest.mark.django_db
+def test_export_query_count_grows_with_chunks(
+    export_event, django_assert_max_num_queries
+):
+    with scopes_disabled():
+        fields = ["__id", "__email"] + [
+            str(q.pk)
+            for q in export_event.questionnaires.get()
+            .questionblock_set.get()
+            .question_set.all()
+        ]
+        columns = build_export_columns(fields, fields)
+        # one option query, then 7 participants in chunks of 3 -> one pivot query
+        # for each of the 3 chunks
+        with django_assert_max_num_queries(4):
+            rows = list(iter_export_rows(export_event, columns, chunk_size=3))
+    assert len(rows) == 7
+
+
+@pytest.mark.django_db
+def test_background_export(export_event, superuser, client):
+    client.force_login(superuser)
+    export_event.organizer.members.add(superuser)
+    with scopes_disabled():
+        participant_count = export_event.participant_set.count()
+
+    response = client.post(
+        export_url(export_event), {"fields": ["__id", "__email"], "background": ""}
+    )
+    assert response.status_code == 302
+
+    with scopes_disabled():
+        job = ExportJob.objects.get(event=export_event)
+    assert job.state == ExportJobStates.PENDING
+    assert job.header == ["Id", "Email"]
+
+    call_command("run_export_worker", "--once")
+
+    with scopes_disabled():
+        job.refresh_from_db()
+    assert job.state == ExportJobStates.DONE
+    assert job.processed == participant_count
+
+    response = client.get(export_url(export_event))
+    assert job.file_media_url() in response.content.decode()
+
+    response = client.get(job.file_media_url())
+    assert response.status_code == 200
+    rows = list(csv.reader(io.StringIO(response.getvalue().decode())))
+    assert len(rows) == participant_count + 1
+
+
+@pytest.mark.django_db
+@scopes_disabled()
+def test_stale_export_job_is_reclaimed(export_event):
+    job = ExportJob.objects.create(
+        event=export_event, fields=["__id"], header=["Id"], format="csv"
+    )
+    assert claim_next_export_job() == job
+    # Claimed by a worker that crashed
+    assert claim_next_export_job() is None
+
+    ExportJob.objects.filter(pk=job.pk).update(
+        heartbeat_at=timezone.now() - EXPORT_JOB_TIMEOUT * 2
+    )
+    reclaimed = claim_next_export_job()
+    assert reclaimed == job
+    assert reclaimed.attempts == 2
+
+    call_command("run_export_worker", "--once")
+    job.refresh_from_db()
+    assert job.state == ExportJobStates.RUNNING
+
+    ExportJob.objects.filter(pk=job.pk).update(
+        heartbeat_at=timezone.now() - EXPORT_JOB_TIMEOUT * 2, attempts=3
+    )
+    assert claim_next_export_job() is None
+    job.refresh_from_db()
+    assert job.state == ExportJobStates.FAILED
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("export_format", ["jsonl", "columnar"])
+def test_typed_export_formats(export_event, superuser, client, export_format):
+    client.force_login(superuser)
+    export_event.organizer.members.add(superuser)
+    with scopes_disabled():
+        questions = list(
+            export_event.questionnaires.get().questionblock_set.get().question_set.all()
+        )
+
+    response = client.post(
+        export_url(export_event),
+        {
+            "fields": ["__email"] + [str(q.pk) for q in questions],
+            "format": export_format,
+        },
+    )
+    assert response["Content-Type"].startswith("application/jsonl")
+    lines = [
+        json.loads(line)
+        for line in b"".join(response.streaming_content).decode().splitlines()
+    ]
+
+    if export_format == "jsonl":
+        assert len(lines) == 7
+        number_values = [line[str(questions[1].name)] for line in lines]
+    else:
+        schema = lines[0]["schema"]
+        assert [column["type"] for column in schema] == [
+            "string",
+            "string",
+            "int",
+            "string",
+        ]
+        assert lines[1]["rows"] == 7
+        number_values = lines[1]["columns"][2]
+    assert sorted(number_values) == list(range(7))
+
+
+@pytest.mark.django_db
+def test_delta_export(export_event, superuser, client, tmp_path):
+    client.force_login(superuser)
+    export_event.organizer.members.add(superuser)
+
+    response = client.post(export_url(export_event), {"fields": ["__id"]})
+    cursor = response["X-Presign-Export-Cursor"]
+    assert len(read_export(response)) == 8
+    assert any(
+        cursor in str(message) for message in get_messages(response.wsgi_request)
+    )
+
+    with scopes_disabled():
+        answer = export_event.participant_set.first().questionanswer_set.first()
+    answer.answer = "changed"
+    answer.save()
+
+    response = client.post(
+        export_url(export_event), {"fields": ["__id"], "changed_since": cursor}
+    )
+    assert read_export(response)[1:] == [[str(answer.participant_id)]]
+
+    cursor_file = tmp_path / "cursor"
+    cursor_file.write_text(response["X-Presign-Export-Cursor"])
+    output = tmp_path / "export.csv"
+    call_command(
+        "export_event",
+        export_event.organizer.slug,
+        export_event.slug,
+        "--field=__id",
+        f"--cursor-file={cursor_file}",
+        f"--output={output}",
+        stderr=io.StringIO(),
+    )
+    assert output.read_text().splitlines() == ["Id"]
+    assert cursor_file.read_text() != response["X-Presign-Export-Cursor"]
+
+
+@pytest.mark.django_db
+def test_repeated_export_is_cached(export_event, superuser, client):
+    client.force_login(superuser)
+    export_event.organizer.members.add(superuser)
+
+    response = client.post(export_url(export_event), {"fields": ["__id", "__email"]})
+    assert response.streaming
+    rows = read_export(response)
+    cursor = response["X-Presign-Export-Cursor"]
+
+    response = client.post(export_url(export_event), {"fields": ["__id", "__email"]})
+    assert not response.streaming
+    assert list(csv.reader(io.StringIO(response.content.decode()))) == rows
+    # The cached export is only complete up to its own cursor
+    assert response["X-Presign-Export-Cursor"] == cursor
+
+    with scopes_disabled():
+        answer = QuestionAnswer.objects.filter(
+            participant__event=export_event, answer="text 0"
+        ).get()
+    changed_at = answer.participant.changed_at
+    answer.answer = "changed"
+    answer.save()
+    answer.participant.refresh_from_db()
+    assert answer.participant.changed_at > changed_at
+    response = client.post(export_url(export_event), {"fields": ["__id", "__email"]})
+    assert response.streaming
+    read_export(response)
+
+    with scopes_disabled():
+        participant = export_event.participant_set.first()
+    participant.email = "changed@example.com"
+    participant.save()
+
+    response = client.post(export_url(export_event), {"fields": ["__id", "__email"]})
+    assert response.streaming
+    assert ["changed@example.com"] in [row[1:] for row in read_export(response)]
+
+
+def test_export_cache_is_bounded_by_encoded_size():
+    cursor = timezone.now()
+    with mock.patch.object(export_cache, "max_size", 8):
+        # 6 characters, but 12 bytes
+        assert "".join(cache_export("too-large", ["äöü", "äöü"], cursor))
+        assert export_cache.get("too-large") is None
+
+        assert "".join(cache_export("fits", ["äö", "ü"], cursor))
+        assert export_cache.get("fits") == ("äöü".encode(), cursor)
+
+
+@pytest.mark.django_db
+def test_file_archive(export_event, superuser, client, file_question_factory, tmp_path):
+    client.force_login(superuser)
+    export_event.organizer.members.add(superuser)
+    with scopes_disabled():
+        block = export_event.questionnaires.get().questionblock_set.get()
+        questions = [file_question_factory.create(block=block) for _i in range(2)]
+        participant = export_event.participant_set.first()
+        for i, question in enumerate(questions):
+            answer = participant.questionanswer_set.create(question=question)
+            answer.file.save("upload.pdf", ContentFile(f"content {i}".encode()))
+
+    response = client.get(
+        reverse(
+            "control:event-export-files",
+            kwargs={
+                "organizer": export_event.organizer.slug,
+                "event": export_event.slug,
+            },
+        )
+    )
+    assert response.streaming
+    content = b"".join(response.streaming_content)
+
+    folder = f"{participant.code}_{participant.email}".replace("@", "")
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        assert len(archive.namelist()) == 2
+        assert all(name.startswith(f"{folder}/") for name in archive.namelist())
+        assert {archive.read(name) for name in archive.namelist()} == {
+            b"content 0",
+            b"content 1",
+        }
+
+    output = tmp_path / "files.zip"
+    call_command(
+        "export_event_files",
+        export_event.organizer.slug,
+        export_event.slug,
+        f"--output={output}",
+    )
+    assert output.read_bytes() == content
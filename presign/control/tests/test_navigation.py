@@ -0,0 +1,63 @@
+from django.urls import resolve, reverse
+
+import pytest
+from django_scopes import scopes_disabled
+
+from presign.control import context
+
+
+@pytest.fixture
+def count_reverses(monkeypatch):
+    calls = []
+    reverse = context.reverse
+
+    def counting_reverse(*args, **kwargs):
+        calls.append(args[0])
+        return reverse(*args, **kwargs)
+
+    monkeypatch.setattr(context, "reverse", counting_reverse)
+    context.compiled_navs.clear()
+    return calls
+
+
+def get_nav_items(response):
+    return response.context["nav_items"]()
+
+
+@pytest.mark.django_db
+@scopes_disabled()
+def test_nav_is_compiled_once(event_factory, superuser, client, count_reverses):
+    event = event_factory.create()
+    event.organizer.members.add(superuser)
+    client.force_login(superuser)
+    kwargs = {"organizer": event.organizer.slug, "event": event.slug}
+
+    response = client.get(reverse("control:participant-list", kwargs=kwargs))
+    items = get_nav_items(response)
+    assert len(count_reverses) == 11
+    assert [item["label"] for item in items if item.get("active")] == ["Participants"]
+    assert items[4]["label"] == str(event.organizer.name)
+
+    count_reverses.clear()
+    response = client.get(reverse("control:event-change", kwargs=kwargs))
+    assert [
+        item["label"] for item in get_nav_items(response) if item.get("active")
+    ] == ["Settings"]
+    assert count_reverses == []
+
+    event.name = "Renamed"
+    event.save()
+    response = client.get(reverse("control:event", kwargs=kwargs))
+    assert "Renamed" in [item.get("label") for item in get_nav_items(response)]
+
+
+@pytest.mark.django_db
+def test_nav_is_only_built_when_used(rf, superuser, count_reverses):
+    request = rf.get(reverse("control:user-events"))
+    request.resolved_path = request.resolver_match = resolve(request.path)
+    request.user = superuser
+
+    processed = context.contextprocessor(request)
+    assert count_reverses == []
+    assert processed["nav_items"]() is processed["nav_items"]()
+    assert len(count_reverses) == 3
@@ -1,11 +1,24 @@
+import io
+
+from django.core.management import call_command
+from django.db import connection
 from django.urls import reverse
 
 import faker
 import pytest
 from django_scopes import scopes_disabled
 
-from presign.base.models import Participant, ParticipantStateActions, ParticipantStates
+from presign.base.models import (
+    OutgoingEmail,
+    Participant,
+    ParticipantSearchDocument,
+    ParticipantStateActions,
+    ParticipantStates,
+    QuestionKind,
+)
+from presign.base.search import search_participants, update_search_documents
 from presign.conftest import ParticipantFactory
+from presign.control.views.participant import ParticipantListView
 
 fake = faker.Faker()
 
@@ -47,6 +60,11 @@ def test_change_state_sends_email(
     participant.refresh_from_db()
     assert participant.state == ParticipantStates.APPROVED
 
+    # The email is queued with the state change and sent by the worker
+    assert len(mailoutbox) == 0
+    assert OutgoingEmail.objects.filter(participant=participant).count() == 1
+    call_command("run_email_worker", "--once", stdout=io.StringIO())
+
     assert len(mailoutbox) == 1
     state_change_mail = mailoutbox[0]
 
@@ -59,3 +77,306 @@ def test_change_state_sends_email(
 
     assert alt_type == "text/html"
     assert "<p><strong>Approved</strong> Text</p>" in alt_text
+
+
+@pytest.mark.django_db
+def test_participant_list_pagination(
+    participant_factory: ParticipantFactory, superuser, client, monkeypatch
+):
+    monkeypatch.setattr(ParticipantListView, "page_size", 3)
+    client.force_login(superuser)
+    with scopes_disabled():
+        event = participant_factory.create().event
+        participant_factory.create_batch(4, event=event)
+        participant_factory.create(event=event, email="filtered@example.com")
+        participant_factory.create(
+            event=event, email="approved@example.com", state=ParticipantStates.APPROVED
+        )
+        participants = list(event.participant_set.order_by("created_at", "pk"))
+    event.organizer.members.add(superuser)
+
+    url = reverse(
+        "control:participant-list",
+        kwargs={"organizer": event.organizer.slug, "event": event.slug},
+    )
+
+    seen = []
+    query = ""
+    for _page in range(3):
+        response = client.get(f"{url}?{query}")
+        seen += response.context["participant_list"]
+        query = response.context["next_query"]
+        if query is None:
+            break
+    assert [p.pk for p in seen] == [p.pk for p in participants]
+
+    response = client.get(f"{url}?{response.context['previous_query']}")
+    assert response.context["participant_list"][-1].pk == seen[-2].pk
+
+    response = client.get(url, {"email": "FILTERED"})
+    assert [p.email for p in response.context["participant_list"]] == [
+        "filtered@example.com"
+    ]
+
+    response = client.get(url, {"state": ParticipantStates.APPROVED})
+    assert [p.email for p in response.context["participant_list"]] == [
+        "approved@example.com"
+    ]
+
+    response = client.get(
+        reverse(
+            "control:event",
+            kwargs={"organizer": event.organizer.slug, "event": event.slug},
+        )
+    )
+    assert len(response.context["participant_list"]) == len(participants)
+
+
+@pytest.mark.django_db
+def test_event_list_shows_state_counts(
+    participant_factory: ParticipantFactory,
+    superuser,
+    client,
+    django_assert_max_num_queries,
+):
+    client.force_login(superuser)
+    with scopes_disabled():
+        event = participant_factory.create().event
+        participant_factory.create_batch(20, event=event)
+    event.organizer.members.add(superuser)
+
+    with django_assert_max_num_queries(12):
+        response = client.get(
+            reverse("control:event-list", kwargs={"organizer": event.organizer.slug})
+        )
+    assert f"{ParticipantStates.NEW.label}: 21" in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_participant_search(
+    participant_factory: ParticipantFactory,
+    question_answer_factory,
+    superuser,
+    client,
+    django_capture_on_commit_callbacks,
+):
+    client.force_login(superuser)
+    with django_capture_on_commit_callbacks(execute=True):
+        with scopes_disabled():
+            participant = participant_factory.create(email="someone@example.com")
+            event = participant.event
+            other = participant_factory.create(event=event, email="other@example.com")
+            question_answer_factory.create(
+                participant=participant,
+                question__block__questionnaire__organizer=event.organizer,
+                answer="Chaos Computer Club",
+            )
+            question_answer_factory.create(
+                participant=other,
+                question__block__questionnaire__organizer=event.organizer,
+                answer="Hackerspace",
+            )
+    event.organizer.members.add(superuser)
+
+    url = reverse(
+        "control:participant-list",
+        kwargs={"organizer": event.organizer.slug, "event": event.slug},
+    )
+
+    def search(query):
+        response = client.get(url, {"q": query})
+        return {p.email for p in response.context["participant_list"]}
+
+    assert search("chaos comp") == {"someone@example.com"}
+    assert search("hackerspace") == {"other@example.com"}
+    assert search("example") == {"someone@example.com", "other@example.com"}
+    assert search("someone") == {"someone@example.com"}
+    assert search("nothing") == set()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        with scopes_disabled():
+            answer = other.questionanswer_set.get()
+        answer.answer = "Chaos Treff"
+        answer.save()
+    assert search("chaos") == {"someone@example.com", "other@example.com"}
+
+    with scopes_disabled():
+        ParticipantSearchDocument.objects.all().delete()
+    assert search("chaos") == set()
+    call_command("rebuild_search_index", stdout=io.StringIO())
+    assert search("chaos") == {"someone@example.com", "other@example.com"}
+
+
+@pytest.mark.django_db
+def test_participant_facets(
+    participant_factory: ParticipantFactory,
+    event_questionnaire_factory,
+    question_factory,
+    question_option_factory,
+    question_answer_factory,
+    superuser,
+    client,
+):
+    client.force_login(superuser)
+    with scopes_disabled():
+        event_questionnaire = event_questionnaire_factory.create()
+        event = event_questionnaire.event
+        block = event_questionnaire.questionnaire.questionblock_set.create(order=0)
+        choice = question_factory.create(block=block, kind=QuestionKind.CHOICE)
+        red, blue = question_option_factory.create_batch(2, question=choice)
+        boolean = question_factory.create(block=block, kind=QuestionKind.BOOL)
+
+        participants = participant_factory.create_batch(3, event=event)
+        for participant, option, agreed in zip(
+            participants, [red, red, blue], [True, False, True]
+        ):
+            answer = question_answer_factory.create(
+                participant=participant, question=choice, answer=None
+            )
+            answer.options.set([option])
+            question_answer_factory.create(
+                participant=participant, question=boolean, answer=str(agreed)
+            )
+        participants[0].state = ParticipantStates.CONFIRMED
+        participants[0].save()
+    event.organizer.members.add(superuser)
+
+    url = reverse(
+        "control:participant-list",
+        kwargs={"organizer": event.organizer.slug, "event": event.slug},
+    )
+
+    def facet_filter(data):
+        response = client.get(url, data)
+        counts = {
+            (facet.question.id, value.value): value.count
+            for facet in response.context["facets"]
+            for value in facet.values
+        }
+        return {p.pk for p in response.context["participant_list"]}, counts
+
+    found, counts = facet_filter({})
+    assert found == {p.pk for p in participants}
+    assert counts[(choice.pk, str(red.pk))] == 2
+    assert counts[(choice.pk, str(blue.pk))] == 1
+    assert counts[(boolean.pk, "True")] == 2
+    assert counts[(boolean.pk, "False")] == 1
+
+    found, counts = facet_filter({f"facet_{choice.pk}": str(red.pk)})
+    assert found == {participants[0].pk, participants[1].pk}
+    assert counts[(boolean.pk, "True")] == 1
+    assert counts[(choice.pk, str(blue.pk))] == 0
+
+    found, _ = facet_filter({f"facet_{choice.pk}": [str(red.pk), str(blue.pk)]})
+    assert found == {p.pk for p in participants}
+
+    found, _ = facet_filter(
+        {f"facet_{choice.pk}": str(red.pk), f"facet_{boolean.pk}": "True"}
+    )
+    assert found == {participants[0].pk}
+
+    found, _ = facet_filter(
+        {f"facet_{boolean.pk}": "True", "state": ParticipantStates.NEW}
+    )
+    assert found == {participants[2].pk}
+
+    # Unknown values are ignored instead of filtering everything out
+    found, _ = facet_filter({f"facet_{boolean.pk}": "maybe"})
+    assert found == {p.pk for p in participants}
+
+
+@pytest.mark.django_db
+def test_bulk_state_change(
+    participant_factory: ParticipantFactory,
+    superuser,
+    client,
+    mailoutbox,
+    django_assert_max_num_queries,
+):
+    client.force_login(superuser)
+    with scopes_disabled():
+        event = participant_factory.create().event
+        new = list(Participant.objects.filter(event=event))
+        new += participant_factory.create_batch(29, event=event)
+        rejected = participant_factory.create_batch(
+            5, event=event, state=ParticipantStates.REJECTED
+        )
+        confirmed = participant_factory.create_batch(
+            3, event=event, state=ParticipantStates.CONFIRMED
+        )
+        other_event = participant_factory.create()
+    event.organizer.members.add(superuser)
+    event.email_texts.set(
+        ParticipantStateActions.APPROVE,
+        {"subject": {"en": "Approved"}, "body": {"en": "You are in"}},
+    )
+    event.save()
+
+    with django_assert_max_num_queries(30):
+        response = client.post(
+            reverse(
+                "control:participant-bulk-change",
+                kwargs={"organizer": event.organizer.slug, "event": event.slug},
+            ),
+            {
+                "action": ParticipantStateActions.APPROVE,
+                "participants": [
+                    str(p.pk) for p in new + rejected + confirmed + [other_event]
+                ],
+            },
+        )
+    assert response.status_code == 200
+    result = response.context["result"]
+    assert len(result.changed) == 35
+    assert len(result.changed) + len(result.skipped) == 39
+    unknown = [skipped for skipped in result.skipped if skipped.participant is None]
+    assert [skipped.participant_id for skipped in unknown] == [other_event.pk]
+    assert "Not a participant" in str(unknown[0].reason)
+    conflicts = [skipped for skipped in result.skipped if skipped.participant]
+    assert {skipped.participant for skipped in conflicts} == set(confirmed)
+    assert "Cannot perform approve" in str(conflicts[0].reason)
+    assert str(other_event.pk) in response.content.decode()
+
+    with scopes_disabled():
+        assert {state: count for state, count in event.get_state_counts() if count} == {
+            ParticipantStates.APPROVED: 35,
+            ParticipantStates.CONFIRMED: 3,
+        }
+        other_event.refresh_from_db()
+        assert other_event.state == ParticipantStates.NEW
+        assert (
+            Participant.history.filter(
+                event=event, state=ParticipantStates.APPROVED
+            ).count()
+            == 35
+        )
+
+    call_command("run_email_worker", "--once", stdout=io.StringIO())
+    assert len(mailoutbox) == 35
+    assert {mail.subject for mail in mailoutbox} == {"Approved"}
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor != "sqlite", reason="Tests the FTS5 table")
+@scopes_disabled()
+def test_search_index_refers_to_document_keys(participant_factory: ParticipantFactory):
+    participants = [
+        participant_factory.create(email=f"participant{i}@example.com")
+        for i in range(3)
+    ]
+    # Rewriting a document leaves a gap in the document table
+    update_search_documents([participant.pk for participant in participants])
+    update_search_documents([participants[0].pk])
+
+    # Implicit rowids may be renumbered by VACUUM or a dump and restore, so the
+    # index must use the declared key of the documents
+    for i, participant in enumerate(participants):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT rowid FROM base_participantsearch_fts "
+                "WHERE base_participantsearch_fts MATCH %s",
+                [f'"participant{i}"'],
+            )
+            assert cursor.fetchall() == [(participant.search_document.pk,)]
+        found = search_participants(Participant.objects.all(), f"participant{i}")
+        assert list(found) == [participant]
@@ -24,11 +24,21 @@ event_urlpatterns = [
         views.participant.ParticipantListView.as_view(),
         name="participant-list",
     ),
+    path(
+        "participant/bulk-change/",
+        views.participant.ParticipantBulkStateChangeView.as_view(),
+        name="participant-bulk-change",
+    ),
     path(
         "export/",
         views.event.EventExportView.as_view(),
         name="event-export",
     ),
+    path(
+        "export/files/",
+        views.event.EventFilesExportView.as_view(),
+        name="event-export-files",
+    ),
     path("participant/<str:code>/", include(participant_url_patterns)),
 ]
 questionnaire_urlpatterns = [
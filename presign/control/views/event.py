@@ -1,10 +1,8 @@
-import csv
-import io
 from typing import Any, Dict, Optional
 
 from django.contrib import messages
-from django.db.models import QuerySet
-from django.http import HttpResponse
+from django.db.models import Prefetch, QuerySet
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import redirect, render
 from django.urls import reverse
 from django.utils.functional import cached_property
@@ -16,11 +14,23 @@ from django.views.generic.list import ListView
 
 from django_scopes import scope
 
+from presign.base.export import (
+    build_export_columns,
+    cache_export,
+    export_cache,
+    export_fingerprint,
+    format_export_cursor,
+    get_export_writer,
+    next_export_cursor,
+    stream_export,
+    stream_file_archive,
+)
 from presign.base.models import (
     Event,
+    EventStateCounter,
+    ExportJob,
     ParticipantStateActions,
     ParticipantStates,
-    QuestionAnswer,
 )
 
 from ..constants import STATE_SETTINGS
@@ -39,7 +49,18 @@ class MyEventsListView(ListView):
 
     def get_queryset(self):
         with scope(user=self.request.user, organizer=None):
-            return self.request.user.get_events()
+            return (
+                self.request.user.get_events()
+                .select_related("organizer")
+                .prefetch_related(
+                    Prefetch("state_counters", EventStateCounter.objects.all())
+                )
+            )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["state_settings"] = STATE_SETTINGS
+        return context
 
 
 class EventListView(ListView):
@@ -48,7 +69,20 @@ class EventListView(ListView):
 
     def get_queryset(self):
         with scope(organizer=self.request.organizer):
-            return super().get_queryset().filter(organizer=self.request.organizer)
+            return (
+                super()
+                .get_queryset()
+                .filter(organizer=self.request.organizer)
+                .select_related("organizer")
+                .prefetch_related(
+                    Prefetch("state_counters", EventStateCounter.objects.all())
+                )
+            )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["state_settings"] = STATE_SETTINGS
+        return context
 
 
 def event_index(request, **kwargs):
@@ -91,6 +125,10 @@ class EventDetailView(DetailView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["state_settings"] = STATE_SETTINGS
+        context["state_counts"] = self.request.event.get_state_counts()
+        context["participant_list"] = self.request.event.participant_set.only(
+            "id", "email", "code", "state"
+        ).order_by("-created_at", "-pk")[:10]
         return context
 
 
@@ -270,6 +308,17 @@ class EventDisableView(EventConfirmActionView):
         }
 
 
+class EventFilesExportView(View):
+    def get(self, request, *args, **kwargs):
+        response = StreamingHttpResponse(
+            stream_file_archive(request.event), content_type="application/zip"
+        )
+        response["Content-Disposition"] = (
+            f"attachment; filename={request.event.slug}-files.zip"
+        )
+        return response
+
+
 class EventExportView(FormView):
     model = Event
     template_name = "control/event/export.html"
@@ -298,31 +347,81 @@ class EventExportView(FormView):
         context["state_settings"] = STATE_SETTINGS
         context["event"] = self.get_object()
         context["form"] = self.get_form()
+        context["export_jobs"] = ExportJob.objects.filter(
+            event=self.get_object()
+        ).select_related("created_by")[:10]
         return context
 
+    def get_success_url(self):
+        return reverse(
+            "control:event-export",
+            kwargs={
+                "organizer": self.request.organizer.slug,
+                "event": self.request.event.slug,
+            },
+        )
+
     def form_valid(self, form):
-        vfile = io.StringIO()
-        fieldnames = [str(form.id_map[x]) for x in form.cleaned_data["fields"]]
-        writer = csv.DictWriter(vfile, fieldnames=fieldnames)
-        writer.writeheader()
-        for participant in self.get_object().participant_set.all():
-            row = {}
-            for fieldname, field in zip(fieldnames, form.cleaned_data["fields"]):
-                if field == "__email":
-                    row[fieldname] = participant.email
-                elif field == "__id":
-                    row[fieldname] = participant.pk
-                else:
-                    try:
-                        answer = QuestionAnswer.objects.get(
-                            participant=participant, question=field
-                        )
-                        row[fieldname] = str(answer.get_value())
-                    except QuestionAnswer.DoesNotExist:
-                        row[fieldname] = ""
-            writer.writerow(row)
-        csv_text = vfile.getvalue()
-        response = HttpResponse(csv_text.encode())
-        response["Content-Type"] = "text/plain"
-        response["Content-Disposition"] = "attachment; filename=export.csv"
+        fields = form.cleaned_data["fields"]
+        header = [str(form.id_map[x]) for x in fields]
+
+        if "background" in self.request.POST:
+            ExportJob.objects.create(
+                event=self.get_object(),
+                created_by=self.request.user,
+                fields=fields,
+                header=header,
+                format=form.cleaned_data["format"],
+                changed_since=form.cleaned_data["changed_since"],
+            )
+            messages.success(
+                self.request,
+                _("The export was queued. You can download it below once it is done."),
+            )
+            return redirect(self.get_success_url())
+
+        writer = get_export_writer(form.cleaned_data["format"])(
+            build_export_columns(fields, header)
+        )
+        # Taken before the data is read, so the next delta export from this
+        # cursor misses no change
+        cursor = next_export_cursor()
+        fingerprint = export_fingerprint(
+            self.get_object(),
+            writer.columns,
+            writer.identifier,
+            changed_since=form.cleaned_data["changed_since"],
+        )
+
+        cached = export_cache.get(fingerprint)
+        if cached is not None:
+            content, cursor = cached
+            response = HttpResponse(content, content_type=writer.content_type)
+        else:
+            response = StreamingHttpResponse(
+                cache_export(
+                    fingerprint,
+                    stream_export(
+                        self.get_object(),
+                        writer.columns,
+                        writer,
+                        changed_since=form.cleaned_data["changed_since"],
+                    ),
+                    cursor,
+                ),
+                content_type=writer.content_type,
+            )
+        response["X-Presign-Export-Cursor"] = format_export_cursor(cursor)
+        # The download does not leave the page, the message is shown with the
+        # next page
+        messages.info(
+            self.request,
+            _(
+                "To only export participants changed after this export, enter "
+                "{cursor} as cursor."
+            ).format(cursor=format_export_cursor(cursor)),
+        )
+        response["Content-Disposition"] = (
+            f"attachment; filename=export.{writer.extension}"
+        )
         return response
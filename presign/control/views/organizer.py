@@ -29,7 +29,11 @@ class OrganizerListView(ListView):
 
     def get_queryset(self):
         with scope(user=self.request.user):
-            return super().get_queryset().filter(members=self.request.user)
+            return (
+                super()
+                .get_queryset()
+                .filter(pk__in=self.request.user.get_organizer_ids())
+            )
 
 
 class OrganizerDetailView(DetailView):
@@ -191,7 +195,7 @@ class ChangeMembershipView(View):
 
 class OrganizerAddMemberView(ChangeMembershipView):
     def run_action(self, request, user):
-        if user in request.organizer.members.all():
+        if user.has_organizer_permission(request.organizer):
             messages.warning(request, _("User was already a member"))
         else:
             request.organizer.members.add(user)
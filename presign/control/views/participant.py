@@ -6,47 +6,85 @@ from django.http import Http404
 from django.shortcuts import redirect, render
 from django.urls import reverse
 from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from django.views import View
 from django.views.generic.detail import DetailView
 from django.views.generic.edit import UpdateView
 from django.views.generic.list import ListView
 
 from django_scopes import scope
 
-from presign.base.constants import CAN_CHANGE_Q1_AND_Q2_STATES, CAN_CHANGE_Q1_STATES
+from presign.base.answers import load_answer_tree
+from presign.base.catalog import get_question_catalog
 from presign.base.exceptions import (
     ActionEmailNotConfigured,
     ParticipantStateChangeException,
 )
-from presign.base.models import (
-    Participant,
-    QuestionAnswer,
-    QuestionBlock,
-    QuestionnaireRole,
-)
+from presign.base.models import Participant
+from presign.base.states import bulk_change_state
 
 from ..constants import STATE_CHANGE_STRINGS, STATE_SETTINGS
-from ..forms import ParticipantInternalForm
+from ..facets import ParticipantFacets
+from ..forms import (
+    ParticipantBulkStateChangeForm,
+    ParticipantFilterForm,
+    ParticipantInternalForm,
+)
+from ..pagination import PAGE_SIZE, paginate_keyset
 
 
 class ParticipantListView(ListView):
     model = Participant
     template_name = "control/participant/list.html"
+    context_object_name = "participant_list"
+    page_size = PAGE_SIZE
+
+    @cached_property
+    def filter_form(self):
+        return ParticipantFilterForm(data=self.request.GET)
+
+    @cached_property
+    def facets(self):
+        return ParticipantFacets(
+            get_question_catalog(self.request.event), self.request.GET
+        )
 
     def get_queryset(self):
         with scope(organizer=self.request.organizer, event=self.request.event):
-            return (
+            queryset = (
                 super()
                 .get_queryset()
-                .filter(
-                    event=self.request.event, event__organizer=self.request.organizer
-                )
+                .filter(event=self.request.event)
+                .only("id", "email", "code", "state", "created_at")
             )
+        queryset = self.filter_form.filter_queryset(queryset)
+        return self.facets.filter_queryset(queryset)
 
     def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
+        page = paginate_keyset(
+            self.object_list,
+            after=self.request.GET.get("after"),
+            before=self.request.GET.get("before"),
+            page_size=self.page_size,
+        )
+        context = super().get_context_data(object_list=page.object_list, **kwargs)
         context["state_settings"] = STATE_SETTINGS
+        context["filter_form"] = self.filter_form
+        context["bulk_form"] = ParticipantBulkStateChangeForm()
+        context["facets"] = self.facets.get_facets(self.object_list)
+        context["next_query"] = self.get_page_query(after=page.next_cursor)
+        context["previous_query"] = self.get_page_query(before=page.previous_cursor)
         return context
 
+    def get_page_query(self, **cursor):
+        if not any(cursor.values()):
+            return None
+        query = self.request.GET.copy()
+        query.pop("after", None)
+        query.pop("before", None)
+        query.update(cursor)
+        return query.urlencode()
+
 
 class ParticipantView(DetailView):
     model = Participant
@@ -77,36 +115,9 @@ class ParticipantView(DetailView):
             },
         )
 
-    @cached_property
-    def questionnaires(self):
-        if self.participant.state in CAN_CHANGE_Q1_STATES:
-            return self.request.event.questionnaires.filter(
-                eventquestionnaire__role=QuestionnaireRole.DURING_SIGNUP
-            )
-        elif self.participant.state in CAN_CHANGE_Q1_AND_Q2_STATES:
-            return self.request.event.questionnaires.filter(
-                eventquestionnaire__role__in=[
-                    QuestionnaireRole.DURING_SIGNUP,
-                    QuestionnaireRole.AFTER_APPROVAL,
-                ]
-            ).order_by("eventquestionnaire__role")
-        else:
-            return (
-                QuestionAnswer.objects.filter(participant=self.participant)
-                .values_list("question__block__questionnaire", flat=True)
-                .distinct()
-            )
-
     @cached_property
     def blocks(self):
-        blocks = []
-        for questionnaire in self.questionnaires:
-            blocks += list(
-                QuestionBlock.objects.filter(questionnaire=questionnaire).exclude(
-                    question=None
-                )
-            )
-        return blocks
+        return load_answer_tree(self.request.event, self.participant)
 
 
 class ParticipantDetailView(ParticipantView, UpdateView):
@@ -122,17 +133,10 @@ class ParticipantDetailView(ParticipantView, UpdateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-
-        answer_by_question = {}
-        answers = self.participant.get_answers()
-        for answer in answers:
-            answer_by_question[answer.question] = answer
-
         context.update(
             {
-                "answer_by_question": answer_by_question,
                 "event": self.request.event,
-                "participant": self.get_object(),
+                "participant": self.participant,
                 "state_change_strings": STATE_CHANGE_STRINGS,
                 "state_settings": STATE_SETTINGS,
                 "blocks": self.blocks,
@@ -178,3 +182,49 @@ class ParticipantStateChangeView(ParticipantView):
                 "state_change_strings": STATE_CHANGE_STRINGS,
             },
         )
+
+
+class ParticipantBulkStateChangeView(View):
+    def post(self, *args, **kwargs):
+        form = ParticipantBulkStateChangeForm(data=self.request.POST)
+        if not form.is_valid():
+            for errors in form.errors.values():
+                for error in errors:
+                    messages.error(self.request, error)
+            return redirect(self.get_list_url())
+
+        action = form.cleaned_data["action"]
+        try:
+            result = bulk_change_state(
+                self.request.event,
+                form.cleaned_data["participants"],
+                action,
+                self.request,
+            )
+        except ParticipantStateChangeException as e:
+            messages.error(self.request, str(e))
+            return redirect(self.get_list_url())
+
+        if result.changed and not result.emails_queued:
+            messages.warning(
+                self.request, _("No email was configured for this action.")
+            )
+        return render(
+            self.request,
+            "control/participant/bulk_state_change_result.html",
+            {
+                "action": STATE_CHANGE_STRINGS[action],
+                "result": result,
+                "state_settings": STATE_SETTINGS,
+                "list_url": self.get_list_url(),
+            },
+        )
+
+    def get_list_url(self):
+        return reverse(
+            "control:participant-list",
+            kwargs={
+                "organizer": self.request.organizer.slug,
+                "event": self.request.event.slug,
+            },
+        )
@@ -87,10 +87,10 @@ class QuestionnaireDetailView(QuestionnaireNavContextMixin, DetailView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        user_is_orga_member = self.request.user in self.object.organizer.members.all()
-        context["can_update"] = (
-            self.object in self.request.user.get_editable_questionnaires()
+        user_is_orga_member = self.request.user.has_organizer_permission(
+            self.object.organizer
         )
+        context["can_update"] = self.object.can_user_update(self.request.user)
 
         if user_is_orga_member:
             context["additional_nav_items"] = get_organizer_nav_items(
@@ -1,3 +1,4 @@
+import ast
 from pathlib import Path
 
 from django.utils.translation import gettext_lazy as _
@@ -7,6 +8,24 @@ from configurations import Configuration, values
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
 
+class LiteralListValue(values.Value):
+    """A list of Python literals, e.g. dicts, parsed like `values.DictValue`"""
+
+    message = "Cannot interpret list value {0!r}"
+
+    def to_python(self, value):
+        value = super().to_python(value)
+        if not value:
+            return []
+        try:
+            evaled_value = ast.literal_eval(value)
+        except (SyntaxError, ValueError):
+            raise ValueError(self.message.format(value))
+        if not isinstance(evaled_value, list):
+            raise ValueError(self.message.format(value))
+        return evaled_value
+
+
 class Base(Configuration):
     DEBUG = values.BooleanValue(default=False)
     ALLOWED_HOSTS = values.ListValue(default=["*"])
@@ -39,6 +58,7 @@ class Base(Configuration):
         "django.contrib.messages.middleware.MessageMiddleware",
         "django.middleware.clickjacking.XFrameOptionsMiddleware",
         "simple_history.middleware.HistoryRequestMiddleware",
+        "presign.base.middleware.resolve_request_middleware",
         "presign.base.middleware.ignore_scopes_in_admin_middleware",
         "presign.control.middleware.ControlMiddleware",
         "presign.signup.middleware.SignupMiddleware",
@@ -177,10 +197,64 @@ class Base(Configuration):
 
     DATABASES = values.DatabaseURLValue()
 
+    # The cached slugs, catalogs, texts, navigations and exports are invalidated
+    # by version numbers in this cache, so it must be shared by all processes.
+    # The database cache needs `manage.py createcachetable`, set
+    # DJANGO_CACHE_BACKEND=django.core.cache.backends.redis.RedisCache and
+    # DJANGO_CACHE_LOCATION=redis://... to use redis instead.
+    CACHE_BACKEND = values.Value("django.core.cache.backends.db.DatabaseCache")
+    CACHE_LOCATION = values.Value("presign_cache")
+
+    @property
+    def CACHES(self):
+        return {
+            "default": {
+                "BACKEND": self.CACHE_BACKEND,
+                "LOCATION": self.CACHE_LOCATION,
+            }
+        }
+
     # Signature salt to be used for signing media urls
     PRESIGN_MEDIA_SIGNATURE_SALT = values.Value(default="transcribee.media")
     # Valid time of signed urls, default: 60 min
     PRESIGN_MEDIA_SIGNATURE_MAX_AGE_SECONDS = values.Value(default=60 * 60)
+    # Time a signed url of an answer file is reused, default: 5 min
+    PRESIGN_MEDIA_SIGNED_URL_CACHE_SECONDS = values.IntegerValue(default=5 * 60)
+
+    # Number of rendered exports kept in memory per process, default: 16
+    PRESIGN_EXPORT_CACHE_MAX_ENTRIES = values.IntegerValue(default=16)
+    # Total size of rendered exports kept in memory per process, default: 64 MiB
+    PRESIGN_EXPORT_CACHE_MAX_SIZE = values.IntegerValue(default=64 * 1024 * 1024)
+
+    # Number of rendered answers kept in memory per process, default: 10000
+    PRESIGN_ANSWER_CACHE_MAX_ENTRIES = values.IntegerValue(default=10000)
+    # Total size of rendered answers kept in memory per process, default: 8 MiB
+    PRESIGN_ANSWER_CACHE_MAX_SIZE = values.IntegerValue(default=8 * 1024 * 1024)
+
+    # Number of resolved event and organizer slugs kept in memory per process,
+    # default: 1000
+    PRESIGN_SLUG_CACHE_MAX_ENTRIES = values.IntegerValue(default=1000)
+
+    # Number of compiled control navigations kept in memory per process,
+    # default: 1000
+    PRESIGN_NAV_CACHE_MAX_ENTRIES = values.IntegerValue(default=1000)
+
+    # Number of resolved email and status texts kept in memory per process,
+    # default: 10000
+    PRESIGN_TEXT_CACHE_MAX_ENTRIES = values.IntegerValue(default=10000)
+
+    # Rules applied by `process_deadlines` when a deadline of an event passes.
+    # `deadline` is one of signup_end, lock_date (both fall back to the event
+    # date) or event_date, `offset_hours` moves the time the rule is applied
+    # relative to the deadline. A rule either performs `action` on all
+    # participants in `states`, or sends them the email text `email`.
+    # No rules are enabled by default. To cancel participants that did not
+    # confirm before the lock date, set DJANGO_PRESIGN_DEADLINE_RULES to
+    # [{"name": "cancel_after_lock_date", "deadline": "lock_date",
+    #   "states": ["APP", "Q2C"], "action": "cancel"}]
+    PRESIGN_DEADLINE_RULES = LiteralListValue(default=[])
+    # Deadlines passed this long before the first run are still processed
+    PRESIGN_DEADLINE_LOOKBACK_HOURS = values.IntegerValue(default=24)
 
     EMAIL_HOST = values.Value("")
     EMAIL_PORT = values.IntegerValue(587)
@@ -189,3 +263,12 @@ class Base(Configuration):
     EMAIL_USE_TLS = values.BooleanValue(True)
     EMAIL_SUBJECT_PREFIX = values.Value("[Presign] ")
     DEFAULT_FROM_EMAIL = values.Value("webmaster@localhost")
+
+    # Base url of links in emails that are not sent within a request
+    PRESIGN_SITE_URL = values.Value(default="http://localhost:8000")
+
+    # Emails are queued in the database and sent by the email worker
+    # Number of times sending an email is tried, default: 8
+    PRESIGN_EMAIL_MAX_ATTEMPTS = values.IntegerValue(default=8)
+    # Delay before the first retry, doubled for every further one, default: 1 min
+    PRESIGN_EMAIL_RETRY_DELAY_SECONDS = values.IntegerValue(default=60)
@@ -11,3 +11,6 @@ class Test(Base):
             "ATOMIC_REQUESTS": True,
         }
     }
+
+    # A single process does not need a shared cache
+    CACHE_BACKEND = "django.core.cache.backends.locmem.LocMemCache"
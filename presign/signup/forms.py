@@ -3,22 +3,40 @@ from django.utils.translation import gettext_lazy as _
 
 from phonenumber_field.formfields import PhoneNumberField
 
+from presign.base.catalog import CatalogBlock, CatalogQuestion
 from presign.base.fields import DateFormField, DateTimeLocalFormField, TimeFormField
-from presign.base.models import Participant, Question, QuestionBlock, QuestionKind
+from presign.base.models import Participant, QuestionKind
 
 
-class QuestionOptionDisplayMixin:
-    def label_from_instance(self, obj):
-        return obj.value
+class CatalogOptionFieldMixin:
+    """Choices from the options of a catalog question, cleaned to CatalogOptions"""
 
+    def __init__(self, *, options, **kwargs):
+        self.options = {str(option.id): option for option in options}
+        super().__init__(
+            choices=[(key, option.value) for key, option in self.options.items()],
+            coerce=self.options.__getitem__,
+            **kwargs,
+        )
+
+    def prepare_value(self, value):
+        # Initial values are options or their ids
+        if value is None or isinstance(value, str):
+            return value
+        if hasattr(value, "__iter__"):
+            return [self.prepare_value(option) for option in value]
+        return str(getattr(value, "id", value))
 
-class QuestionOptionMultipleChoiceField(
-    QuestionOptionDisplayMixin, forms.ModelMultipleChoiceField
-):
-    pass
 
+class CatalogOptionChoiceField(CatalogOptionFieldMixin, forms.TypedChoiceField):
+    def __init__(self, *, options, **kwargs):
+        super().__init__(options=options, empty_value=None, **kwargs)
+        self.choices = [("", "---------")] + self.choices
 
-class QuestionOptionChoiceField(QuestionOptionDisplayMixin, forms.ModelChoiceField):
+
+class CatalogOptionMultipleChoiceField(
+    CatalogOptionFieldMixin, forms.TypedMultipleChoiceField
+):
     pass
 
 
@@ -26,7 +44,7 @@ class QuestionBlockForm(forms.Form):
     def __init__(
         self,
         *args,
-        question_block: QuestionBlock,
+        question_block: CatalogBlock,
         **kwargs,
     ):
         self.question_block = question_block
@@ -34,8 +52,8 @@ class QuestionBlockForm(forms.Form):
 
         super().__init__(*args, **kwargs)
 
-        question: Question
-        for question in question_block.question_set.all():
+        question: CatalogQuestion
+        for question in question_block.questions:
             if question.kind == QuestionKind.TEXT:
                 field = forms.CharField(
                     label=question.name,
@@ -68,18 +86,18 @@ class QuestionBlockForm(forms.Form):
                     required=question.required,
                 )
             elif question.kind == QuestionKind.CHOICE:
-                field = QuestionOptionChoiceField(
+                field = CatalogOptionChoiceField(
                     label=question.name,
                     help_text=question.help,
                     required=question.required,
-                    queryset=question.options,
+                    options=question.options,
                 )
             elif question.kind == QuestionKind.MULTIPLE_CHOICE:
-                field = QuestionOptionMultipleChoiceField(
+                field = CatalogOptionMultipleChoiceField(
                     label=question.name,
                     help_text=question.help,
                     required=question.required,
-                    queryset=question.options,
+                    options=question.options,
                     widget=forms.CheckboxSelectMultiple,
                 )
             elif question.kind == QuestionKind.DATE:
@@ -115,7 +133,7 @@ class QuestionBlockForm(forms.Form):
             else:
                 raise ValueError(f"Unsupported question type {question}")
 
-            field_name = f"question_{question.pk}"
+            field_name = f"question_{question.id}"
             field.question = question
             self.fields[field_name] = field
 
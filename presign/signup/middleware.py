@@ -1,10 +1,9 @@
 from django.http import Http404
-from django.urls import resolve
 from django.utils.translation import gettext_lazy as _
 
 from django_scopes import scope
 
-from presign.base.models import Event
+from presign.base.resolution import get_event
 
 
 class SignupMiddleware:
@@ -12,25 +11,21 @@ class SignupMiddleware:
         self.get_response = get_response
 
     def __call__(self, request):
-        url = resolve(request.path_info)
-        request.resolved_path = url
+        url = request.resolver_match
 
         # Only apply this middleware to the signup urls
-        if "signup" not in url.namespaces:
+        if url is None or "signup" not in url.namespaces:
             return self.get_response(request)
 
         if "organizer" in url.kwargs and "event" in url.kwargs:
-            with scope(organizer=None):
-                event = Event.objects.filter(
-                    slug=url.kwargs["event"], organizer__slug=url.kwargs["organizer"]
-                ).first()
+            event = get_event(url.kwargs["organizer"], url.kwargs["event"])
 
             if not event:
                 raise Http404(_("No event found or event is not public"))
 
             if not event.is_public() and (
                 not request.user.is_authenticated
-                or request.user not in event.organizer.members.all()
+                or not request.user.has_event_permission(event)
             ):
                 raise Http404(_("No event found or event is not public"))
 
@@ -0,0 +1,61 @@
+import datetime
+
+from django.urls import reverse
+from django.utils import timezone
+
+import pytest
+from django_scopes import scopes_disabled
+
+from presign.base.models import Participant, QuestionKind
+
+
+@pytest.mark.django_db
+def test_signup_with_catalog_forms(
+    event_questionnaire_factory,
+    question_block_factory,
+    question_factory,
+    question_option_factory,
+    client,
+):
+    with scopes_disabled():
+        event_questionnaire = event_questionnaire_factory.create(
+            event__signup_start=timezone.now() - datetime.timedelta(days=1)
+        )
+        event = event_questionnaire.event
+        block = question_block_factory.create(
+            questionnaire=event_questionnaire.questionnaire
+        )
+        text_question = question_factory.create(block=block)
+        choice_question = question_factory.create(block=block, kind=QuestionKind.CHOICE)
+        option = question_option_factory.create(question=choice_question)
+
+    url = reverse(
+        "signup:participant-signup",
+        kwargs={"organizer": event.organizer.slug, "event": event.slug},
+    )
+    response = client.get(url)
+    assert response.status_code == 200
+    assert str(option.value) in response.content.decode()
+
+    response = client.post(
+        url,
+        {
+            "email": "participant@example.com",
+            f"question_{text_question.pk}": "Some text",
+            f"question_{choice_question.pk}": str(option.pk),
+        },
+    )
+    assert response.status_code == 302
+
+    with scopes_disabled():
+        participant = Participant.objects.get(event=event)
+        answers = {
+            answer.question_id: answer
+            for answer in participant.questionanswer_set.all()
+        }
+        assert answers[text_question.pk].answer == "Some text"
+        assert list(answers[choice_question.pk].options.all()) == [option]
+
+    response = client.get(response.url)
+    assert response.status_code == 200
+    assert "Some text" in response.content.decode()
@@ -1,5 +1,5 @@
 from collections import defaultdict
-from typing import List, Optional
+from typing import Optional
 
 from django.contrib import messages
 from django.db import transaction
@@ -14,6 +14,8 @@ from django.views.generic.detail import DetailView
 
 from django_scopes import scope
 
+from presign.base.answers import load_answer_tree, save_answers
+from presign.base.catalog import get_question_catalog
 from presign.base.constants import CAN_CHANGE_Q1_AND_Q2_STATES, CAN_CHANGE_Q1_STATES
 from presign.base.exceptions import (
     ActionEmailNotConfigured,
@@ -23,8 +25,8 @@ from presign.base.models import (
     Participant,
     ParticipantStateActions,
     ParticipantStates,
+    Question,
     QuestionAnswer,
-    QuestionBlock,
     QuestionnaireRole,
 )
 
@@ -60,36 +62,9 @@ class ExistingParticipantMixin:
     def participant(self):
         raise NotImplementedError("Must implement `participant`")
 
-    @cached_property
-    def questionnaires(self):
-        if self.participant.state in CAN_CHANGE_Q1_STATES:
-            return self.request.event.questionnaires.filter(
-                eventquestionnaire__role=QuestionnaireRole.DURING_SIGNUP
-            )
-        elif self.participant.state in CAN_CHANGE_Q1_AND_Q2_STATES:
-            return self.request.event.questionnaires.filter(
-                eventquestionnaire__role__in=[
-                    QuestionnaireRole.DURING_SIGNUP,
-                    QuestionnaireRole.AFTER_APPROVAL,
-                ]
-            ).order_by("eventquestionnaire__role")
-        else:
-            return (
-                QuestionAnswer.objects.filter(participant=self.participant)
-                .values_list("question__block__questionnaire", flat=True)
-                .distinct()
-            )
-
     @cached_property
     def blocks(self):
-        blocks = []
-        for questionnaire in self.questionnaires:
-            blocks += list(
-                QuestionBlock.objects.filter(questionnaire=questionnaire).exclude(
-                    question=None
-                )
-            )
-        return blocks
+        return load_answer_tree(self.request.event, self.participant)
 
 
 class ParticipantChangeView(View):
@@ -98,27 +73,31 @@ class ParticipantChangeView(View):
         raise NotImplementedError("Must implement `participant`")
 
     @property
-    def questionnaires(self):
-        raise NotImplementedError("`questionnaires` must be implemented")
+    def roles(self):
+        raise NotImplementedError("`roles` must be implemented")
 
     @cached_property
     def blocks(self):
-        blocks = []
-        for questionnaire in self.questionnaires:
-            blocks += list(
-                QuestionBlock.objects.filter(questionnaire=questionnaire).exclude(
-                    question=None
-                )
+        return [
+            block
+            for block in get_question_catalog(self.request.event).get_blocks(
+                roles=self.roles
             )
-        return blocks
+            if block.questions
+        ]
 
     def get_forms(self, data=None, files=None):
         forms = []
 
         object_data = {}
         if self.participant:
-            for answer in QuestionAnswer.objects.filter(
-                participant=self.participant, question__block__in=self.blocks
+            for answer in (
+                QuestionAnswer.objects.filter(
+                    participant=self.participant,
+                    question__block__in=[block.id for block in self.blocks],
+                )
+                .select_related("question")
+                .prefetch_related("options")
             ):
                 key = f"question_{answer.question_id}"
                 object_data[key] = answer.get_value()
@@ -162,8 +141,16 @@ class ParticipantChangeView(View):
     @transaction.atomic
     def save(self, forms_to_save):
         participant: Participant = self.participant
-        answers: List[QuestionAnswer] = []
+        questions = Question.objects.in_bulk(
+            [
+                field.question.id
+                for form in forms_to_save
+                if not isinstance(form, ParticipantForm)
+                for field in form.fields.values()
+            ]
+        )
 
+        values = []
         for form in forms_to_save:
             if not form.is_valid():
                 raise ValueError("You shall not save an invalid form")
@@ -172,13 +159,9 @@ class ParticipantChangeView(View):
                 for k, v in form.cleaned_data.items():
                     field = form.fields[k]
                     if v != "" and v is not None:
-                        answer, _ = QuestionAnswer.objects.get_or_create(
-                            question=field.question, participant=participant
-                        )
-                        answer.set_value(v)
-                        answer.save()
-                        answers.append(answer)
+                        values.append((questions[field.question.id], v))
 
+        save_answers(participant, values)
         return participant
 
 
@@ -188,13 +171,7 @@ class ParticipantSignupView(ParticipantChangeView):
 
     participant = None
 
-    @cached_property
-    def questionnaires(self):
-        return [
-            self.request.event.questionnaires.get(
-                eventquestionnaire__role=QuestionnaireRole.DURING_SIGNUP
-            )
-        ]
+    roles = [QuestionnaireRole.DURING_SIGNUP]
 
     def get_forms(self, data=None, files=None):
         forms = [ParticipantForm(data=data, files=files)]
@@ -259,18 +236,11 @@ class ParticipantUpdateView(ParticipantChangeView):
         return participant
 
     @cached_property
-    def questionnaires(self):
+    def roles(self):
         if self.participant.state in CAN_CHANGE_Q1_STATES:
-            return self.request.event.questionnaires.filter(
-                eventquestionnaire__role=QuestionnaireRole.DURING_SIGNUP
-            )
+            return [QuestionnaireRole.DURING_SIGNUP]
         elif self.participant.state in CAN_CHANGE_Q1_AND_Q2_STATES:
-            return self.request.event.questionnaires.filter(
-                eventquestionnaire__role__in=[
-                    QuestionnaireRole.DURING_SIGNUP,
-                    QuestionnaireRole.AFTER_APPROVAL,
-                ]
-            ).order_by("eventquestionnaire__role")
+            return [QuestionnaireRole.DURING_SIGNUP, QuestionnaireRole.AFTER_APPROVAL]
         else:
             raise ValueError("Participant not in a state that can change answers")
 
@@ -375,10 +345,6 @@ class ParticipantDetailView(ExistingParticipantMixin, DetailView):
 
     def get_context_data(self, *args, **kwargs):
         context = super().get_context_data(*args, **kwargs)
-        answer_by_question = {}
-        answers = self.participant.get_answers()
-        for answer in answers:
-            answer_by_question[answer.question] = answer
         context.update(
             {
                 "event": self.request.event,
@@ -386,7 +352,6 @@ class ParticipantDetailView(ExistingParticipantMixin, DetailView):
                 "can_update": can_update(self.participant, self.request.event),
                 "status_banner": self.get_status_banner(),
                 "blocks": self.blocks,
-                "answer_by_question": answer_by_question,
             }
         )
         return context
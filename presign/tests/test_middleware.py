@@ -0,0 +1,40 @@
+from django.core.handlers.wsgi import WSGIHandler
+from django.test import RequestFactory
+from django.urls import get_resolver
+
+import pytest
+
+
+@pytest.fixture
+def count_resolutions():
+    resolver = get_resolver()
+    calls = []
+
+    def resolve(path):
+        calls.append(path)
+        return type(resolver).resolve(resolver, path)
+
+    resolver.resolve = resolve
+    yield calls
+    del resolver.resolve
+
+
+@pytest.mark.django_db
+def test_url_is_resolved_once_for_all_middlewares(event_factory, count_resolutions):
+    event = event_factory.create(signup_start=None)
+    path = event.get_absolute_url()
+
+    request = RequestFactory().get(path)
+    response = WSGIHandler().get_response(request)
+
+    assert response.status_code == 200
+    assert request.event == event
+    # Once for the middlewares and once by the handler for the view
+    assert count_resolutions == [path, path]
+
+
+@pytest.mark.django_db
+def test_unknown_url_is_not_found(count_resolutions):
+    response = WSGIHandler().get_response(RequestFactory().get("/does-not-exist/"))
+
+    assert response.status_code == 404